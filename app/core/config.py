@@ -2,7 +2,7 @@ from fastapi import FastAPI
 
 from app.core.events import shutdown_event, startup_event, lifespan
 from app.middleware.time_middleware import ProcessTimeMiddleware
-from app.routes import imdb, users
+from app.routes import imdb, metrics, users
 
 app = FastAPI(
     title = 'IMDB Scraper API',
@@ -20,4 +20,5 @@ app.add_middleware(ProcessTimeMiddleware)
 # app.add_event_handler("shutdown", shutdown_event)
 
 app.include_router(imdb.router)
-app.include_router(users.router)
\ No newline at end of file
+app.include_router(users.router)
+app.include_router(metrics.router)
\ No newline at end of file
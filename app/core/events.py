@@ -1,9 +1,48 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 
+from app.core.settings import (
+    CHART_CACHE_STALE_TTL,
+    CHART_CACHE_TTL,
+    CHART_REFRESH_ENABLED,
+    CHART_REFRESH_INTERVAL,
+    HEDGE_ENABLED,
+    HEDGE_QUANTILE,
+    IMDB_PROXIES,
+    PARSE_EXECUTOR,
+    PARSE_WORKERS,
+    RETRY_BASE_DELAY,
+    RETRY_DEADLINE,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+    TITLE_DETAILS_MAX_AGE,
+    TITLE_FETCH_CONCURRENCY,
+    TITLE_FETCH_PER_HOST,
+    UPSTREAM_HOST_BURST,
+    UPSTREAM_HOST_RATE,
+    UPSTREAM_PROXY_BURST,
+    UPSTREAM_PROXY_RATE,
+    WEB_CONCURRENCY,
+)
+from app.core.security import password_hasher
+from app.db.session import AsyncSessionLocal
+from app.services.cache import SWRCache
+from app.services.cache_backend import cache_backend
+from app.services.chart_store import ChartStore
+from app.services.http_client import HTTPClientPool
+from app.services.parse_executor import ParseExecutor
+from app.services.proxy_service import ProxyPool
+from app.services.retry import RetryPolicy
+from app.services.scheduler import ChartRefresher
+from app.services.scraper_service import IMDBScraper
+from app.services.title_details import TitleDetailsService
+from app.utils.rate_limiter import UpstreamRateLimiter
+
 LOG_DIR = Path("app/logs")
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -22,5 +61,59 @@ def shutdown_event():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     startup_event()
-    yield
-    shutdown_event()
\ No newline at end of file
+    app.state.http_clients = HTTPClientPool(IMDB_PROXIES)
+    app.state.proxy_pool = ProxyPool(IMDB_PROXIES)
+    app.state.chart_store = ChartStore(
+        cache_backend,
+        SWRCache(CHART_CACHE_TTL, CHART_CACHE_STALE_TTL),
+        ttl=CHART_CACHE_TTL + CHART_CACHE_STALE_TTL,
+    )
+    cache_listener = asyncio.create_task(cache_backend.listen(app.state.chart_store.on_invalidate))
+    app.state.upstream_limiter = UpstreamRateLimiter(
+        UPSTREAM_HOST_RATE,
+        UPSTREAM_HOST_BURST,
+        UPSTREAM_PROXY_RATE,
+        UPSTREAM_PROXY_BURST,
+        workers=WEB_CONCURRENCY,
+    )
+    app.state.parse_executor = ParseExecutor(PARSE_EXECUTOR, PARSE_WORKERS)
+    app.state.retry_policy = RetryPolicy(
+        max_attempts=RETRY_MAX_ATTEMPTS,
+        base_delay=RETRY_BASE_DELAY,
+        max_delay=RETRY_MAX_DELAY,
+        deadline=RETRY_DEADLINE,
+        retry_statuses=RETRY_STATUSES,
+        hedge=HEDGE_ENABLED,
+        hedge_quantile=HEDGE_QUANTILE,
+    )
+
+    app.state.scraper = scraper = IMDBScraper(
+        app.state.http_clients,
+        proxies=app.state.proxy_pool,
+        limiter=app.state.upstream_limiter,
+        executor=app.state.parse_executor,
+        retry=app.state.retry_policy,
+    )
+    app.state.chart_refresher = ChartRefresher(
+        scraper, AsyncSessionLocal, CHART_REFRESH_INTERVAL, store=app.state.chart_store
+    )
+    app.state.title_details = TitleDetailsService(
+        scraper,
+        AsyncSessionLocal,
+        TITLE_DETAILS_MAX_AGE,
+        concurrency=TITLE_FETCH_CONCURRENCY,
+        per_host=TITLE_FETCH_PER_HOST,
+    )
+    if CHART_REFRESH_ENABLED:
+        app.state.chart_refresher.start()
+    try:
+        yield
+    finally:
+        await app.state.chart_refresher.stop()
+        cache_listener.cancel()
+        await asyncio.gather(cache_listener, return_exceptions=True)
+        await cache_backend.aclose()
+        await app.state.http_clients.aclose()
+        app.state.parse_executor.shutdown()
+        password_hasher.shutdown()
+        shutdown_event()
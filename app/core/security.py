@@ -1,24 +1,129 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.settings import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_WORKERS,
+    PRINCIPAL_CACHE_TTL,
+    TOKEN_CACHE_SIZE,
+)
+from app.models import User
+from app.services.auth_cache import PrincipalCache, TokenCache
+from app.services.cache_backend import cache_backend
+from app.utils.timing import span
+from app.services.exceptions import PasswordHasherBusyException
+
 SECRET_KEY = "super-secret-change-this"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
-    print("HASHING PASSWORD:", repr(password), len(password.encode("utf-8")))
-    hashed = pwd_context.hash(password)
-    return hashed
+    return pwd_context.hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool, off the event loop.
+
+    bcrypt releases the GIL, so ``workers`` hashes run in parallel. At most
+    ``max_pending`` calls may be running or queued; beyond that callers get
+    a 429 instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int, context: CryptContext = pwd_context):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.context = context
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+
+    @property
+    def executor(self):
+        # Created lazily so the pool can be shut down and restarted with the app.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    @contextmanager
+    def _admit(self, phase):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyException()
+
+        self.pending += 1
+        try:
+            with span(phase):
+                yield
+        finally:
+            self.pending -= 1
+
+    async def _run(self, phase, fn, *args):
+        with self._admit(phase):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("bcrypt.hash", self.context.hash, password)
+
+    async def hash_many(self, passwords) -> list[str]:
+        """Hash a batch in parallel, in order; admitted as one pending call.
+
+        At most ``workers`` of its hashes are in the pool at a time, so
+        logins queued meanwhile wait for one hash, not for the whole batch.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def one(password):
+            async with semaphore:
+                return await loop.run_in_executor(self.executor, self.context.hash, password)
+
+        with self._admit("bcrypt.hash_many"):
+            return await asyncio.gather(*map(one, passwords))
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run("bcrypt.verify", self.context.verify, plain, hashed)
+
+    def stats(self):
+        return {"workers": self.workers, "pending": self.pending, "max_pending": self.max_pending, "rejected": self.rejected}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_hasher.verify(plain, hashed)
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+principal_cache = PrincipalCache(cache_backend, User, PRINCIPAL_CACHE_TTL)
+
+def decode_token(token: str) -> dict:
+    """``jwt.decode``, skipped for tokens already verified that have not expired."""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put_payload(token, payload)
+    return payload
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,82 @@
+import os
+
+
+def _env_list(name: str) -> list[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+# Upstream HTTP client. IMDB_BASE_URL can point at a local fake IMDb for load tests.
+IMDB_BASE_URL = os.getenv("IMDB_BASE_URL", "https://www.imdb.com").rstrip("/")
+IMDB_PROXIES = _env_list("IMDB_PROXIES")
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1"
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Top 250 chart: background refresh and read cache (seconds)
+CHART_REFRESH_ENABLED = os.getenv("CHART_REFRESH_ENABLED", "1") == "1"
+CHART_REFRESH_INTERVAL = float(os.getenv("CHART_REFRESH_INTERVAL", "3600"))
+CHART_CACHE_TTL = float(os.getenv("CHART_CACHE_TTL", "300"))
+CHART_CACHE_STALE_TTL = float(os.getenv("CHART_CACHE_STALE_TTL", "86400"))
+
+# Outbound request budget, shared by all WEB_CONCURRENCY workers (requests/second)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+UPSTREAM_HOST_RATE = float(os.getenv("UPSTREAM_HOST_RATE", "1"))
+UPSTREAM_HOST_BURST = float(os.getenv("UPSTREAM_HOST_BURST", "2"))
+UPSTREAM_PROXY_RATE = float(os.getenv("UPSTREAM_PROXY_RATE", "0.5"))
+UPSTREAM_PROXY_BURST = float(os.getenv("UPSTREAM_PROXY_BURST", "1"))
+
+# Where HTML/JSON parsing runs: "process", "thread" or "inline"
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "process")
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# Upstream retries and hedged requests
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+RETRY_DEADLINE = float(os.getenv("RETRY_DEADLINE", "30"))
+RETRY_STATUSES = [int(status) for status in _env_list("RETRY_STATUSES")] or [429, 500, 502, 503, 504]
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "0") == "1"
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+
+# Title detail scraping
+TITLE_DETAILS_MAX_AGE = float(os.getenv("TITLE_DETAILS_MAX_AGE", "86400"))
+TITLE_FETCH_CONCURRENCY = int(os.getenv("TITLE_FETCH_CONCURRENCY", "8"))
+TITLE_FETCH_PER_HOST = int(os.getenv("TITLE_FETCH_PER_HOST", "4"))
+
+# Password hashing: bcrypt cost and the thread pool it runs in
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+# POST /users/bulk: rows validated, deduplicated, hashed and inserted per batch
+USERS_BULK_BATCH_SIZE = int(os.getenv("USERS_BULK_BATCH_SIZE", "1000"))
+
+# Shared cache backend for chart snapshots and principals: memory:// keeps
+# it per process, redis://host:port/db shares it between workers.
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_MEMORY_SIZE = int(os.getenv("CACHE_MEMORY_SIZE", "10000"))
+
+# Authentication caches: decoded tokens (kept until exp, per process) and users (seconds)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+
+# Database engines. APP_ENV=dev turns on SQL echo by default.
+APP_ENV = os.getenv("APP_ENV", "production")
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://mahdi@localhost:5432/imdb")
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+DB_ECHO = os.getenv("DB_ECHO", "1" if APP_ENV == "dev" else "0") == "1"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+# Prepared statements cached per connection; set 0 behind pgbouncer in transaction mode.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+# Keys accepted by AuthMiddleware in the X-API-KEY header
+API_KEYS = _env_list("API_KEYS") or ["mysecretapikey123"]
+
+# Phase timing: Server-Timing headers and the /metrics histograms
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
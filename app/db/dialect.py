@@ -0,0 +1,12 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(session: AsyncSession, table):
+    """INSERT for the session's database, so ON CONFLICT is available.
+
+    ON CONFLICT is dialect specific; Postgres in production, SQLite in tests.
+    """
+    if session.bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
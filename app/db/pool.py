@@ -0,0 +1,58 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.timing import Histogram
+
+# Upper bounds (seconds) of the checkout wait histogram buckets.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class PoolMetrics(Histogram):
+    """Cumulative histogram of how long requests waited for a connection."""
+
+    def __init__(self, buckets=CHECKOUT_BUCKETS):
+        super().__init__(buckets)
+        self.timeouts = 0
+
+    def stats(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "timeouts": self.timeouts,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited in ``metrics``."""
+
+    def __init__(self, *args, metrics: PoolMetrics | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe(time.perf_counter() - start)
+
+    def stats(self):
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "checkout_wait": self.metrics.stats(),
+        }
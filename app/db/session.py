@@ -1,40 +1,64 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-# DATABASE_URL = "sqlite:///./test.db"
-DATABASE_URL = "postgresql+asyncpg://mahdi@localhost:5432/imdb"
-
-
-# engine = create_engine(
-#     DATABASE_URL,
-#     connect_args={"check_same_thread": False}
-# )
-#
-# SessionLocal = sessionmaker(
-#     autocommit=False,
-#     autoflush=False,
-#     bind=engine
-# )
-
-# DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-# engine = create_async_engine(DATABASE_URL, echo=True)
-#
-# AsyncSessionLocal = sessionmaker(
-#     engine, class_=AsyncSession, expire_on_commit=False
-# )
-
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-
-engine = create_async_engine(
+from app.core.settings import (
+    DATABASE_REPLICA_URL,
     DATABASE_URL,
-    echo=True,  # dev only
-    future=True
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
 )
+from app.db.pool import TimedQueuePool
+
+
+def make_engine(
+    url: str,
+    echo: bool = DB_ECHO,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+    statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+) -> AsyncEngine:
+    url = make_url(url)
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy keeps its own prepared statement cache on top of asyncpg's.
+        url = url.update_query_dict({"prepared_statement_cache_size": str(statement_cache_size)})
+        connect_args["statement_cache_size"] = statement_cache_size
+
+    return create_async_engine(
+        url,
+        echo=echo,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+engine = make_engine(DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False
-)
\ No newline at end of file
+)
+
+# Read-only traffic goes to the replica when one is configured.
+replica_engine = make_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else engine
+
+ReadSessionLocal = sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if DATABASE_REPLICA_URL else AsyncSessionLocal
@@ -1,10 +1,10 @@
-from fastapi import Depends, HTTPException
-from jose import jwt, JWTError
+from fastapi import Depends, HTTPException, Request
+from jose import JWTError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import ALGORITHM, SECRET_KEY
-from app.db.session import AsyncSessionLocal
+from app.core.security import decode_token, principal_cache
+from app.db.session import AsyncSessionLocal, ReadSessionLocal
 from fastapi.security import OAuth2PasswordBearer
 
 from app.services.users import UserService
@@ -15,6 +15,11 @@ async def get_db():
         yield session
 
 
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
@@ -22,9 +27,21 @@ def get_user_service(db: AsyncSession = Depends(get_db)):
     return UserService(db)
 
 
+def get_read_user_service(db: AsyncSession = Depends(get_read_db)):
+    return UserService(db)
+
+
+def get_title_details(request: Request):
+    return request.app.state.title_details
+
+
+async def get_chart(request: Request):
+    return await request.app.state.chart_store.get()
+
+
 def payload_check(token: str = Depends(oauth2_scheme), user_service: UserService = Depends(get_user_service), ):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         username = payload.get("sub")
         if not username:
             raise HTTPException(status_code=401)
@@ -33,3 +50,18 @@ def payload_check(token: str = Depends(oauth2_scheme), user_service: UserService
 
     return payload
 
+
+async def get_current_user(payload = Depends(payload_check), user_service: UserService = Depends(get_user_service)):
+    """The authenticated user, attached to this request's session.
+
+    A cached principal is merged without a SELECT; otherwise the user is
+    loaded and a detached copy cached for PRINCIPAL_CACHE_TTL seconds.
+    """
+    username = payload.get("sub")
+    cached = await principal_cache.get(username)
+    if cached is not None:
+        return await user_service.db.merge(cached, load=False)
+
+    user = await user_service.get_user_by_username(username)
+    await principal_cache.put_user(user)
+    return user
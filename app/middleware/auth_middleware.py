@@ -1,14 +1,43 @@
-from fastapi import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-
-API_KEY = "mysecretapikey123"
-
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        api_key = request.headers.get('X-API-KEY')
-        if api_key != API_KEY:
-            raise HTTPException(status_code=401, detail="Invalid API Key")
-        response = await call_next(request)
-        return response
\ No newline at end of file
+import hashlib
+import hmac
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.settings import API_KEYS
+
+
+def _digest(key: str) -> bytes:
+    # Fixed-length digests, so comparisons take the same time whatever the key length.
+    return hashlib.sha256(key.encode()).digest()
+
+
+class AuthMiddleware:
+    """Rejects HTTP requests whose ``X-API-KEY`` is not one of ``api_keys``.
+
+    Keys are hashed once at startup. Every check compares against all of
+    them with ``hmac.compare_digest``, so timing reveals neither which key
+    matched nor how much of it did.
+    """
+
+    def __init__(self, app: ASGIApp, api_keys=API_KEYS):
+        self.app = app
+        self.digests = tuple(_digest(key) for key in api_keys)
+
+    def is_valid(self, api_key: str | None) -> bool:
+        if api_key is None:
+            return False
+        digest = _digest(api_key)
+        valid = False
+        for expected in self.digests:
+            valid |= hmac.compare_digest(digest, expected)
+        return valid
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and not self.is_valid(Headers(scope=scope).get("x-api-key")):
+            response = JSONResponse({"detail": "Invalid API Key"}, status_code=401)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,12 +1,54 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class ProcessTimeMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+from app.utils import timing
+
+
+class ProcessTimeMiddleware:
+    """Adds ``X-Process-Time`` (seconds) and ``Server-Timing`` to HTTP responses.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so responses are not re-wrapped
+    and streaming bodies pass straight through. The time is measured up to
+    the response start, i.e. time-to-headers for streamed responses.
+
+    With metrics enabled, ``Server-Timing`` also lists the phases recorded
+    by ``timing.span`` during the request, and the request duration is
+    observed per route in ``http_request_duration_seconds``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        spans = [] if timing.enabled else None
+        token = timing.request_spans.set(spans)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter_ns() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{elapsed / 1e9:.6f}")
+                phases = timing.server_timing(spans) if spans else ""
+                headers.append("Server-Timing", f"{phases + ', ' if phases else ''}app;dur={elapsed / 1e6:.3f}")
+                if spans is not None:
+                    route = scope.get("route")
+                    timing.registry.observe(
+                        "http_request_duration_seconds",
+                        elapsed / 1e9,
+                        method=scope["method"],
+                        route=route.path if route is not None else "unmatched",
+                        status=message["status"],
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            timing.request_spans.reset(token)
@@ -1,5 +1,7 @@
 from app.db.base import Base
 from app.db.session import engine
+from app.models.lease_model import JobLease
+from app.models.title_model import ChartEntry, ChartRankChange, Genre, Title, title_genres
 from app.models.user_model import User
 
-# Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# Base.metadata.create_all(bind=engine)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base import Base
+
+
+class JobLease(Base):
+    __tablename__ = "job_leases"
+
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
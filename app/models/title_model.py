@@ -0,0 +1,60 @@
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String, Table, Text, func
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+title_genres = Table(
+    "title_genres",
+    Base.metadata,
+    Column("title_id", ForeignKey("titles.id", ondelete="CASCADE"), primary_key=True),
+    Column("genre_id", ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
+)
+
+
+class Genre(Base):
+    __tablename__ = "genres"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+
+class Title(Base):
+    __tablename__ = "titles"
+
+    id = Column(Integer, primary_key=True)
+    imdb_id = Column(String, nullable=False, unique=True, index=True)
+    title = Column(String, nullable=False)
+    year = Column(Integer, nullable=True)
+    rating = Column(Float, nullable=True)
+    rating_count = Column(Integer, nullable=True)
+    plot = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    runtime_minutes = Column(Integer, nullable=True)
+    certificate = Column(String, nullable=True)
+    cast = Column(JSON, nullable=True)
+    box_office = Column(JSON, nullable=True)
+    details_updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    genres = relationship(Genre, secondary=title_genres, lazy="selectin")
+
+
+class ChartEntry(Base):
+    __tablename__ = "chart_entries"
+
+    chart = Column(String, primary_key=True)
+    rank = Column(Integer, primary_key=True, index=True)
+    title_id = Column(ForeignKey("titles.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    title = relationship(Title)
+
+
+class ChartRankChange(Base):
+    __tablename__ = "chart_rank_changes"
+
+    id = Column(Integer, primary_key=True)
+    chart = Column(String, nullable=False)
+    title_id = Column(ForeignKey("titles.id", ondelete="CASCADE"), nullable=False, index=True)
+    old_rank = Column(Integer, nullable=True)
+    new_rank = Column(Integer, nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -1,14 +1,120 @@
-from fastapi import APIRouter
+import asyncio
+from typing import Literal
 
-from app.services.scraper_service import IMDBScraper
+import httpx
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+
+from app.db.session import engine, replica_engine
+from app.deps import get_chart, get_title_details
+from app.schemas.titles import IMDB_ID_PATTERN, SEARCH_PAGE_DEFAULT, SEARCH_PAGE_MAX, TitleBatchRequest
+from app.services.exceptions import TitleNotFoundException, UpstreamException
+from app.services.search import chart_index
+from app.services.stats import chart_stats
+from app.services.title_details import TitleDetailsService
+from app.services.movie import Chart
+from app.services.next_data import NextDataError
+from app.utils.conditional import http_date, is_not_modified
+from app.utils.serialization import ndjson_stream
 
 router = APIRouter(prefix="/imdb", tags=["IMDB"])
 
 @router.get("/top250")
-async def get_top_250():
-    scraper = IMDBScraper()
-    data = await scraper.fetch_top_250()
-    return {
-        'count': len(data),
-        'results': data
-    }
+async def get_top_250(request: Request, format: Literal["json", "ndjson"] = "json", chart: Chart = Depends(get_chart)):
+    # Validators are computed when the chart is loaded, so polling clients
+    # get a 304 without the chart being serialized again.
+    etag = chart.etag(format)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if chart.last_modified is not None:
+        headers["Last-Modified"] = http_date(chart.last_modified)
+    if is_not_modified(request.headers, etag, chart.last_modified):
+        return Response(status_code=304, headers=headers)
+
+    if format == "ndjson":
+        return StreamingResponse(ndjson_stream(chart.movies), media_type="application/x-ndjson", headers=headers)
+
+    # Returning the response directly skips jsonable_encoder; orjson encodes in one pass.
+    return ORJSONResponse({
+        'count': len(chart),
+        'results': chart.movies
+    }, headers=headers)
+
+
+@router.get("/search")
+async def search_titles(
+    q: str | None = Query(None, max_length=200),
+    mode: Literal["prefix", "substring"] = "prefix",
+    genre: list[str] = Query([]),
+    year_min: int | None = None,
+    year_max: int | None = None,
+    rating_min: float | None = Query(None, ge=0, le=10),
+    sort: Literal["relevance", "rank", "rating", "year"] = "relevance",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(SEARCH_PAGE_DEFAULT, ge=1, le=SEARCH_PAGE_MAX),
+    chart: Chart = Depends(get_chart),
+):
+    total, movies = chart_index(chart).search(
+        q, mode, genre, year_min, year_max, rating_min, sort, offset, limit
+    )
+    return ORJSONResponse({"total": total, "offset": offset, "limit": limit, "results": movies})
+
+
+@router.get("/stats")
+async def get_stats(chart: Chart = Depends(get_chart)):
+    return ORJSONResponse(chart_stats(chart))
+
+
+@router.get("/title/{imdb_id}")
+async def get_title(
+    imdb_id: str = Path(pattern=IMDB_ID_PATTERN),
+    title_details: TitleDetailsService = Depends(get_title_details),
+):
+    try:
+        return await title_details.get(imdb_id)
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            raise TitleNotFoundException()
+        raise UpstreamException()
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        raise UpstreamException()
+    except NextDataError:
+        # A page without title data is IMDb's soft 404.
+        raise TitleNotFoundException()
+
+
+@router.post("/titles")
+async def get_titles(batch: TitleBatchRequest, title_details: TitleDetailsService = Depends(get_title_details)):
+    async def results():
+        async for imdb_id, details, error in title_details.iter_many(batch.ids):
+            yield {"imdb_id": imdb_id, "result": details} if error is None else {"imdb_id": imdb_id, "error": error}
+
+    return StreamingResponse(ndjson_stream(results(), chunk_lines=1), media_type="application/x-ndjson")
+
+
+@router.get("/pool")
+async def get_pool_stats(request: Request):
+    return request.app.state.http_clients.stats()
+
+
+@router.get("/proxies")
+async def get_proxy_stats(request: Request):
+    return request.app.state.proxy_pool.stats()
+
+
+@router.get("/cache")
+async def get_cache_stats(request: Request):
+    store = request.app.state.chart_store
+    return {**store.cache.stats, "snapshot": store.stats}
+
+
+@router.get("/executor")
+async def get_executor_stats(request: Request):
+    return request.app.state.parse_executor.stats()
+
+
+@router.get("/db")
+async def get_db_pool_stats():
+    stats = {"primary": engine.sync_engine.pool.stats()}
+    if replica_engine is not engine:
+        stats["replica"] = replica_engine.sync_engine.pool.stats()
+    return stats
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.session import engine, replica_engine
+from app.utils import timing
+from app.utils.timing import render_histogram
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    engines = {"primary": engine}
+    if replica_engine is not engine:
+        engines["replica"] = replica_engine
+
+    lines = ["# TYPE db_pool_checkout_wait_seconds histogram"]
+    for name, db_engine in engines.items():
+        lines += render_histogram("db_pool_checkout_wait_seconds", {"engine": name}, db_engine.sync_engine.pool.metrics)
+    return PlainTextResponse(timing.registry.render() + "\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
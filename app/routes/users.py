@@ -1,56 +1,84 @@
-from fastapi import Depends, HTTPException, APIRouter, Body
+from typing import Literal
+
+from fastapi import Depends, HTTPException, APIRouter, Body, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt, JWTError
-from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 from starlette import status
 
-from app.core.security import verify_password, create_access_token, hash_password, create_refresh_token, SECRET_KEY, \
-    ALGORITHM
-from app.deps import get_db, payload_check, get_user_service
+from app.core.security import verify_password_async, create_access_token, hash_password_async, create_refresh_token, \
+    SECRET_KEY, ALGORITHM, principal_cache, password_hasher
+from app.core.settings import USERS_BULK_BATCH_SIZE
+from app.deps import get_db, payload_check, get_user_service, get_current_user, get_read_user_service
 from app.models import User
-from app.schemas.users import UserRead, UserCreate, UserResponse, UserPatch
+from app.schemas.users import UserRead, UserCreate, UserResponse, UserPatch, USERS_PAGE_DEFAULT, USERS_PAGE_MAX
 from app.services.exceptions import EmailTakenException
+from app.services.user_import import UserImporter
 from app.services.users import  UserService
+from app.utils.serialization import DuplexStreamingResponse, iter_json_array, iter_ndjson, ndjson_stream
 
 router = APIRouter(tags=["users"])
 
 @router.post("/users/create", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(user:UserCreate, user_service: UserService = Depends(get_user_service)):
-    stmt = select(User).where(
-        or_(
-            User.username == user.username,
-            User.email == user.email
-        )
-    )
+    if user.username == "admin":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username 'admin' is not allowed.", headers={'x-error-code': 'INVALID_USERNAME'})
 
-    result = await user_service.db.execute(stmt)
-    db_user = result.scalars().one_or_none()
+    user.password = await hash_password_async(user.password)
 
-    if db_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username Or Email already registered.", headers={'x-error-code': 'USERNAME_OR_EMAIL_TAKEN'})
+    # Duplicate usernames/emails are rejected by the unique constraints.
+    saved_instance = await user_service.create_user(user.model_dump())
 
-    elif user.username == "admin":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username 'admin' is not allowed.", headers={'x-error-code': 'INVALID_USERNAME'})
+    return {"message": "User created successfully", "user": saved_instance}
 
-    user.password = hash_password(user.password)
-    new_user = User(**user.model_dump())
 
-    saved_instance = await user_service.db_add_commit_refresh( new_user)
+@router.post("/users/bulk")
+async def bulk_create_users(request: Request, user_service: UserService = Depends(get_user_service), payload = Depends(payload_check)):
+    """Create users from a JSON array or an NDJSON stream of UserCreate rows.
+
+    The body is parsed, hashed and inserted batch by batch while results
+    stream back as NDJSON, one line per row and a summary line last.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "application/x-ndjson":
+        items = iter_ndjson(request.stream())
+    elif content_type == "application/json":
+        items = iter_json_array(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/json or application/x-ndjson.",
+            headers={'x-error-code': 'UNSUPPORTED_MEDIA_TYPE'},
+        )
 
-    return {"message": "User created successfully", "user": saved_instance}
+    importer = UserImporter(user_service, password_hasher, USERS_BULK_BATCH_SIZE)
+    return DuplexStreamingResponse(ndjson_stream(importer.run(items)), media_type="application/x-ndjson")
 
 
 @router.get("/users/get/{user_id}", response_model=UserResponse)
-async def get_user(user_id:int, user_service: UserService = Depends(get_user_service), payload = Depends(payload_check)):
+async def get_user(user_id:int, user_service: UserService = Depends(get_read_user_service), payload = Depends(payload_check)):
     db_user = await user_service.get_user_by_id_or_404(user_id)
     return {"message": "User fetched successfully", "user": db_user}
 
 
 @router.get("/users", response_model=list[UserRead])
-async def get_all_users(user_service: UserService = Depends(get_user_service), user=Depends(payload_check)):
-    db_users = await user_service.get_all_users_db()
-    return db_users
+async def get_all_users(
+    response: Response,
+    after: int | None = Query(None, description="Return users with an id greater than this cursor."),
+    limit: int = Query(USERS_PAGE_DEFAULT, ge=1, le=USERS_PAGE_MAX),
+    format: Literal["json", "ndjson"] = "json",
+    user_service: UserService = Depends(get_read_user_service),
+    user=Depends(payload_check),
+):
+    if format == "ndjson":
+        # Every user after the cursor, streamed from a server-side cursor; limit does not apply.
+        return StreamingResponse(ndjson_stream(user_service.stream_users(after)), media_type="application/x-ndjson")
+
+    users = await user_service.get_users_page(after, limit)
+    if len(users) == limit:
+        response.headers["Link"] = f'</users?after={users[-1]["id"]}&limit={limit}>; rel="next"'
+    return users
 
 
 @router.post("/users/login")
@@ -60,7 +88,7 @@ async def login(
 ):
     user = await user_service.get_user_by_username(form.username)
 
-    if not verify_password(form.password, user.password):
+    if not await verify_password_async(form.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     access_token = create_access_token({"sub": user.username})
@@ -93,27 +121,21 @@ async def refresh(refresh_token: str = Body(...)):
 
 
 @router.get("/profile", response_model=UserResponse)
-async def profile(payload = Depends(payload_check), user_service: UserService = Depends(get_user_service)):
-    username = payload.get("sub")
-    user = await user_service.get_user_by_username(username=username)
-
+async def profile(user: User = Depends(get_current_user)):
     return {"message": "Profile fetched successfully", "user": user}
 
 
 @router.put("/users/update/", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def update_user(user_update: UserCreate, user_service: UserService = Depends(get_user_service), payload = Depends(payload_check)):
     username = payload.get("sub")
-    db_user = await user_service.get_user_by_username(username=username)
 
     if user_update.username == "admin":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username 'admin' is not allowed.", headers={'x-error-code': 'INVALID_USERNAME'})
 
-    user_update.password = hash_password(user_update.password)
-    for key, value in user_update.model_dump().items():
-        if hasattr(db_user, key):
-            setattr(db_user, key, value)
+    user_update.password = await hash_password_async(user_update.password)
 
-    saved_instance = await user_service.db_commit_refresh(db_user)
+    saved_instance = await user_service.update_user(username, user_update.model_dump())
+    await principal_cache.invalidate(username)
 
     return {"message": "User updated", "user": saved_instance}
 
@@ -121,19 +143,15 @@ async def update_user(user_update: UserCreate, user_service: UserService = Depen
 @router.patch("/users/patch/", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def patch_user(user_update: UserPatch, user_service: UserService = Depends(get_user_service), payload = Depends(payload_check)):
     username = payload.get("sub")
-    db_user = await user_service.get_user_by_username(username)
 
     if user_update.username == "admin":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username 'admin' is not allowed.", headers={'x-error-code': 'INVALID_USERNAME'})
 
     if user_update.password:
-        user_update.password = hash_password(user_update.password)
-
-    for key, value in user_update.model_dump(exclude_unset=True).items():
-        if hasattr(db_user, key):
-            setattr(db_user, key, value)
+        user_update.password = await hash_password_async(user_update.password)
 
-    saved_instance = await user_service.db_commit_refresh( db_user)
+    saved_instance = await user_service.update_user(username, user_update.model_dump(exclude_unset=True))
+    await principal_cache.invalidate(username)
 
     return {"message": "User patched", "user": saved_instance}
 
@@ -141,8 +159,7 @@ async def patch_user(user_update: UserPatch, user_service: UserService = Depends
 @router.delete("/users/delete/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user_service: UserService = Depends(get_user_service),payload = Depends(payload_check)):
     username = payload.get("sub")
-    db_user = await user_service.get_user_by_username(username)
-
-    await user_service.db_delete_commit( db_user)
+    await user_service.delete_user(username)
+    await principal_cache.invalidate(username)
 
     return {"message": "User deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,14 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field, StringConstraints
+
+IMDB_ID_PATTERN = r"^tt\d{7,}$"
+TITLE_BATCH_MAX = 100
+SEARCH_PAGE_DEFAULT = 20
+SEARCH_PAGE_MAX = 100
+
+ImdbId = Annotated[str, StringConstraints(pattern=IMDB_ID_PATTERN)]
+
+
+class TitleBatchRequest(BaseModel):
+    ids: list[ImdbId] = Field(min_length=1, max_length=TITLE_BATCH_MAX)
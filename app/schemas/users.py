@@ -1,6 +1,21 @@
-from typing import Union, Optional
+from typing import Annotated, Union, Optional
 
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel
+
+USERS_PAGE_DEFAULT = 50
+USERS_PAGE_MAX = 500
+
+# passlib refuses to hash anything longer (PasswordSizeError).
+PASSWORD_MAX_BYTES = 4096
+
+
+def _check_password_size(password: str) -> str:
+    if len(password.encode()) > PASSWORD_MAX_BYTES:
+        raise ValueError(f"Password must be at most {PASSWORD_MAX_BYTES} bytes.")
+    return password
+
+
+Password = Annotated[str, AfterValidator(_check_password_size)]
 
 class BaseUser(BaseModel):
     username: str
@@ -8,7 +23,7 @@ class BaseUser(BaseModel):
 
 
 class UserCreate(BaseUser):
-    password: str
+    password: Password
 
 class UserRead(BaseUser):
     id : int
@@ -23,7 +38,7 @@ class UserResponse(BaseModel):
 class UserPatch(BaseModel):
     username: Union[str, None] = None
     email: Union[str, None] = None
-    password: Union[str, None] = None
+    password: Union[Password, None] = None
 
     class Config:
         orm_mode = True
\ No newline at end of file
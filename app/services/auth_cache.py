@@ -0,0 +1,70 @@
+import logging
+
+import orjson
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.services.cache import ExpiringLRU
+from app.services.cache_backend import CacheBackend, CacheBackendError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache(ExpiringLRU):
+    """Decoded JWT payloads keyed by the raw token, kept no longer than its ``exp``."""
+
+    def put_payload(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            self.put(token, payload, exp)
+
+
+class PrincipalCache:
+    """Recently authenticated users keyed by username, for ``ttl`` seconds.
+
+    Entries are the user's ``fields`` in the cache backend, so with a
+    shared backend every worker sees one copy and an invalidation after an
+    update reaches all of them. Only what a principal needs is stored; the
+    password hash never leaves the database. ``get`` builds a new detached
+    instance per call, never one bound to another request's session.
+    Backend failures count as misses.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        model,
+        ttl: float,
+        prefix: str = "principal:",
+        fields=("id", "username", "email"),
+    ):
+        self.backend = backend
+        self.model = model
+        self.ttl = ttl
+        self.prefix = prefix
+        self.fields = tuple(fields)
+
+    async def get(self, username: str):
+        try:
+            data = await self.backend.get(self.prefix + username)
+        except CacheBackendError as exc:
+            logger.warning("Principal cache read failed: %r", exc)
+            return None
+        if data is None:
+            return None
+
+        user = self.model(**orjson.loads(data))
+        make_transient_to_detached(user)
+        return user
+
+    async def put_user(self, user):
+        values = {field: getattr(user, field) for field in self.fields}
+        try:
+            await self.backend.set(self.prefix + user.username, orjson.dumps(values), self.ttl)
+        except CacheBackendError as exc:
+            logger.warning("Principal cache write failed: %r", exc)
+
+    async def invalidate(self, username: str):
+        try:
+            await self.backend.invalidate([self.prefix + username])
+        except CacheBackendError as exc:
+            logger.warning("Principal cache invalidation failed: %r", exc)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiringLRU:
+    """Bounded LRU mapping whose entries each carry their own expiry time."""
+
+    def __init__(self, maxsize: int, clock=time.time):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def put(self, key, value, expires_at: float):
+        if self.maxsize <= 0 or expires_at <= self.clock():
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value, fresh_until, stale_until):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SWRCache:
+    """In-process TTL cache with stale-while-revalidate and single-flight loads.
+
+    A fresh entry is returned as-is. A stale entry is returned immediately
+    while one background task reloads it. Concurrent misses on the same key
+    share a single loader call.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._entries = {}
+        self._inflight = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    async def get_or_load(self, key, loader):
+        entry = self._entries.get(key)
+        now = self.clock()
+
+        if entry is not None and now < entry.fresh_until:
+            self.stats["hits"] += 1
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self.stats["stale_hits"] += 1
+            self._start_load(key, loader)
+            return entry.value
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def set(self, key, value):
+        now = self.clock()
+        self._entries[key] = CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def _start_load(self, key, loader):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            task.add_done_callback(_log_failure)
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key, loader):
+        self.stats["refreshes"] += 1
+        try:
+            value = await loader()
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.set(key, value)
+        return value
+
+
+def _log_failure(task: asyncio.Task):
+    # Retrieving the exception also keeps asyncio from warning about
+    # background refreshes nobody awaited.
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Cache load failed: %r", task.exception())
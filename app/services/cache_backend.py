@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import math
+import time
+import uuid
+from urllib.parse import unquote, urlsplit
+
+from app.core.settings import CACHE_MEMORY_SIZE, CACHE_URL
+from app.services.cache import ExpiringLRU
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class CacheBackendError(Exception):
+    """The backend could not be reached or rejected a command; callers treat it as a miss."""
+
+
+class CacheBackend:
+    """Bytes-valued cache shared by the chart store and the principal cache.
+
+    Values are opaque bytes, so callers pick their own serialization. With
+    a ``shared`` backend every worker reads the same entries, and
+    ``invalidate`` also tells the other workers, through ``listen``, to
+    drop what they derived from those keys.
+    """
+
+    shared = False
+
+    async def get(self, key: str) -> bytes | None:
+        return (await self.mget([key]))[0]
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None):
+        await self.mset({key: value}, ttl)
+
+    async def mget(self, keys) -> list[bytes | None]:
+        raise NotImplementedError
+
+    async def mset(self, items: dict[str, bytes], ttl: float | None = None):
+        raise NotImplementedError
+
+    async def delete(self, keys):
+        raise NotImplementedError
+
+    async def invalidate(self, keys):
+        """Delete ``keys`` and notify the other workers."""
+        await self.delete(keys)
+
+    async def notify(self, keys):
+        """Tell the other workers ``keys`` changed, without deleting them."""
+
+    async def listen(self, callback):
+        """Call ``callback(key)`` for keys other workers invalidate; runs until cancelled."""
+
+    async def aclose(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU; the default for a single worker."""
+
+    def __init__(self, maxsize: int, clock=time.monotonic):
+        self.clock = clock
+        self.entries = ExpiringLRU(maxsize, clock)
+
+    async def mget(self, keys):
+        return [self.entries.get(key) for key in keys]
+
+    async def mset(self, items, ttl=None):
+        expires_at = self.clock() + ttl if ttl is not None else math.inf
+        for key, value in items.items():
+            self.entries.put(key, value, expires_at)
+
+    async def delete(self, keys):
+        for key in keys:
+            self.entries.invalidate(key)
+
+    @property
+    def stats(self):
+        return {**self.entries.stats, "entries": len(self.entries)}
+
+
+def _encode(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return CacheBackendError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(f"unexpected reply {line!r}")
+
+
+class RedisBackend(CacheBackend):
+    """Redis (RESP2) backend over one pipelined connection.
+
+    Every call is one round trip: ``mget`` is a single MGET, ``mset`` a
+    pipeline of ``SET key value PX ttl``, and ``invalidate`` pipelines the
+    DEL with one PUBLISH per key. ``listen`` holds its own SUBSCRIBE
+    connection and reconnects after failures.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "imdb:", timeout: float = 1.0, channel: str = INVALIDATION_CHANNEL):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self.channel = channel
+        # Lets a worker ignore its own invalidations.
+        self.origin = uuid.uuid4().hex
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self.stats = {"round_trips": 0, "errors": 0}
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            writer.write(b"".join(_encode(*command) for command in setup))
+            for _ in setup:
+                reply = await _read_reply(reader)
+                if isinstance(reply, CacheBackendError):
+                    writer.close()
+                    raise reply
+        return reader, writer
+
+    async def execute(self, *commands):
+        """Send ``commands`` in one write and return their replies in order."""
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._pipeline(commands), self.timeout)
+            except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                self._drop()
+                self.stats["errors"] += 1
+                raise CacheBackendError(f"cache backend unavailable: {exc!r}") from exc
+
+    async def _pipeline(self, commands):
+        if self._connection is None:
+            self._connection = await self._connect()
+        reader, writer = self._connection
+
+        writer.write(b"".join(_encode(*command) for command in commands))
+        await writer.drain()
+        replies = [await _read_reply(reader) for _ in commands]
+        self.stats["round_trips"] += 1
+        for reply in replies:
+            if isinstance(reply, CacheBackendError):
+                raise reply
+        return replies
+
+    def _drop(self):
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+
+    async def mget(self, keys):
+        keys = list(keys)
+        if not keys:
+            return []
+        (values,) = await self.execute(("MGET", *(self.prefix + key for key in keys)))
+        return values
+
+    async def mset(self, items, ttl=None):
+        if not items:
+            return
+        expiry = ("PX", max(1, int(ttl * 1000))) if ttl is not None else ()
+        await self.execute(*(("SET", self.prefix + key, value, *expiry) for key, value in items.items()))
+
+    async def delete(self, keys):
+        keys = list(keys)
+        if keys:
+            await self.execute(("DEL", *(self.prefix + key for key in keys)))
+
+    def _publish(self, keys):
+        return [("PUBLISH", self.channel, f"{self.origin} {key}") for key in keys]
+
+    async def invalidate(self, keys):
+        keys = list(keys)
+        if keys:
+            await self.execute(("DEL", *(self.prefix + key for key in keys)), *self._publish(keys))
+
+    async def notify(self, keys):
+        keys = list(keys)
+        if keys:
+            await self.execute(*self._publish(keys))
+
+    async def listen(self, callback, retry_delay: float = 1.0):
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._connect()
+                writer.write(_encode("SUBSCRIBE", self.channel))
+                await writer.drain()
+                while True:
+                    message = await _read_reply(reader)
+                    if not isinstance(message, list) or message[0] != b"message":
+                        continue
+                    origin, _, key = message[2].decode().partition(" ")
+                    if origin != self.origin:
+                        callback(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener failed: %r", exc)
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(retry_delay)
+
+    async def aclose(self):
+        if self._connection is not None:
+            writer = self._connection[1]
+            self._drop()
+            await writer.wait_closed()
+
+
+def make_backend(url: str = CACHE_URL, memory_size: int = CACHE_MEMORY_SIZE) -> CacheBackend:
+    """``memory://`` (or empty) for a per-process LRU, ``redis://[:password@]host:port/db`` to share it."""
+    scheme = urlsplit(url).scheme if url else "memory"
+    if scheme == "memory":
+        return MemoryBackend(memory_size)
+    if scheme == "redis":
+        return RedisBackend(url)
+    raise ValueError(f"unsupported CACHE_URL scheme: {scheme!r}")
+
+
+cache_backend = make_backend()
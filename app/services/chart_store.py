@@ -0,0 +1,79 @@
+import logging
+
+from app.services.cache import SWRCache
+from app.services.cache_backend import CacheBackend, CacheBackendError
+from app.services.movie import Chart
+from app.services.titles import TOP_250_CACHE_KEY, load_top_250, prepare_chart
+
+logger = logging.getLogger(__name__)
+
+
+class ChartStore:
+    """The served chart: this worker's SWRCache in front of the cache backend.
+
+    With a shared backend, a miss reads the chart snapshot every worker
+    shares before falling back to the database. The worker that refreshes
+    the chart publishes it once: the snapshot is overwritten and the other
+    workers drop their copy, so they all serve the same fetched chart.
+    Backend failures fall back to the database.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        cache: SWRCache,
+        loader=load_top_250,
+        key: str = TOP_250_CACHE_KEY,
+        ttl: float | None = None,
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.loader = loader
+        self.key = key
+        self.ttl = ttl
+        self.stats = {"snapshot_hits": 0, "snapshot_misses": 0, "invalidations": 0, "errors": 0}
+
+    async def get(self) -> Chart:
+        return await self.cache.get_or_load(self.key, self._load)
+
+    async def _load(self) -> Chart:
+        if self.backend.shared:
+            try:
+                data = await self.backend.get(self.key)
+            except CacheBackendError as exc:
+                self._failed("read", exc)
+                data = None
+            if data is not None:
+                self.stats["snapshot_hits"] += 1
+                return prepare_chart(Chart.from_bytes(data))
+            self.stats["snapshot_misses"] += 1
+
+        chart = await self.loader()
+        await self._store(chart, notify=False)
+        return chart
+
+    async def publish(self, chart: Chart):
+        """Serve ``chart`` here and make every other worker switch to it."""
+        self.cache.set(self.key, chart)
+        await self._store(chart, notify=True)
+
+    async def _store(self, chart: Chart, notify: bool):
+        if not self.backend.shared:
+            return
+        try:
+            # Written before the notification, so workers reloading on it read the new snapshot.
+            await self.backend.set(self.key, chart.to_bytes(), self.ttl)
+            if notify:
+                await self.backend.notify([self.key])
+        except CacheBackendError as exc:
+            self._failed("write", exc)
+
+    def on_invalidate(self, key: str):
+        """``CacheBackend.listen`` callback: another worker published a new chart."""
+        if key == self.key:
+            self.stats["invalidations"] += 1
+            self.cache.invalidate(key)
+
+    def _failed(self, action, exc):
+        self.stats["errors"] += 1
+        logger.warning("Chart snapshot %s failed: %r", action, exc)
@@ -7,4 +7,28 @@ class UserNotFoundException(HTTPException):
 
 class EmailTakenException(HTTPException):
     def __init__(self):
-        super().__init__(status_code=400, detail="Email belongs to another user.", headers={'x-error-code': 'EMAIL_TAKEN'})
\ No newline at end of file
+        super().__init__(status_code=400, detail="Email belongs to another user.", headers={'x-error-code': 'EMAIL_TAKEN'})
+
+class UsernameOrEmailTakenException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Username Or Email already registered.", headers={'x-error-code': 'USERNAME_OR_EMAIL_TAKEN'})
+
+class UsernameTakenException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Username belongs to another user.", headers={'x-error-code': 'USERNAME_TAKEN'})
+
+class ChartNotReadyException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=503, detail="Chart has not been scraped yet.", headers={'x-error-code': 'CHART_NOT_READY', 'Retry-After': '30'})
+
+class TitleNotFoundException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=404, detail="Title not found.", headers={'x-error-code': 'TITLE_NOT_FOUND'})
+
+class UpstreamException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=502, detail="IMDb request failed.", headers={'x-error-code': 'UPSTREAM_ERROR'})
+
+class PasswordHasherBusyException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=429, detail="Too many password checks in progress.", headers={'x-error-code': 'PASSWORD_HASHER_BUSY', 'Retry-After': '1'})
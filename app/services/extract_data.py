@@ -1,21 +1,68 @@
-def extract_250_movies(datas):
-    results = []
+from app.services.movie import Movie, genre_table
+
 
+def iter_250_movies(datas):
     for item in datas:
-        node = item.get("node", {})
-
-        results.append({
-            "rank": item.get("currentRank"),
-            "imdb_id": node.get("id"),
-            "title": node.get("titleText", {}).get("text"),
-            "year": node.get("releaseYear", {}).get("year"),
-            "rating": node.get("ratingsSummary", {}).get("aggregateRating"),
-            "rating_count": node.get("ratingsSummary", {}).get("voteCount"),
-            "plot": node.get("plot", {}).get("plotText", {}).get("plainText"),
-            "genres": [
+        node = item.get("node") or {}
+        ratings = node.get("ratingsSummary") or {}
+        plot = (node.get("plot") or {}).get("plotText") or {}
+
+        yield Movie(
+            rank=item.get("currentRank"),
+            imdb_id=node.get("id"),
+            title=(node.get("titleText") or {}).get("text"),
+            year=(node.get("releaseYear") or {}).get("year"),
+            rating=ratings.get("aggregateRating"),
+            rating_count=ratings.get("voteCount"),
+            plot=plot.get("plainText"),
+            genres=genre_table.intern(
                 g["genre"]["text"]
-                for g in node.get("titleGenres", {}).get("genres", [])
-            ]
-        })
+                for g in (node.get("titleGenres") or {}).get("genres", [])
+            ),
+        )
+
+
+def extract_250_movies(datas):
+    return list(iter_250_movies(datas))
+
+
+def _money(node):
+    node = node or {}
+    total = node.get("total") or node
+    if total.get("amount") is None:
+        return None
+    return {"amount": total.get("amount"), "currency": total.get("currency")}
+
+
+def extract_title_details(data):
+    page = data.get("props", {}).get("pageProps", {})
+    above = page.get("aboveTheFoldData") or {}
+    main = page.get("mainColumnData") or {}
+
+    runtime = (above.get("runtime") or {}).get("seconds")
+    ratings = above.get("ratingsSummary") or {}
 
-    return results
+    return {
+        "imdb_id": above.get("id"),
+        "title": (above.get("titleText") or {}).get("text"),
+        "year": (above.get("releaseYear") or {}).get("year"),
+        "rating": ratings.get("aggregateRating"),
+        "rating_count": ratings.get("voteCount"),
+        "plot": ((above.get("plot") or {}).get("plotText") or {}).get("plainText"),
+        "genres": [g["text"] for g in (above.get("genres") or {}).get("genres", [])],
+        "runtime_minutes": runtime // 60 if runtime else None,
+        "certificate": (above.get("certificate") or {}).get("rating"),
+        "cast": [
+            {
+                "name": edge["node"]["name"]["nameText"]["text"],
+                "characters": [c["name"] for c in edge["node"].get("characters") or []],
+            }
+            for edge in (main.get("cast") or {}).get("edges", [])
+        ],
+        "box_office": {
+            "budget": _money((main.get("productionBudget") or {}).get("budget")),
+            "gross_domestic": _money(main.get("lifetimeGross")),
+            "gross_worldwide": _money(main.get("worldwideGross")),
+            "opening_weekend": _money((main.get("openingWeekendGross") or {}).get("gross")),
+        },
+    }
@@ -0,0 +1,110 @@
+import time
+
+import httpx
+
+from app.core.settings import (
+    HTTP2_ENABLED,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+)
+from app.utils import timing
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+
+
+class HTTPClientPool:
+    """One long-lived ``httpx.AsyncClient`` per proxy (``None`` = direct).
+
+    Clients keep their connections alive between requests, so repeated
+    scrapes skip the DNS lookup and TCP/TLS handshake.
+    """
+
+    def __init__(
+        self,
+        proxies=None,
+        headers=None,
+        timeout=HTTP_TIMEOUT,
+        http2=HTTP2_ENABLED,
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        transport=None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.clients = {}
+        for proxy in [None, *(proxies or [])]:
+            self.clients[proxy] = httpx.AsyncClient(
+                headers=headers or DEFAULT_HEADERS,
+                timeout=timeout,
+                follow_redirects=True,
+                http2=http2,
+                limits=self.limits,
+                proxy=proxy,
+                transport=transport,
+            )
+
+    def get(self, proxy=None) -> httpx.AsyncClient:
+        return self.clients[proxy]
+
+    async def aclose(self):
+        for client in self.clients.values():
+            await client.aclose()
+        self.clients.clear()
+
+    def stats(self):
+        return {
+            proxy or "direct": _client_stats(client)
+            for proxy, client in self.clients.items()
+        }
+
+
+def _client_stats(client: httpx.AsyncClient):
+    # httpx does not expose pool state publicly; read it from httpcore.
+    pool = getattr(client._transport, "_pool", None)
+    if pool is None:
+        return {"in_use": 0, "idle": 0, "waiting": 0}
+
+    connections = pool.connections
+    idle = sum(1 for conn in connections if conn.is_idle())
+    return {
+        "in_use": len(connections) - idle,
+        "idle": idle,
+        "waiting": sum(1 for request in pool._requests if request.is_queued()),
+    }
+
+
+# httpcore trace events, by prefix, and the phase each one is timed as.
+TRACE_PHASES = {
+    "connection.connect_tcp": "upstream.connect",
+    "connection.start_tls": "upstream.tls",
+    "http11.receive_response_headers": "upstream.wait",
+    "http2.receive_response_headers": "upstream.wait",
+    "http11.receive_response_body": "upstream.download",
+    "http2.receive_response_body": "upstream.download",
+}
+
+
+def trace_phases():
+    """An httpx ``trace`` extension that splits a request into timed phases."""
+    started = {}
+
+    async def trace(event_name, info):
+        prefix, _, stage = event_name.rpartition(".")
+        phase = TRACE_PHASES.get(prefix)
+        if phase is None:
+            return
+        if stage == "started":
+            started[prefix] = time.perf_counter_ns()
+        elif prefix in started:
+            timing.record(phase, time.perf_counter_ns() - started.pop(prefix))
+
+    return trace
@@ -0,0 +1,123 @@
+import gc
+import hashlib
+import math
+import struct
+import sys
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import orjson
+
+# Chart snapshot layout: magic, digest, last-modified timestamp (NaN if
+# unknown), then the zlib-compressed rows as JSON arrays in Movie field order.
+SNAPSHOT_MAGIC = b"CHT1"
+SNAPSHOT_HEADER = struct.Struct(">4s16sd")
+
+
+class GenreTable:
+    """Shares one tuple per distinct genre combination.
+
+    Thousands of titles use a few hundred genre combinations, so every
+    Movie with the same genres points at the same interned tuple.
+    """
+
+    def __init__(self):
+        self._table = {}
+
+    def intern(self, names) -> tuple[str, ...]:
+        key = tuple(names)
+        interned = self._table.get(key)
+        if interned is None:
+            key = tuple(sys.intern(name) for name in key)
+            interned = self._table.setdefault(key, key)
+        return interned
+
+    def __len__(self):
+        return len(self._table)
+
+
+genre_table = GenreTable()
+
+
+@dataclass(slots=True)
+class Movie:
+    """One chart title. orjson serializes it directly in the response shape."""
+
+    rank: int | None
+    imdb_id: str | None
+    title: str | None
+    year: int | None
+    rating: float | None
+    rating_count: int | None
+    plot: str | None
+    genres: tuple[str, ...]
+
+    def to_dict(self):
+        return {
+            "rank": self.rank,
+            "imdb_id": self.imdb_id,
+            "title": self.title,
+            "year": self.year,
+            "rating": self.rating,
+            "rating_count": self.rating_count,
+            "plot": self.plot,
+            "genres": list(self.genres),
+        }
+
+
+class Chart:
+    """A loaded chart with its HTTP validators, computed once per load.
+
+    ``digest`` hashes the serialized rows, so identical charts loaded by
+    different workers share the same ETag.
+    """
+
+    __slots__ = ("movies", "digest", "last_modified", "index", "stats")
+
+    def __init__(self, movies: list[Movie], last_modified: datetime | None = None, digest: str | None = None):
+        self.movies = movies
+        self.digest = digest or hashlib.blake2b(orjson.dumps(movies), digest_size=16).hexdigest()
+        self.last_modified = last_modified
+        # Derived views, built by search.chart_index() and stats.chart_stats().
+        self.index = None
+        self.stats = None
+
+    def etag(self, variant: str) -> str:
+        return f'"{self.digest}-{variant}"'
+
+    def __len__(self):
+        return len(self.movies)
+
+    def __iter__(self):
+        return iter(self.movies)
+
+    def to_bytes(self) -> bytes:
+        """Binary snapshot for sharing the chart between workers."""
+        timestamp = self.last_modified.timestamp() if self.last_modified is not None else math.nan
+        rows = [
+            (m.rank, m.imdb_id, m.title, m.year, m.rating, m.rating_count, m.plot, m.genres)
+            for m in self.movies
+        ]
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, bytes.fromhex(self.digest), timestamp)
+        return header + zlib.compress(orjson.dumps(rows), 1)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Chart":
+        magic, digest, timestamp = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a chart snapshot")
+
+        # The rows hold no reference cycles; without the collector pausing
+        # decoding is several times faster on a large chart.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            rows = orjson.loads(zlib.decompress(data[SNAPSHOT_HEADER.size:]))
+            movies = [Movie(*row[:7], genre_table.intern(row[7])) for row in rows]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        last_modified = None if math.isnan(timestamp) else datetime.fromtimestamp(timestamp, timezone.utc)
+        # The digest travels with the rows, so the ETag matches the writer's.
+        return cls(movies, last_modified, digest.hex())
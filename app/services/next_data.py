@@ -0,0 +1,61 @@
+import json
+
+from bs4 import BeautifulSoup
+
+from app.utils.timing import span
+
+NEXT_DATA_MARKER = b'id="__NEXT_DATA__"'
+SCRIPT_END = b"</script>"
+
+
+class NextDataError(RuntimeError):
+    """The page carries no usable ``__NEXT_DATA__`` payload."""
+
+
+def find_next_data(content: bytes) -> bytes | None:
+    """Slice the ``__NEXT_DATA__`` script body out of raw page bytes.
+
+    Next.js renders the script at the end of the body, so scan backwards
+    for its id and take everything up to the closing tag. No DOM is built.
+    """
+    marker = content.rfind(NEXT_DATA_MARKER)
+    if marker == -1:
+        return None
+
+    tag_start = content.rfind(b"<script", 0, marker)
+    body_start = content.find(b">", marker)
+    if tag_start == -1 or body_start == -1:
+        return None
+
+    body_end = content.find(SCRIPT_END, body_start)
+    if body_end == -1:
+        return None
+
+    return content[body_start + 1:body_end]
+
+
+def _find_next_data_soup(content: bytes) -> str | None:
+    soup = BeautifulSoup(content, "lxml")
+    script_tag = soup.find("script", id="__NEXT_DATA__")
+    if not script_tag or not script_tag.string:
+        return None
+    return script_tag.string
+
+
+def extract_next_data(content: bytes) -> dict:
+    with span("parse.scan"):
+        payload = find_next_data(content)
+    if payload:
+        try:
+            with span("parse.json"):
+                return json.loads(payload)
+        except ValueError:
+            pass
+
+    # Unusual markup (attribute order, quoting): fall back to a real parser.
+    with span("parse.soup"):
+        payload = _find_next_data_soup(content)
+    if payload is None:
+        raise NextDataError("IMDB NEXT_DATA not found")
+    with span("parse.json"):
+        return json.loads(payload)
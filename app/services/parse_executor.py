@@ -0,0 +1,77 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.utils import timing
+
+EXECUTOR_MODES = ("process", "thread", "inline")
+
+
+def _timed_call(fn, *args):
+    # Spans recorded in a worker are shipped back and replayed by the caller.
+    start = time.perf_counter()
+    result, spans = timing.collect_spans(fn, *args)
+    return result, time.perf_counter() - start, spans
+
+
+class ParseExecutor:
+    """Runs CPU-heavy parsing off the event loop.
+
+    ``process`` uses a pool sized to the cores, ``thread`` a thread pool and
+    ``inline`` calls the function directly (useful for tests and debugging).
+    Functions and arguments must be picklable in ``process`` mode, so callers
+    pass raw response bytes rather than parsed objects.
+    """
+
+    def __init__(self, mode: str = "process", max_workers: int | None = None, history: int = 100):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown parse executor mode {mode!r}, expected one of {EXECUTOR_MODES}")
+
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if mode == "process":
+            self.executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        elif mode == "thread":
+            self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="parse")
+        else:
+            self.executor = None
+
+        self.pending = 0
+        self.completed = 0
+        self.timings = deque(maxlen=history)
+
+    async def run(self, fn, *args):
+        submitted = time.perf_counter()
+        self.pending += 1
+        try:
+            if self.executor is None:
+                result, run_time, spans = _timed_call(fn, *args)
+            else:
+                loop = asyncio.get_running_loop()
+                result, run_time, spans = await loop.run_in_executor(self.executor, _timed_call, fn, *args)
+        finally:
+            self.pending -= 1
+
+        total = time.perf_counter() - submitted
+        timing.replay(spans)
+        if timing.enabled:
+            timing.record("parse.queue", int((total - run_time) * 1e9))
+        self.completed += 1
+        self.timings.append({"task": fn.__name__, "queued": total - run_time, "run": run_time})
+        return result
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "queue_depth": self.pending,
+            "completed": self.completed,
+            "recent": list(self.timings),
+        }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
@@ -1,14 +1,148 @@
-import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
 
-class ProxyRouter:
-    def __init__(self, proxies):
-        self.proxies = proxies
-        self.lock = asyncio.Lock()
-        self.index = 0
 
-    async def get_proxy(self):
-        async with self.lock:
-            proxy = self.proxies[self.index]
-            self.index = (self.index + 1) % len(self.proxies)
-            return proxy
+class ProxyState:
+    """Health of one proxy. ``url=None`` stands for a direct connection."""
+
+    __slots__ = (
+        "url", "latency", "error_rate", "in_flight", "failures",
+        "circuit", "open_until", "requests", "errors",
+    )
+
+    def __init__(self, url, initial_latency):
+        self.url = url
+        self.latency = initial_latency
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.failures = 0
+        self.circuit = CLOSED
+        self.open_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def score(self):
+        # Expected wait if we queue behind everything already in flight,
+        # inflated for proxies that have been failing.
+        return self.latency * (self.in_flight + 1) / max(1.0 - self.error_rate, 0.05)
+
+    def as_dict(self):
+        return {
+            "circuit": self.circuit,
+            "latency_ewma": round(self.latency, 4),
+            "error_rate": round(self.error_rate, 4),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class ProxyPool:
+    """Routes upstream requests across proxies by health.
+
+    Selection is power-of-two-choices on a latency x load score. Proxies
+    that fail ``failure_threshold`` times in a row are ejected for
+    ``cooldown`` seconds, then let back in for a single probe request:
+    the ``select()`` that picks a cooled-down proxy marks it half-open, and
+    no other caller gets it until the probe succeeds, fails or is released.
+
+    Selection never awaits, so on the event loop it is atomic without a lock.
+    """
+
+    def __init__(
+        self,
+        proxies,
+        alpha: float = 0.3,
+        failure_threshold: int = 3,
+        cooldown: float = 30,
+        initial_latency: float = 1.0,
+        latency_window: int = 200,
+        clock=time.monotonic,
+        rng=None,
+    ):
+        self.states = [ProxyState(url, initial_latency) for url in (proxies or [None])]
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.latencies = deque(maxlen=latency_window)
+
+    def _available(self, state, now):
+        if state.circuit == CLOSED:
+            return True
+        if state.circuit == OPEN and now >= state.open_until:
+            return True
+        return False
+
+    def select(self, exclude=()) -> ProxyState:
+        now = self.clock()
+        candidates = [state for state in self.states if state.url not in exclude and self._available(state, now)]
+        if not candidates:
+            # Everything is ejected: fail open on whichever recovers first.
+            pool = [state for state in self.states if state.url not in exclude] or self.states
+            candidates = [min(pool, key=lambda state: state.open_until)]
+
+        if len(candidates) == 1:
+            state = candidates[0]
+        else:
+            first, second = self.rng.sample(candidates, 2)
+            state = first if first.score() <= second.score() else second
+        if state.circuit == OPEN and now >= state.open_until:
+            # This caller is the probe.
+            state.circuit = HALF_OPEN
+        return state
+
+    def release(self, state: ProxyState):
+        """Give back a probe that was selected but never sent (or already resolved)."""
+        if state.circuit == HALF_OPEN and state.in_flight == 0:
+            state.circuit = OPEN
+
+    @asynccontextmanager
+    async def track(self, state: ProxyState):
+        """Count a request against ``state`` and record its outcome."""
+        state.in_flight += 1
+        state.requests += 1
+        start = self.clock()
+        try:
+            yield state
+        except Exception:
+            self.record_failure(state)
+            raise
+        else:
+            self.record_success(state, self.clock() - start)
+        finally:
+            state.in_flight -= 1
+            # A probe cancelled before it told us anything allows another.
+            self.release(state)
+
+    def latency_quantile(self, quantile: float) -> float | None:
+        """Latency of recent successful requests across all proxies."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def record_success(self, state: ProxyState, latency: float):
+        self.latencies.append(latency)
+        state.latency += self.alpha * (latency - state.latency)
+        state.error_rate *= 1 - self.alpha
+        state.failures = 0
+        state.circuit = CLOSED
+
+    def record_failure(self, state: ProxyState):
+        state.errors += 1
+        state.error_rate += self.alpha * (1 - state.error_rate)
+        state.failures += 1
+        if state.circuit == HALF_OPEN or state.failures >= self.failure_threshold:
+            state.circuit = OPEN
+            state.open_until = self.clock() + self.cooldown
+
+    def stats(self):
+        return {state.url or "direct": state.as_dict() for state in self.states}
@@ -0,0 +1,51 @@
+import random
+
+import httpx
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """How hard IMDBScraper tries before giving up on an upstream fetch.
+
+    Backoff is "full jitter": a uniform delay between 0 and
+    ``base_delay * 2 ** attempt`` capped at ``max_delay``. ``deadline``
+    bounds the whole fetch, retries and backoff included.
+
+    With ``hedge`` on, an attempt still running after the ``hedge_quantile``
+    latency of recent requests gets a second copy through another proxy;
+    whichever finishes first wins and the other is cancelled.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8,
+        deadline: float = 30,
+        retry_statuses=RETRYABLE_STATUSES,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        rng=None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def is_retryable(self, exc: Exception) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, httpx.TransportError)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import JobLease
+from app.services.chart_store import ChartStore
+from app.services.scraper_service import IMDBScraper
+from app.services.titles import TitleService
+
+logger = logging.getLogger(__name__)
+
+TOP_250_REFRESH_JOB = "refresh:top250"
+
+
+async def acquire_lease(db: AsyncSession, name: str, owner: str, ttl: float) -> bool:
+    """Take or renew the lease row ``name``; False if another owner holds it."""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl)
+
+    result = await db.execute(
+        update(JobLease)
+        .where(JobLease.name == name, or_(JobLease.owner == owner, JobLease.expires_at < now))
+        .values(owner=owner, expires_at=expires_at)
+    )
+    if result.rowcount == 1:
+        await db.commit()
+        return True
+
+    db.add(JobLease(name=name, owner=owner, expires_at=expires_at))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return False
+    return True
+
+
+class ChartRefresher:
+    """Periodically scrapes the chart and stores only what changed.
+
+    Every worker runs one, but only the worker holding the job lease
+    scrapes; the others skip the tick until the lease expires.
+    """
+
+    def __init__(
+        self,
+        scraper: IMDBScraper,
+        session_factory,
+        interval: float,
+        store: ChartStore | None = None,
+        owner: str | None = None,
+    ):
+        self.scraper = scraper
+        self.session_factory = session_factory
+        self.interval = interval
+        self.lease_ttl = interval * 1.5
+        self.store = store
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.task = None
+        self.last_result = None
+        self.applied = None
+
+    async def refresh_once(self):
+        async with self.session_factory() as db:
+            if not await acquire_lease(db, TOP_250_REFRESH_JOB, self.owner, self.lease_ttl):
+                return None
+
+            movies = await self.scraper.fetch_top_250()
+            if movies is self.applied:
+                # IMDb answered 304 for the chart this worker already stored.
+                logger.info("Top 250 unchanged upstream")
+                self.last_result = {"titles": 0, "genres": 0, "ranks": 0}
+                return self.last_result
+
+            service = TitleService(db)
+            self.last_result = await service.apply_chart_diff(movies)
+            self.applied = movies
+            logger.info("Top 250 refreshed: %s", self.last_result)
+
+            if self.store is not None:
+                await self.store.publish(await service.load_chart())
+            return self.last_result
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception:
+                logger.exception("Top 250 refresh failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
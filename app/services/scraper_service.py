@@ -1,52 +1,174 @@
-import json
+import asyncio
+from urllib.parse import urlsplit
 
-import httpx
-from bs4 import BeautifulSoup
+from app.core.settings import IMDB_BASE_URL, IMDB_PROXIES
+from app.services.extract_data import extract_250_movies, extract_title_details
+from app.services.http_client import HTTPClientPool, trace_phases
+from app.services.next_data import NextDataError, extract_next_data
+from app.services.parse_executor import ParseExecutor
+from app.services.proxy_service import ProxyPool, ProxyState
+from app.services.retry import NO_RETRY, RetryPolicy
+from app.utils import timing
+from app.utils.rate_limiter import UpstreamRateLimiter
+from app.utils.timing import span
 
-from app.services.extract_data import extract_250_movies
-from app.services.proxy_service import ProxyRouter
-from app.utils.helpers import rate_limit
+IMDB_TOP_URL = f"{IMDB_BASE_URL}/chart/top"
+IMDB_TITLE_URL = f"{IMDB_BASE_URL}/title/{{imdb_id}}/"
 
-IMDB_TOP_URL = "https://www.imdb.com/chart/top"
 
-proxies_list = [
-    "http://127.0.0.1:8001",
-    "http://127.0.0.1:8002",
-]
+def parse_top_250(content: bytes):
+    data = extract_next_data(content)
+    edges = data["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    with span("parse.extract"):
+        return extract_250_movies(edges)
 
-proxy_router = ProxyRouter(proxies_list)
 
-class IMDBScraper:
-    def __init__(self):
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept-Language": "en-US,en;q=0.9"
-        }
-
-    async def fetch_top_250(self):
-        proxy = await proxy_router.get_proxy()
-
-        async with httpx.AsyncClient(
-            headers=self.headers,
-            timeout=10,
-            follow_redirects=True,
+def parse_title(content: bytes):
+    data = extract_next_data(content)
+    with span("parse.extract"):
+        details = extract_title_details(data)
+    if details["imdb_id"] is None:
+        raise NextDataError("IMDB title data not found")
+    return details
 
-        ) as client:
 
-            response = await client.get(IMDB_TOP_URL)
-            response.raise_for_status()
+class Validated:
+    """IMDb's validators for a page and the result parsed from it."""
 
-        soup = BeautifulSoup(response.text, "lxml")
+    __slots__ = ("etag", "last_modified", "result")
 
-        script_tag = soup.find("script", id="__NEXT_DATA__")
-        if not script_tag or not script_tag.string:
-            raise RuntimeError("IMDB NEXT_DATA not found")
+    def __init__(self, etag, last_modified, result):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.result = result
 
-        data = json.loads(script_tag.string)
-        edges = data["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    def headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
 
-        results = extract_250_movies(edges)
 
-        await rate_limit()
+class IMDBScraper:
+    def __init__(
+        self,
+        clients: HTTPClientPool,
+        proxies: ProxyPool | None = None,
+        limiter: UpstreamRateLimiter | None = None,
+        executor: ParseExecutor | None = None,
+        retry: RetryPolicy = NO_RETRY,
+        url: str = IMDB_TOP_URL,
+        title_url: str = IMDB_TITLE_URL,
+    ):
+        self.clients = clients
+        self.proxies = proxies or ProxyPool(IMDB_PROXIES)
+        self.url = url
+        self.title_url = title_url
+        self.limiter = limiter
+        self.executor = executor
+        self.retry = retry
+        self.validated = {}
+        self.not_modified = 0
 
-        return results
\ No newline at end of file
+    async def fetch_top_250(self):
+        """Parsed chart; the previous result object if IMDb answers 304."""
+        cached = self.validated.get(self.url)
+        response = await self.fetch(self.url, headers=cached.headers() if cached else None)
+        if response.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            return cached.result
+
+        if self.executor is None:
+            movies = parse_top_250(response.content)
+        else:
+            movies = await self.executor.run(parse_top_250, response.content)
+
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        if etag or last_modified:
+            self.validated[self.url] = Validated(etag, last_modified, movies)
+        else:
+            self.validated.pop(self.url, None)
+        return movies
+
+    async def fetch_title(self, imdb_id: str):
+        response = await self.fetch(self.title_url.format(imdb_id=imdb_id))
+
+        if self.executor is None:
+            return parse_title(response.content)
+        return await self.executor.run(parse_title, response.content)
+
+    async def fetch(self, url: str, headers=None):
+        """GET ``url`` under the retry policy, hedging slow attempts if enabled."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.retry.deadline
+        exclude = set()
+
+        for attempt in range(self.retry.max_attempts):
+            with span("proxy_select"):
+                proxy = self.proxies.select(exclude)
+            try:
+                return await asyncio.wait_for(self._hedged_request(url, proxy, headers), deadline - loop.time())
+            except Exception as exc:
+                if attempt + 1 == self.retry.max_attempts or not self.retry.is_retryable(exc):
+                    raise
+                delay = self.retry.backoff(attempt)
+                if loop.time() + delay >= deadline:
+                    raise
+                if len(self.proxies.states) > 1:
+                    exclude = {proxy.url}
+                await asyncio.sleep(delay)
+            finally:
+                # A probe that never reached the proxy (deadline, rate limit) goes back.
+                self.proxies.release(proxy)
+
+    async def _hedged_request(self, url: str, proxy: ProxyState, headers=None):
+        hedge_after = None
+        if self.retry.hedge and len(self.proxies.latencies) >= self.retry.hedge_min_samples:
+            hedge_after = self.proxies.latency_quantile(self.retry.hedge_quantile)
+
+        if hedge_after is None or len(self.proxies.states) < 2:
+            return await self._request(url, proxy, headers)
+
+        attempts = {asyncio.create_task(self._request(url, proxy, headers))}
+        backup = None
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done:
+                backup = self.proxies.select(exclude={proxy.url})
+                # Hedges only spend spare budget; they never wait for a token.
+                if self.limiter is None or self.limiter.try_acquire(urlsplit(url).hostname, backup.url):
+                    attempts.add(asyncio.create_task(self._request(url, backup, headers, rate_limited=False)))
+
+            error = None
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+            if backup is not None:
+                self.proxies.release(backup)
+
+    async def _request(self, url: str, proxy: ProxyState, headers=None, rate_limited: bool = True):
+        if rate_limited and self.limiter is not None:
+            with span("rate_limit"):
+                await self.limiter.acquire(urlsplit(url).hostname, proxy.url)
+
+        extensions = {"trace": trace_phases()} if timing.enabled else None
+        async with self.proxies.track(proxy):
+            with span("upstream"):
+                response = await self.clients.get(proxy.url).get(url, headers=headers, extensions=extensions)
+            # Only server-side trouble counts against the proxy; a 404 for
+            # an unknown title says nothing about its health.
+            if response.status_code >= 500 or response.status_code == 429:
+                response.raise_for_status()
+        if not (headers and response.status_code == 304):
+            response.raise_for_status()
+        return response
@@ -0,0 +1,259 @@
+import bisect
+import itertools
+import re
+from collections import defaultdict
+
+from app.services.movie import Chart, Movie
+
+TOKEN_RE = re.compile(r"\w+")
+NONZERO_BYTE_RE = re.compile(rb"[^\x00]")
+
+# Tokens in at least 1/DENSE_TOKEN_RATIO of the titles keep a precomputed
+# bitmap; that costs at most 8 bytes per posting, whatever the vocabulary.
+DENSE_TOKEN_RATIO = 64
+# Sorting by rating or year sorts small result sets outright; larger ones
+# walk the presorted order and stop when the page is full.
+SORT_MATERIALIZE_MAX = 2048
+
+
+def _bitmap(docs, size: int) -> int:
+    """Python int with bit ``doc`` set for every doc; built in O(size), not O(size * docs)."""
+    data = bytearray((size + 7) // 8)
+    for doc in docs:
+        data[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(data, "little")
+
+
+def _members(bitmap: int, size: int) -> bytes:
+    return bitmap.to_bytes((size + 7) // 8, "little")
+
+
+def _iter_bits(bitmap: int, start: int = 0):
+    """Set bit positions of ``bitmap`` from ``start`` upwards."""
+    rest = bitmap >> start
+    data = rest.to_bytes((rest.bit_length() + 7) // 8, "little")
+    # The regex scan skips empty bytes at C speed.
+    for match in NONZERO_BYTE_RE.finditer(data):
+        base = start + match.start() * 8
+        byte = data[match.start()]
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+def _nth_bit(bitmap: int, n: int) -> int:
+    """Position of the ``n``-th set bit (0-based); ``bitmap`` must have more than ``n``."""
+    lo, hi = 0, bitmap.bit_length()
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (bitmap & ((2 << mid) - 1)).bit_count() > n:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class SearchIndex:
+    """Read-only index over one chart snapshot; documents are chart positions.
+
+    - title tokens map to sorted posting lists (plus a bitmap for dense
+      tokens), and the sorted vocabulary answers prefix queries with bisect;
+    - title trigrams (bitmaps when dense) narrow substring queries before
+      an exact ``in`` check;
+    - genres are bitmaps (Python ints, bit i = document i);
+    - years and ratings are sorted distinct values with cumulative bitmaps,
+      so a range is one bisect and one AND.
+
+    Every query reduces to bitmap ANDs. Bit order is chart order, so matches
+    come out rank-ordered, totals are a popcount, and pages are cut without
+    visiting the skipped matches.
+    """
+
+    def __init__(self, movies: list[Movie]):
+        self.movies = movies
+        self.size = size = len(movies)
+        self.all = (1 << size) - 1
+        self.titles = [(movie.title or "").lower() for movie in movies]
+        self.years = [movie.year for movie in movies]
+        self.ratings = [movie.rating for movie in movies]
+
+        postings = defaultdict(list)
+        trigrams = defaultdict(list)
+        genres = defaultdict(list)
+        for doc, (title, movie) in enumerate(zip(self.titles, movies)):
+            for token in dict.fromkeys(TOKEN_RE.findall(title)):
+                postings[token].append(doc)
+            for trigram in {title[i:i + 3] for i in range(len(title) - 2)}:
+                trigrams[trigram].append(doc)
+            for genre in movie.genres:
+                genres[genre.lower()].append(doc)
+
+        self.postings = dict(postings)
+        self.vocabulary = sorted(postings)
+        self.dense = {
+            token: _bitmap(docs, size)
+            for token, docs in postings.items()
+            if len(docs) * DENSE_TOKEN_RATIO >= size
+        }
+        self.trigrams = dict(trigrams)
+        self.dense_trigrams = {
+            trigram: _bitmap(docs, size)
+            for trigram, docs in trigrams.items()
+            if len(docs) * DENSE_TOKEN_RATIO >= size
+        }
+        self.genres = {genre: _bitmap(docs, size) for genre, docs in genres.items()}
+
+        self.year_values, self.years_upto = self._cumulative(self.years, reverse=False)
+        self.rating_values, self.ratings_from = self._cumulative(self.ratings, reverse=True)
+        self.by_rating = sorted(range(size), key=self._sort_key("rating"))
+        self.by_year = sorted(range(size), key=self._sort_key("year"))
+
+    def _cumulative(self, values, reverse: bool):
+        """Distinct values (ascending) and, per value, the bitmap of docs at or beyond it.
+
+        ``reverse=False`` accumulates upwards (docs with value <= v);
+        ``reverse=True`` downwards (docs with value >= v).
+        """
+        by_value = defaultdict(list)
+        for doc, value in enumerate(values):
+            if value is not None:
+                by_value[value].append(doc)
+
+        distinct = sorted(by_value)
+        cumulative = [0] * len(distinct)
+        running = 0
+        order = range(len(distinct) - 1, -1, -1) if reverse else range(len(distinct))
+        for i in order:
+            running |= _bitmap(by_value[distinct[i]], self.size)
+            cumulative[i] = running
+        return distinct, cumulative
+
+    def _sort_key(self, sort: str):
+        if sort == "rating":
+            return lambda doc: (-(self.ratings[doc] or 0), doc)
+        return lambda doc: (-(self.years[doc] or 0), doc)
+
+    def _filter(self, genres, year_min, year_max, rating_min) -> int:
+        bitmap = self.all
+        for genre in genres:
+            bitmap &= self.genres.get(genre.lower(), 0)
+        if year_min is not None or year_max is not None:
+            # The last cumulative bitmap is every doc with a year.
+            i = len(self.year_values) - 1
+            if year_max is not None:
+                i = bisect.bisect_right(self.year_values, year_max) - 1
+            bitmap &= self.years_upto[i] if i >= 0 else 0
+            if year_min is not None:
+                i = bisect.bisect_left(self.year_values, year_min) - 1
+                if i >= 0:
+                    bitmap &= ~self.years_upto[i]
+        if rating_min is not None:
+            i = bisect.bisect_left(self.rating_values, rating_min)
+            bitmap &= self.ratings_from[i] if i < len(self.rating_values) else 0
+        return bitmap
+
+    def _token_bitmap(self, token: str) -> int:
+        dense = self.dense.get(token)
+        return dense if dense is not None else _bitmap(self.postings.get(token, ()), self.size)
+
+    def _prefix_bitmap(self, token: str) -> int:
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + "\U0010ffff", start)
+
+        bitmap = 0
+        sparse = []
+        for word in self.vocabulary[start:end]:
+            dense = self.dense.get(word)
+            if dense is None:
+                sparse.append(self.postings[word])
+            else:
+                bitmap |= dense
+        if sparse:
+            bitmap |= _bitmap(itertools.chain.from_iterable(sparse), self.size)
+        return bitmap
+
+    def _match(self, query: str, mode: str) -> tuple[int, int]:
+        """Bitmaps of the docs matching ``query`` and of the exact matches among them.
+
+        Prefix mode matches when every query token starts a title token, and
+        is exact when every query token is a whole title token; substring
+        mode is exact when the title starts with the query.
+        """
+        query = query.lower()
+        if mode == "substring":
+            candidates = self.all
+            for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+                dense = self.dense_trigrams.get(trigram)
+                candidates &= dense if dense is not None else _bitmap(self.trigrams.get(trigram, ()), self.size)
+            docs = [doc for doc in _iter_bits(candidates) if query in self.titles[doc]]
+            exact = [doc for doc in docs if self.titles[doc].startswith(query)]
+            return _bitmap(docs, self.size), _bitmap(exact, self.size)
+
+        matches = exact = self.all
+        for token in dict.fromkeys(TOKEN_RE.findall(query)):
+            matches &= self._prefix_bitmap(token)
+            if not matches:
+                return 0, 0
+            exact &= self._token_bitmap(token)
+        return matches, exact & matches
+
+    def _page(self, tiers, offset: int, limit: int) -> list[int]:
+        docs = []
+        for tier in tiers:
+            count = tier.bit_count()
+            if offset >= count:
+                offset -= count
+                continue
+            start = _nth_bit(tier, offset) if offset else 0
+            docs.extend(itertools.islice(_iter_bits(tier, start), limit - len(docs)))
+            offset = 0
+            if len(docs) == limit:
+                break
+        return docs
+
+    def _sorted_page(self, bitmap: int, total: int, sort: str, offset: int, limit: int) -> list[int]:
+        if total <= SORT_MATERIALIZE_MAX:
+            return sorted(_iter_bits(bitmap), key=self._sort_key(sort))[offset:offset + limit]
+
+        members = _members(bitmap, self.size)
+        ordered = self.by_rating if sort == "rating" else self.by_year
+        docs = (doc for doc in ordered if members[doc >> 3] >> (doc & 7) & 1)
+        return list(itertools.islice(docs, offset, offset + limit))
+
+    def search(
+        self,
+        q: str | None = None,
+        mode: str = "prefix",
+        genres=(),
+        year_min: int | None = None,
+        year_max: int | None = None,
+        rating_min: float | None = None,
+        sort: str = "relevance",
+        offset: int = 0,
+        limit: int = 20,
+    ) -> tuple[int, list[Movie]]:
+        """Return ``(total matches, movies on the requested page)``.
+
+        ``relevance`` lists exact text matches before partial ones, each in
+        chart order; ``rank``, ``rating`` and ``year`` ignore the text score.
+        """
+        bitmap = self._filter(genres, year_min, year_max, rating_min)
+        tiers = [bitmap]
+        if q:
+            matches, exact = self._match(q, mode)
+            bitmap &= matches
+            tiers = [bitmap & exact, bitmap & ~exact] if sort == "relevance" else [bitmap]
+
+        total = bitmap.bit_count()
+        if sort in ("relevance", "rank"):
+            docs = self._page(tiers, offset, limit)
+        else:
+            docs = self._sorted_page(bitmap, total, sort, offset, limit)
+        return total, [self.movies[doc] for doc in docs]
+
+
+def chart_index(chart: Chart) -> SearchIndex:
+    """The chart's index; charts loaded from the database come with one already."""
+    if chart.index is None:
+        chart.index = SearchIndex(chart.movies)
+    return chart.index
@@ -0,0 +1,144 @@
+import itertools
+import math
+from operator import attrgetter
+
+import numpy as np
+
+from app.services.movie import Chart, Movie
+
+RATING_BINS = 10
+
+
+class ChartColumns:
+    """Chart rows as NumPy columns; genres are flattened to (row, code) pairs."""
+
+    __slots__ = ("rating", "votes", "year", "genre_names", "genre_rows", "genre_codes")
+
+    def __init__(self, movies: list[Movie]):
+        count = len(movies)
+        self.rating = np.fromiter((np.nan if m.rating is None else m.rating for m in movies), np.float64, count)
+        self.votes = np.fromiter((m.rating_count or 0 for m in movies), np.float64, count)
+        self.year = np.fromiter((m.year or 0 for m in movies), np.int64, count)
+
+        # Genre tuples are interned, so names are coded once per combination.
+        genres = list(map(attrgetter("genres"), movies))
+        combinations = set(genres)
+        self.genre_names = sorted({name for combination in combinations for name in combination})
+        code = {name: i for i, name in enumerate(self.genre_names)}
+        coded = {combination: [code[name] for name in combination] for combination in combinations}
+
+        self.genre_rows = np.repeat(np.arange(count), np.fromiter(map(len, genres), np.int64, count))
+        self.genre_codes = np.fromiter(
+            itertools.chain.from_iterable(map(coded.__getitem__, genres)), np.int64, len(self.genre_rows)
+        )
+
+
+def _float(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _group_medians(codes, values, groups: int):
+    """Median of ``values`` per code, NaN for empty groups.
+
+    A stable argsort of small ints is a radix sort, so grouping is linear and
+    each group only needs a selection, not a full sort.
+    """
+    order = np.argsort(codes.astype(np.uint16 if groups <= 1 << 16 else np.int64), kind="stable")
+    counts = np.bincount(codes, minlength=groups)
+    slices = np.split(values[order], np.cumsum(counts)[:-1])
+    return np.array([np.median(part) if len(part) else np.nan for part in slices])
+
+
+def _correlation(x, y):
+    if len(x) < 2 or x.std() == 0 or y.std() == 0:
+        return None
+    return _float(np.corrcoef(x, y)[0, 1])
+
+
+def compute_stats(movies: list[Movie]) -> dict:
+    """Per-genre, per-decade and rating/votes statistics of a chart.
+
+    Everything past building the columns is vectorized; titles without a
+    rating are left out of rating figures, titles without a year out of
+    the decades.
+    """
+    columns = ChartColumns(movies)
+    rated = ~np.isnan(columns.rating)
+    rating, votes = columns.rating[rated], columns.votes[rated]
+
+    # Genres: aggregate over rated (row, genre) pairs.
+    groups = len(columns.genre_names)
+    genre_counts = np.bincount(columns.genre_codes, minlength=groups)
+    pair_rated = rated[columns.genre_rows]
+    codes = columns.genre_codes[pair_rated]
+    pair_rating = columns.rating[columns.genre_rows[pair_rated]]
+    pair_votes = columns.votes[columns.genre_rows[pair_rated]]
+    rated_counts = np.bincount(codes, minlength=groups)
+    genre_means = _ratio(np.bincount(codes, pair_rating, groups), rated_counts)
+    genre_weighted = _ratio(np.bincount(codes, pair_rating * pair_votes, groups), np.bincount(codes, pair_votes, groups))
+    genre_medians = _group_medians(codes, pair_rating, groups)
+
+    # Decades: a histogram of ratings per decade from one bincount.
+    dated = rated & (columns.year > 0)
+    decade_index = columns.year[dated] // 10
+    first = decade_index.min() if len(decade_index) else 0
+    decade_index -= first
+    spans = int(decade_index.max()) + 1 if len(decade_index) else 0
+    bins = np.clip(np.floor(columns.rating[dated]), 0, RATING_BINS - 1).astype(np.int64)
+    histograms = np.bincount(decade_index * RATING_BINS + bins, minlength=spans * RATING_BINS)
+    histograms = histograms.reshape(spans, RATING_BINS)
+    decade_counts = histograms.sum(axis=1)
+    decade_means = _ratio(np.bincount(decade_index, columns.rating[dated], spans), decade_counts)
+    # Decades with no rated titles are dropped.
+    present = decade_counts > 0
+    decade_values = (np.arange(spans)[present] + first) * 10
+    decade_counts, decade_means, histograms = decade_counts[present], decade_means[present], histograms[present]
+
+    return {
+        "count": len(movies),
+        "rated": int(rated.sum()),
+        "rating": {
+            "mean": _float(rating.mean()) if len(rating) else None,
+            "median": _float(np.median(rating)) if len(rating) else None,
+            "vote_weighted": _float(_ratio(np.dot(rating, votes), votes.sum())),
+        },
+        "genres": [
+            {
+                "genre": columns.genre_names[code],
+                "count": int(genre_counts[code]),
+                "mean_rating": _float(genre_means[code]),
+                "median_rating": _float(genre_medians[code]),
+                "vote_weighted_rating": _float(genre_weighted[code]),
+            }
+            for code in np.argsort(-genre_counts, kind="stable")
+        ],
+        "rating_bins": list(range(RATING_BINS + 1)),
+        "decades": [
+            {
+                "decade": int(decade),
+                "count": int(count),
+                "mean_rating": _float(mean),
+                "rating_histogram": histogram,
+            }
+            for decade, count, mean, histogram in zip(
+                decade_values.tolist(), decade_counts.tolist(), decade_means.tolist(), histograms.tolist()
+            )
+        ],
+        "correlation": {
+            "rating_votes": _correlation(rating, votes),
+            "rating_log_votes": _correlation(rating, np.log10(votes + 1)),
+        },
+    }
+
+
+def chart_stats(chart: Chart) -> dict:
+    """The chart's statistics; charts loaded from the database come with them already."""
+    if chart.stats is None:
+        chart.stats = compute_stats(chart.movies)
+    return chart.stats
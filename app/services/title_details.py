@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+from app.services.scraper_service import IMDBScraper
+from app.services.titles import TitleService
+
+logger = logging.getLogger(__name__)
+
+
+class TitleDetailsService:
+    """Fetches title pages, reusing stored details while they are fresh.
+
+    Upstream fan-out is bounded twice: by a global semaphore and by one
+    semaphore per upstream host.
+    """
+
+    def __init__(
+        self,
+        scraper: IMDBScraper,
+        session_factory,
+        max_age: float,
+        concurrency: int = 8,
+        per_host: int = 4,
+    ):
+        self.scraper = scraper
+        self.session_factory = session_factory
+        self.max_age = max_age
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.per_host = per_host
+        self.host_semaphores = {}
+
+    def _host_semaphore(self, imdb_id):
+        host = urlsplit(self.scraper.title_url.format(imdb_id=imdb_id)).hostname
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self.host_semaphores[host]
+
+    async def _scrape(self, imdb_id):
+        async with self.semaphore, self._host_semaphore(imdb_id):
+            details = await self.scraper.fetch_title(imdb_id)
+
+        async with self.session_factory() as db:
+            await TitleService(db).upsert_title_details(details)
+        return details
+
+    async def _stored(self, imdb_ids):
+        async with self.session_factory() as db:
+            return await TitleService(db).get_fresh_details(imdb_ids, self.max_age)
+
+    async def get(self, imdb_id: str):
+        stored = await self._stored([imdb_id])
+        if imdb_id in stored:
+            return stored[imdb_id]
+        return await self._scrape(imdb_id)
+
+    async def iter_many(self, imdb_ids):
+        """Yield ``(imdb_id, details, error)`` in completion order."""
+        imdb_ids = list(dict.fromkeys(imdb_ids))
+        stored = await self._stored(imdb_ids)
+        for imdb_id in imdb_ids:
+            if imdb_id in stored:
+                yield imdb_id, stored[imdb_id], None
+
+        async def scrape(imdb_id):
+            try:
+                return imdb_id, await self._scrape(imdb_id), None
+            except Exception as exc:
+                logger.warning("Scraping %s failed: %r", imdb_id, exc)
+                return imdb_id, None, str(exc) or type(exc).__name__
+
+        tasks = [asyncio.create_task(scrape(imdb_id)) for imdb_id in imdb_ids if imdb_id not in stored]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,230 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dialect import dialect_insert
+from app.db.session import ReadSessionLocal
+from app.models import ChartEntry, ChartRankChange, Genre, Title, title_genres
+from app.services.exceptions import ChartNotReadyException
+from app.services.movie import Chart, Movie, genre_table
+from app.services.search import SearchIndex
+from app.services.stats import compute_stats
+from app.utils.timing import span
+
+TOP_250_CHART = "top250"
+TOP_250_CACHE_KEY = "imdb:top250"
+
+TITLE_FIELDS = ("imdb_id", "title", "year", "rating", "rating_count", "plot")
+DETAIL_FIELDS = ("runtime_minutes", "certificate", "cast", "box_office")
+
+
+class TitleService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def upsert_titles(self, movies) -> dict[str, int]:
+        """Insert or update titles in one statement; returns imdb_id -> titles.id."""
+        if not movies:
+            return {}
+
+        stmt = dialect_insert(self.db, Title).values([
+            {field: getattr(movie, field) for field in TITLE_FIELDS} for movie in movies
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Title.imdb_id],
+            set_={
+                **{field: stmt.excluded[field] for field in TITLE_FIELDS if field != "imdb_id"},
+                "updated_at": func.now(),
+            },
+        ).returning(Title.imdb_id, Title.id)
+
+        result = await self.db.execute(stmt)
+        return dict(result.all())
+
+    async def upsert_genres(self, names) -> dict[str, int]:
+        names = sorted(set(names))
+        if not names:
+            return {}
+
+        await self.db.execute(
+            dialect_insert(self.db, Genre).values([{"name": name} for name in names]).on_conflict_do_nothing()
+        )
+        result = await self.db.execute(select(Genre.name, Genre.id).where(Genre.name.in_(names)))
+        return dict(result.all())
+
+    async def replace_title_genres(self, genres, title_ids, genre_ids):
+        """Replace the genre links of every imdb_id in ``genres`` (imdb_id -> names)."""
+        ids = [title_ids[imdb_id] for imdb_id in genres]
+        await self.db.execute(delete(title_genres).where(title_genres.c.title_id.in_(ids)))
+
+        rows = [
+            {"title_id": title_ids[imdb_id], "genre_id": genre_ids[name]}
+            for imdb_id, names in genres.items()
+            for name in set(names)
+        ]
+        if rows:
+            await self.db.execute(dialect_insert(self.db, title_genres).values(rows))
+
+    async def upsert_chart_entries(self, movies, title_ids, chart=TOP_250_CHART):
+        if not movies:
+            return
+
+        stmt = dialect_insert(self.db, ChartEntry).values([
+            {"chart": chart, "rank": movie.rank, "title_id": title_ids[movie.imdb_id]}
+            for movie in movies
+        ])
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[ChartEntry.chart, ChartEntry.rank],
+            set_={"title_id": stmt.excluded.title_id},
+        ))
+
+    async def truncate_chart(self, size, chart=TOP_250_CHART):
+        await self.db.execute(delete(ChartEntry).where(ChartEntry.chart == chart, ChartEntry.rank > size))
+
+    async def upsert_title_details(self, details):
+        values = {field: details[field] for field in TITLE_FIELDS + DETAIL_FIELDS}
+        values["details_updated_at"] = datetime.now(timezone.utc)
+
+        stmt = dialect_insert(self.db, Title).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Title.imdb_id],
+            set_={**{field: stmt.excluded[field] for field in values if field != "imdb_id"}, "updated_at": func.now()},
+        ).returning(Title.imdb_id, Title.id)
+        title_ids = dict((await self.db.execute(stmt)).all())
+
+        genre_ids = await self.upsert_genres(details["genres"])
+        await self.replace_title_genres({details["imdb_id"]: details["genres"]}, title_ids, genre_ids)
+        await self.db.commit()
+
+    async def get_fresh_details(self, imdb_ids, max_age: float) -> dict[str, dict]:
+        """Stored details scraped less than ``max_age`` seconds ago, keyed by imdb_id."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+        result = await self.db.execute(
+            select(Title).where(Title.imdb_id.in_(imdb_ids), Title.details_updated_at >= cutoff)
+        )
+        return {
+            title.imdb_id: {
+                **{field: getattr(title, field) for field in TITLE_FIELDS},
+                "genres": sorted(genre.name for genre in title.genres),
+                **{field: getattr(title, field) for field in DETAIL_FIELDS},
+            }
+            for title in result.scalars()
+        }
+
+    async def get_chart_snapshot(self, chart=TOP_250_CHART) -> dict[str, tuple[int, Movie]]:
+        """Current chart keyed by imdb_id, as (titles.id, Movie)."""
+        stmt = (
+            select(ChartEntry.rank, Title.id, *(getattr(Title, field) for field in TITLE_FIELDS))
+            .join(Title, Title.id == ChartEntry.title_id)
+            .where(ChartEntry.chart == chart)
+            .order_by(ChartEntry.rank)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        if not rows:
+            return {}
+
+        genres = {}
+        genre_rows = await self.db.execute(
+            select(title_genres.c.title_id, Genre.name)
+            .join(Genre, Genre.id == title_genres.c.genre_id)
+            .where(title_genres.c.title_id.in_([row.id for row in rows]))
+            .order_by(Genre.name)
+        )
+        for title_id, name in genre_rows:
+            genres.setdefault(title_id, []).append(name)
+
+        return {
+            row.imdb_id: (
+                row.id,
+                Movie(
+                    rank=row.rank,
+                    **{field: getattr(row, field) for field in TITLE_FIELDS},
+                    genres=genre_table.intern(genres.get(row.id, ())),
+                ),
+            )
+            for row in rows
+        }
+
+    async def get_chart(self, chart=TOP_250_CHART) -> list[Movie]:
+        snapshot = await self.get_chart_snapshot(chart)
+        return [movie for _, movie in snapshot.values()]
+
+    async def get_chart_modified(self, chart=TOP_250_CHART) -> datetime | None:
+        """When the chart last changed: its latest rank move or title update."""
+        moved = await self.db.scalar(
+            select(func.max(ChartRankChange.changed_at)).where(ChartRankChange.chart == chart)
+        )
+        updated = await self.db.scalar(
+            select(func.max(Title.updated_at))
+            .join(ChartEntry, ChartEntry.title_id == Title.id)
+            .where(ChartEntry.chart == chart)
+        )
+        return max(filter(None, (moved, updated)), default=None)
+
+    async def load_chart(self, chart=TOP_250_CHART) -> Chart:
+        return prepare_chart(Chart(await self.get_chart(chart), await self.get_chart_modified(chart)))
+
+    async def apply_chart_diff(self, movies, chart=TOP_250_CHART):
+        """Write only what changed since the stored snapshot and log rank moves."""
+        snapshot = await self.get_chart_snapshot(chart)
+
+        changed_titles = []
+        changed_genres = []
+        for movie in movies:
+            stored = snapshot.get(movie.imdb_id)
+            if stored is None or any(getattr(stored[1], field) != getattr(movie, field) for field in TITLE_FIELDS):
+                changed_titles.append(movie)
+            if stored is None or stored[1].genres != tuple(sorted(set(movie.genres))):
+                changed_genres.append(movie)
+
+        title_ids = {imdb_id: title_id for imdb_id, (title_id, _) in snapshot.items()}
+        title_ids.update(await self.upsert_titles(changed_titles))
+
+        if changed_genres:
+            genre_ids = await self.upsert_genres(name for movie in changed_genres for name in movie.genres)
+            await self.replace_title_genres(
+                {movie.imdb_id: movie.genres for movie in changed_genres}, title_ids, genre_ids
+            )
+
+        new_ranks = {movie.imdb_id: movie.rank for movie in movies}
+        old_ranks = {imdb_id: stored.rank for imdb_id, (_, stored) in snapshot.items()}
+        moved = [movie for movie in movies if old_ranks.get(movie.imdb_id) != movie.rank]
+        await self.upsert_chart_entries(moved, title_ids, chart)
+        if len(movies) < len(snapshot):
+            await self.truncate_chart(len(movies), chart)
+
+        rank_changes = [
+            {
+                "chart": chart,
+                "title_id": title_ids[imdb_id],
+                "old_rank": old_ranks.get(imdb_id),
+                "new_rank": new_ranks.get(imdb_id),
+            }
+            for imdb_id in old_ranks.keys() | new_ranks.keys()
+            if old_ranks.get(imdb_id) != new_ranks.get(imdb_id)
+        ]
+        if rank_changes:
+            await self.db.execute(insert(ChartRankChange).values(rank_changes))
+
+        await self.db.commit()
+        return {"titles": len(changed_titles), "genres": len(changed_genres), "ranks": len(rank_changes)}
+
+
+def prepare_chart(data: Chart) -> Chart:
+    """Build the search index and stats with the chart, so every refresh swaps them at once."""
+    with span("search.index"):
+        data.index = SearchIndex(data.movies)
+    with span("stats.compute"):
+        data.stats = compute_stats(data.movies)
+    return data
+
+
+async def load_top_250(session_factory=ReadSessionLocal):
+    """Read the stored chart in its own session so it can run as a cache refresh."""
+    async with session_factory() as db:
+        with span("db.chart_load"):
+            data = await TitleService(db).load_chart()
+    if not data:
+        raise ChartNotReadyException()
+    return data
@@ -0,0 +1,129 @@
+from pydantic import ValidationError
+
+from app.core.security import PasswordHasher
+from app.schemas.users import UserCreate
+from app.services.exceptions import (
+    EmailTakenException,
+    PasswordHasherBusyException,
+    UsernameOrEmailTakenException,
+    UsernameTakenException,
+)
+from app.services.users import UserService
+
+
+def _error(row: int, code: str, detail) -> dict:
+    return {"row": row, "error": code, "detail": detail}
+
+
+def _exception_error(row: int, exc) -> dict:
+    return _error(row, exc.headers["x-error-code"], exc.detail)
+
+
+class UserImporter:
+    """Creates users from a stream of rows, ``batch_size`` rows at a time.
+
+    Per batch: validate, drop duplicates within the batch, look up existing
+    usernames and emails in one query, hash the remaining passwords in
+    parallel and insert them in one statement. Only one batch is held at a
+    time; duplicates across batches are found by the next lookup, since
+    earlier batches are already committed.
+
+    ``run`` yields one result per input row (``{"row", "user"}`` or
+    ``{"row", "error", "detail"}``, rows numbered from 1), then a summary.
+    """
+
+    def __init__(self, users: UserService, hasher: PasswordHasher, batch_size: int):
+        self.users = users
+        self.hasher = hasher
+        self.batch_size = batch_size
+        self.created = 0
+        self.failed = 0
+
+    async def run(self, items):
+        batch = []
+        row = 0
+        items = aiter(items)
+        while True:
+            # Only reading the body may raise for bad input; errors from an import propagate.
+            try:
+                item = await anext(items)
+            except StopAsyncIteration:
+                break
+            except ValueError as exc:
+                # Malformed input: rows parsed so far are still imported.
+                for result in await self._import(batch):
+                    yield result
+                batch = []
+                self.failed += 1
+                yield _error(row + 1, "INVALID_JSON", str(exc))
+                break
+
+            row += 1
+            batch.append((row, item))
+            if len(batch) >= self.batch_size:
+                for result in await self._import(batch):
+                    yield result
+                batch = []
+
+        for result in await self._import(batch):
+            yield result
+        yield {"created": self.created, "failed": self.failed}
+
+    def _validate(self, batch, results):
+        users = []
+        usernames = set()
+        emails = set()
+        for row, item in batch:
+            try:
+                user = UserCreate.model_validate(item)
+            except ValidationError as exc:
+                results[row] = _error(row, "INVALID_ROW", exc.errors(include_url=False, include_context=False))
+                continue
+
+            if user.username == "admin":
+                results[row] = _error(row, "INVALID_USERNAME", "Username 'admin' is not allowed.")
+            elif user.username in usernames:
+                results[row] = _exception_error(row, UsernameTakenException())
+            elif user.email is not None and user.email in emails:
+                results[row] = _exception_error(row, EmailTakenException())
+            else:
+                usernames.add(user.username)
+                if user.email is not None:
+                    emails.add(user.email)
+                users.append((row, user))
+        return users, usernames, emails
+
+    async def _import(self, batch) -> list[dict]:
+        results = {}
+        users, usernames, emails = self._validate(batch, results)
+
+        taken_usernames, taken_emails = await self.users.find_taken(usernames, emails)
+        fresh = []
+        for row, user in users:
+            if user.username in taken_usernames:
+                results[row] = _exception_error(row, UsernameTakenException())
+            elif user.email in taken_emails:
+                results[row] = _exception_error(row, EmailTakenException())
+            else:
+                fresh.append((row, user))
+
+        created = {}
+        try:
+            hashes = await self.hasher.hash_many([user.password for _, user in fresh]) if fresh else []
+        except PasswordHasherBusyException as exc:
+            for row, _ in fresh:
+                results[row] = _exception_error(row, exc)
+        else:
+            created = await self.users.insert_users([
+                {"username": user.username, "email": user.email, "password": hashed}
+                for (_, user), hashed in zip(fresh, hashes)
+            ])
+            for row, user in fresh:
+                if user.username in created:
+                    results[row] = {"row": row, "user": created[user.username]}
+                else:
+                    results[row] = _exception_error(row, UsernameOrEmailTakenException())
+
+        self.created += len(created)
+        self.failed += len(results) - len(created)
+        return [results[row] for row, _ in batch]
@@ -1,12 +1,40 @@
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.exc import InternalError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 
+from app.db.dialect import dialect_insert
 from app.models import User
-from app.services.exceptions import UserNotFoundException, EmailTakenException
+from app.services.exceptions import (
+    EmailTakenException,
+    UsernameOrEmailTakenException,
+    UsernameTakenException,
+    UserNotFoundException,
+)
+from app.utils.timing import span
+
+# The UserRead columns: what reads and RETURNING clauses hand back, never the password hash.
+USER_READ_COLUMNS = (User.id, User.username, User.email)
+
+
+def _violated_constraint(exc: IntegrityError) -> str:
+    # Drivers that expose the constraint name (asyncpg, psycopg) are asked directly. Otherwise only
+    # the first line of the message is used: the DETAIL line repeats the conflicting value.
+    for error in (exc.orig, getattr(exc.orig, "__cause__", None)):
+        name = getattr(error, "constraint_name", None) or getattr(getattr(error, "diag", None), "constraint_name", None)
+        if name:
+            return name
+    return str(exc.orig).splitlines()[0] if str(exc.orig) else ""
+
+
+def _conflict_exception(exc: IntegrityError):
+    # Postgres names the violated constraint (users_username_key), SQLite the column (users.username).
+    violated = _violated_constraint(exc)
+    if "users_username_key" in violated or "users.username" in violated:
+        return UsernameTakenException()
+    return EmailTakenException()
 
 
 class UserService:
@@ -15,7 +43,8 @@ class UserService:
 
     async def get_user_by_username(self, username: str):
         stmt = select(User).where(User.username == username)
-        result = await self.db.execute(stmt)
+        with span("db.user_lookup"):
+            result = await self.db.execute(stmt)
         query = result.scalars().one_or_none()
         if not query:
             raise UserNotFoundException()
@@ -23,34 +52,104 @@ class UserService:
 
     async def get_user_by_id_or_404(self, user_id: int):
         stmt = select(User).where(User.id == user_id)
-        result = await self.db.execute(stmt)
+        with span("db.user_lookup"):
+            result = await self.db.execute(stmt)
         query = result.scalars().first()
         if not query:
             raise UserNotFoundException()
         return query
 
-    async def get_all_users_db(self):
-        result = await self.db.execute(select(User))
-        users = result.scalars().all()
-        return users
+    def _users_after(self, after_id: int | None):
+        # Only the UserRead columns: no ORM objects and no password hashes.
+        stmt = select(*USER_READ_COLUMNS).order_by(User.id)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        return stmt
 
+    async def get_users_page(self, after_id: int | None, limit: int):
+        """Up to ``limit`` users with ids above ``after_id`` (keyset pagination)."""
+        with span("db.users_page"):
+            result = await self.db.execute(self._users_after(after_id).limit(limit))
+        return [dict(row) for row in result.mappings()]
 
-    async def db_delete_commit(self, instance):
-        await self.db.delete(instance)
-        await self.db.commit()
+    async def stream_users(self, after_id: int | None = None, batch_size: int = 1000):
+        """Yield every user above ``after_id`` from a server-side cursor, ``batch_size`` rows at a time."""
+        result = await self.db.stream(self._users_after(after_id).execution_options(yield_per=batch_size))
+        async for row in result.mappings():
+            yield dict(row)
 
-    async def db_commit_refresh(self, instance):
+    async def _write_returning(self, stmt, conflict=_conflict_exception):
         try:
+            with span("db.user_write"):
+                row = (await self.db.execute(stmt)).mappings().one_or_none()
+                await self.db.commit()
+        except IntegrityError as exc:
+            await self.db.rollback()
+            raise conflict(exc)
+        return dict(row) if row is not None else None
+
+    async def find_taken(self, usernames, emails) -> tuple[set[str], set[str]]:
+        """Which of ``usernames`` and ``emails`` are already registered, in one query."""
+        usernames, emails = set(usernames), set(emails)
+        if not usernames and not emails:
+            return set(), set()
+
+        stmt = select(User.username, User.email).where(or_(User.username.in_(usernames), User.email.in_(emails)))
+        with span("db.user_lookup"):
+            rows = (await self.db.execute(stmt)).all()
+        return {row.username for row in rows} & usernames, {row.email for row in rows} & emails
+
+    async def insert_users(self, rows: list[dict]) -> dict[str, dict]:
+        """Multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING, keyed by username.
+
+        Rows that hit a unique constraint (say, a concurrent signup) are
+        skipped instead of failing the batch, and are absent from the result.
+        """
+        if not rows:
+            return {}
+
+        stmt = dialect_insert(self.db, User).values(rows).on_conflict_do_nothing().returning(*USER_READ_COLUMNS)
+        with span("db.user_write"):
+            created = (await self.db.execute(stmt)).mappings().all()
             await self.db.commit()
-            await self.db.refresh(instance)
-            return instance
+        return {row["username"]: dict(row) for row in created}
 
-        except IntegrityError:
-            await self.db.rollback()
-            raise EmailTakenException()
+    async def create_user(self, values: dict):
+        """INSERT ... RETURNING; duplicates are caught by the unique constraints."""
+        return await self._write_returning(
+            insert(User).values(**values).returning(*USER_READ_COLUMNS),
+            conflict=lambda exc: UsernameOrEmailTakenException(),
+        )
 
-    async def db_add_commit_refresh(self, instance):
-        self.db.add(instance)
-        await self.db.commit()
-        await self.db.refresh(instance)
-        return instance
\ No newline at end of file
+    async def update_user(self, username: str, values: dict):
+        """UPDATE ... WHERE username RETURNING the updated row."""
+        if not values:
+            # Nothing to set (an empty PATCH): SET with no columns is invalid SQL.
+            with span("db.user_lookup"):
+                row = (await self.db.execute(
+                    select(*USER_READ_COLUMNS).where(User.username == username)
+                )).mappings().one_or_none()
+            if row is None:
+                raise UserNotFoundException()
+            return dict(row)
+
+        stmt = (
+            update(User)
+            .where(User.username == username)
+            .values(**values)
+            .returning(*USER_READ_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        user = await self._write_returning(stmt)
+        if user is None:
+            raise UserNotFoundException()
+        return user
+
+    async def delete_user(self, username: str):
+        with span("db.user_write"):
+            result = await self.db.execute(
+                delete(User).where(User.username == username).execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        if result.rowcount == 0:
+            raise UserNotFoundException()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of polling.
+
+    ``reserve()`` always takes a token, letting the balance go negative, and
+    returns how long the caller has to wait for it. Waiters therefore queue
+    up in arrival order and the long-run rate never exceeds ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        self._refill()
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def cancel(self):
+        self.tokens += 1
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+
+class UpstreamRateLimiter:
+    """Per-host and per-proxy token buckets gating outbound requests.
+
+    Rates are the budget for the whole deployment; each worker process gets
+    ``1 / workers`` of it so the total stays bounded however many run.
+    """
+
+    def __init__(
+        self,
+        host_rate: float,
+        host_burst: float = 1,
+        proxy_rate: float | None = None,
+        proxy_burst: float = 1,
+        workers: int = 1,
+        clock=time.monotonic,
+        sleep=asyncio.sleep,
+    ):
+        self.host_rate = host_rate / workers
+        self.host_burst = host_burst
+        self.proxy_rate = proxy_rate / workers if proxy_rate else None
+        self.proxy_burst = proxy_burst
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+
+    def _buckets_for(self, host, proxy):
+        buckets = [self._bucket(("host", host), self.host_rate, self.host_burst)]
+        if proxy is not None and self.proxy_rate:
+            buckets.append(self._bucket(("proxy", proxy), self.proxy_rate, self.proxy_burst))
+        return buckets
+
+    def _bucket(self, key, rate, burst):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(rate, burst, self.clock)
+        return bucket
+
+    async def acquire(self, host: str, proxy: str | None = None):
+        buckets = self._buckets_for(host, proxy)
+        delay = max(bucket.reserve() for bucket in buckets)
+        if delay <= 0:
+            return
+        try:
+            await self.sleep(delay)
+        except asyncio.CancelledError:
+            for bucket in buckets:
+                bucket.cancel()
+            raise
+
+    def try_acquire(self, host: str, proxy: str | None = None) -> bool:
+        """Take a token only if every bucket has one available right now."""
+        buckets = self._buckets_for(host, proxy)
+        if not all(bucket.available() for bucket in buckets):
+            return False
+        for bucket in buckets:
+            bucket.tokens -= 1
+        return True
@@ -0,0 +1,131 @@
+import codecs
+import json
+
+import orjson
+from starlette.responses import StreamingResponse
+
+NDJSON_CHUNK_LINES = 64
+# Longest single item the streaming parsers buffer before giving up.
+MAX_ITEM_BYTES = 64 * 1024
+
+
+async def ndjson_stream(items, chunk_lines: int = NDJSON_CHUNK_LINES):
+    """Encode ``items`` (sync or async iterable) as NDJSON chunks.
+
+    The first line is sent on its own so time-to-first-byte does not wait
+    for a full chunk; after that lines are grouped to keep ASGI sends cheap.
+    """
+    if not hasattr(items, "__aiter__"):
+        items = _as_async(items)
+
+    chunk = []
+    first = True
+    async for item in items:
+        chunk.append(orjson.dumps(item))
+        if first or len(chunk) >= chunk_lines:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+            first = False
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+async def _as_async(items):
+    for item in items:
+        yield item
+
+
+async def iter_ndjson(chunks, max_item_bytes: int = MAX_ITEM_BYTES):
+    """Decode NDJSON from an async iterable of byte chunks, one line at a time.
+
+    Raises ValueError on a malformed or oversized line.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
+        if len(buffer) > max_item_bytes:
+            raise ValueError("NDJSON line too long")
+    if buffer.strip():
+        yield orjson.loads(buffer)
+
+
+async def iter_json_array(chunks, max_item_bytes: int = MAX_ITEM_BYTES):
+    """Decode the items of a top-level JSON array from byte chunks, one item at a time.
+
+    Only the item being parsed is buffered, so memory does not grow with
+    the array. Raises ValueError when the body is not a well-formed array.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    buffer = ""
+    # start -> "[" -> value -> ("," value)* -> "]" -> end
+    state = "start"
+
+    async def text():
+        async for chunk in chunks:
+            yield utf8.decode(chunk)
+        yield utf8.decode(b"", final=True)
+
+    async for decoded in text():
+        buffer += decoded
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError("expected a JSON array")
+                state, pos = "first", pos + 1
+            elif state == "end":
+                raise ValueError("data after the JSON array")
+            elif char == "]" and state in ("first", "next"):
+                state, pos = "end", pos + 1
+            elif char == "," and state == "next":
+                state, pos = "value", pos + 1
+            elif state == "next":
+                raise ValueError(f"expected ',' or ']' at {char!r}")
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Most likely an item split across chunks; wait for more.
+                    break
+                if not isinstance(item, (dict, list, str)):
+                    # A number may continue in the next chunk ("3." + "5", "1e" + "5"):
+                    # only trust it once the next token, "," or "]", has arrived.
+                    after = end
+                    while after < len(buffer) and buffer[after] in " \t\r\n":
+                        after += 1
+                    if after == len(buffer) or buffer[after] not in ",]":
+                        break
+                yield item
+                state, pos = "next", end
+
+        buffer = buffer[pos:]
+        if len(buffer) > max_item_bytes:
+            raise ValueError("JSON array item too long")
+
+    if state != "end":
+        raise ValueError("unterminated JSON array")
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """A StreamingResponse whose body may keep reading the request body.
+
+    Under ASGI spec < 2.4 StreamingResponse also reads ``receive`` to spot
+    disconnects, which would swallow request body chunks; this one leaves
+    ``receive`` to the body iterator.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,160 @@
+"""Phase timers recorded into Prometheus-style histograms and Server-Timing.
+
+``with span("rate_limit"):`` times a block. The duration goes to the
+``imdb_phase_duration_seconds`` histogram and, inside an HTTP request, to
+the list ProcessTimeMiddleware turns into the ``Server-Timing`` header.
+With METRICS_ENABLED=0, ``span`` hands back a shared no-op object.
+"""
+import bisect
+import time
+from contextvars import ContextVar
+
+from app.core.settings import METRICS_ENABLED
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PHASE_METRIC = "imdb_phase_duration_seconds"
+
+enabled = METRICS_ENABLED
+
+# Spans of the current HTTP request, set by ProcessTimeMiddleware.
+request_spans: ContextVar[list | None] = ContextVar("request_spans", default=None)
+# Set by collect_spans() while a function runs in a parse worker.
+_collector: ContextVar[list | None] = ContextVar("span_collector", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def cumulative(self):
+        """``(upper bound, observations <= bound)`` pairs, ending with ``+Inf``."""
+        running = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            running += count
+            yield bound, running
+
+
+class Registry:
+    """Histograms keyed by metric name and label values."""
+
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def render(self) -> str:
+        lines = []
+        seen = set()
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            lines.extend(render_histogram(name, dict(labels), histogram))
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def render_histogram(name: str, labels: dict, histogram: Histogram) -> list[str]:
+    """Prometheus text exposition lines for one histogram series."""
+    lines = [
+        f"{name}_bucket{{{_labels({**labels, 'le': bound})}}} {count}"
+        for bound, count in histogram.cumulative()
+    ]
+    suffix = f"{{{_labels(labels)}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+registry = Registry()
+
+
+def record(name: str, elapsed_ns: int):
+    collector = _collector.get()
+    if collector is not None:
+        collector.append((name, elapsed_ns))
+        return
+
+    registry.observe(PHASE_METRIC, elapsed_ns / 1e9, phase=name)
+    spans = request_spans.get()
+    if spans is not None:
+        spans.append((name, elapsed_ns))
+
+
+class Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter_ns() - self.start)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str):
+    return Span(name) if enabled else NOOP_SPAN
+
+
+def collect_spans(fn, *args):
+    """Run ``fn`` and return ``(result, spans)`` for replay() in the calling process."""
+    if not enabled:
+        return fn(*args), ()
+
+    spans = []
+    token = _collector.set(spans)
+    try:
+        return fn(*args), spans
+    finally:
+        _collector.reset(token)
+
+
+def replay(spans):
+    for name, elapsed_ns in spans:
+        record(name, elapsed_ns)
+
+
+def server_timing(spans) -> str:
+    """``Server-Timing`` entries, one per phase, summing repeated phases."""
+    totals = {}
+    for name, elapsed_ns in spans:
+        totals[name] = totals.get(name, 0) + elapsed_ns
+    return ", ".join(f"{name};dur={elapsed / 1e6:.3f}" for name, elapsed in totals.items())
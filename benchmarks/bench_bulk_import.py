@@ -0,0 +1,79 @@
+"""Bulk user import vs one /users/create-style request per user.
+
+    python -m benchmarks.bench_bulk_import
+
+Runs against a file-backed SQLite database with cheap bcrypt rounds, so
+the numbers show per-row overhead rather than hashing cost. Peak memory is
+traced while the importer consumes an NDJSON body in 64 KiB chunks.
+"""
+import asyncio
+import time
+import tracemalloc
+
+import orjson
+from passlib.context import CryptContext
+
+from app.core.security import PasswordHasher
+from app.services.exceptions import UsernameOrEmailTakenException
+from app.services.user_import import UserImporter
+from app.services.users import UserService
+from app.utils.serialization import iter_ndjson
+from benchmarks.db import sqlite_session_factory
+
+context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+async def body(count, chunk_size=64 * 1024, prefix="bulk"):
+    # Generated lazily so the input itself takes no memory.
+    chunk = b""
+    for n in range(count):
+        chunk += orjson.dumps({"username": f"{prefix}{n}", "email": f"{prefix}{n}@example.com", "password": "pw"}) + b"\n"
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = b""
+    if chunk:
+        yield chunk
+
+
+async def one_by_one(service, hasher, count):
+    for n in range(count):
+        password = await hasher.hash("pw")
+        try:
+            await service.create_user({"username": f"single{n}", "email": f"single{n}@example.com", "password": password})
+        except UsernameOrEmailTakenException:
+            pass
+
+
+async def bulk(service, hasher, count, prefix):
+    results = 0
+    async for _ in UserImporter(service, hasher, 1000).run(iter_ndjson(body(count, prefix=prefix))):
+        results += 1
+    return results
+
+
+async def main():
+    hasher = PasswordHasher(workers=4, max_pending=32, context=context)
+    async with sqlite_session_factory() as session_factory:
+        async with session_factory() as db:
+            service = UserService(db)
+
+            start = time.perf_counter()
+            await one_by_one(service, hasher, 2000)
+            print(f"one by one            {2000 / (time.perf_counter() - start):8.0f} users/s")
+
+            start = time.perf_counter()
+            await bulk(service, hasher, 10_000, prefix="timed")
+            print(f"bulk                  {10_000 / (time.perf_counter() - start):8.0f} users/s")
+
+            # Traced separately: tracemalloc slows the run down several times.
+            for count in (5_000, 50_000):
+                tracemalloc.start()
+                await bulk(service, hasher, count, prefix=f"traced{count}_")
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"bulk {count:>6} rows peak  {peak / 1024 / 1024:8.2f} MiB")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""Chart snapshot encoding and pipelined cache round trips.
+
+    python -m benchmarks.bench_cache_backend
+
+Round trips run against the local stand-in Redis server used by the
+tests, so they measure protocol and round-trip overhead, not Redis.
+"""
+import asyncio
+import time
+
+from app.services.cache_backend import RedisBackend
+from app.services.extract_data import extract_250_movies
+from app.services.movie import Chart
+from benchmarks.utils import measure, report
+from benchmarks.pages import build_next_data
+from benchmarks.servers import stub_redis_server
+
+
+def snapshots():
+    for count in (250, 100_000):
+        edges = build_next_data(count)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+        chart = Chart(extract_250_movies(edges))
+        data = chart.to_bytes()
+        print(f"\n{count} titles, snapshot {len(data) / 1024:.0f} KiB")
+        report("encode", *measure(chart.to_bytes, repeat=5))
+        report("decode", *measure(lambda: Chart.from_bytes(data), repeat=5))
+        report("Chart() from rows (digest)", *measure(lambda: Chart(chart.movies), repeat=5))
+
+
+async def round_trips(keys=100, repeat=20):
+    async with stub_redis_server() as server:
+        backend = RedisBackend(server.url)
+        items = {f"key{n}": b"x" * 200 for n in range(keys)}
+
+        async def timed(fn):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await fn()
+            return (time.perf_counter() - start) / repeat
+
+        print(f"\n{keys} keys")
+        print(f"{'sequential SET':<32} {await timed(lambda: sequential_set(backend, items)) * 1000:10.3f} ms")
+        print(f"{'pipelined mset':<32} {await timed(lambda: backend.mset(items, ttl=60)) * 1000:10.3f} ms")
+        print(f"{'sequential GET':<32} {await timed(lambda: sequential_get(backend, items)) * 1000:10.3f} ms")
+        print(f"{'mget':<32} {await timed(lambda: backend.mget(items)) * 1000:10.3f} ms")
+        await backend.aclose()
+
+
+async def sequential_set(backend, items):
+    for key, value in items.items():
+        await backend.set(key, value, ttl=60)
+
+
+async def sequential_get(backend, items):
+    for key in items:
+        await backend.get(key)
+
+
+if __name__ == "__main__":
+    snapshots()
+    asyncio.run(round_trips())
@@ -0,0 +1,80 @@
+"""Login throughput and event-loop stalls with blocking vs pooled bcrypt.
+
+    BCRYPT_ROUNDS=12 python -m benchmarks.bench_login [concurrency]
+
+Drives a login-shaped route in-process over ASGI: the password check is the
+only work, as in /users/login once the user row is loaded. While logins run,
+a ticker measures how late the event loop wakes it, which is the delay every
+other request (the chart, scraping) would see.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Form, HTTPException
+
+from app.core.security import hash_password, password_hasher, verify_password, verify_password_async
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(hashed):
+    app = FastAPI()
+
+    @app.post("/login/blocking")
+    async def login_blocking(password: str = Form()):
+        if not verify_password(password, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/login/pooled")
+    async def login_pooled(password: str = Form()):
+        if not await verify_password_async(password, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    return app
+
+
+async def run(app, path, concurrency):
+    loop = asyncio.get_running_loop()
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(loop.time())
+            await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tick = asyncio.create_task(ticker())
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post(path, data={"password": PASSWORD}) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+        ticks.append(loop.time())
+        tick.cancel()
+
+    # How late each 10 ms tick fired; the last entry covers a loop still blocked at the end.
+    lags = sorted(max(0.0, later - earlier - 0.01) for earlier, later in zip(ticks, ticks[1:]))
+    ok = sum(response.status_code == 200 for response in responses)
+    rejected = sum(response.status_code == 429 for response in responses)
+    print(f"{path:<16} {ok / elapsed:7.1f} logins/s  total {elapsed:6.2f} s  "
+          f"loop lag p50 {lags[len(lags) // 2] * 1000:7.1f} ms  max {lags[-1] * 1000:7.1f} ms  429s {rejected}")
+
+
+def main(concurrency):
+    hashed = hash_password(PASSWORD)
+    app = build_app(hashed)
+    print(f"{concurrency} concurrent logins, {password_hasher.workers} hash workers, "
+          f"max pending {password_hasher.max_pending}")
+    asyncio.run(run(app, "/login/blocking", concurrency))
+    asyncio.run(run(app, "/login/pooled", concurrency))
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
@@ -0,0 +1,87 @@
+"""Per-request overhead of BaseHTTPMiddleware vs the plain ASGI middlewares.
+
+    python -m benchmarks.bench_middleware [requests]
+
+A trivial route is called in-process over ASGI with no middleware, with
+the previous BaseHTTPMiddleware implementations, and with the current
+ASGI ones; the difference to the bare app is the middleware cost.
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.auth_middleware import AuthMiddleware
+from app.middleware.time_middleware import ProcessTimeMiddleware
+
+API_KEY = "bench-key"
+
+
+class BaseHTTPProcessTime(BaseHTTPMiddleware):
+    # The previous ProcessTimeMiddleware, kept as the baseline.
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+
+class BaseHTTPAuth(BaseHTTPMiddleware):
+    # The previous AuthMiddleware, kept as the baseline.
+    async def dispatch(self, request: Request, call_next):
+        if request.headers.get("X-API-KEY") != API_KEY:
+            raise HTTPException(status_code=401, detail="Invalid API Key")
+        return await call_next(request)
+
+
+def build_app(*middlewares):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    for middleware, kwargs in middlewares:
+        app.add_middleware(middleware, **kwargs)
+    return app
+
+
+async def drive(app, count):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "query_string": b"", "root_path": "",
+        "headers": [(b"x-api-key", API_KEY.encode())], "client": ("bench", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter_ns() - start) / count / 1000
+
+
+def main(count):
+    variants = [
+        ("no middleware", build_app()),
+        ("BaseHTTPMiddleware x2", build_app((BaseHTTPProcessTime, {}), (BaseHTTPAuth, {}))),
+        ("pure ASGI x2", build_app((ProcessTimeMiddleware, {}), (AuthMiddleware, {"api_keys": [API_KEY]}))),
+    ]
+    for _, app in variants:
+        asyncio.run(drive(app, 200))
+
+    bare = None
+    for name, app in variants:
+        per_request = min(asyncio.run(drive(app, count)) for _ in range(3))
+        bare = bare or per_request
+        print(f"{name:<24} {per_request:8.1f} us/request  overhead {per_request - bare:7.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,70 @@
+"""Retained memory and build time of extracted chart rows: dicts vs Movie.
+
+    python -m benchmarks.bench_movie_memory
+
+Edges are decoded from JSON before every run, as on a real refresh, so the
+dict baseline holds its own copy of each genre string and list.
+"""
+import json
+import time
+import tracemalloc
+
+from app.services.extract_data import extract_250_movies
+from benchmarks.pages import build_next_data
+
+
+def extract_dicts(datas):
+    # The extraction before Movie, kept as the baseline.
+    return [
+        {
+            "rank": item.get("currentRank"),
+            "imdb_id": item["node"].get("id"),
+            "title": item["node"].get("titleText", {}).get("text"),
+            "year": item["node"].get("releaseYear", {}).get("year"),
+            "rating": item["node"].get("ratingsSummary", {}).get("aggregateRating"),
+            "rating_count": item["node"].get("ratingsSummary", {}).get("voteCount"),
+            "plot": item["node"].get("plot", {}).get("plotText", {}).get("plainText"),
+            "genres": [g["genre"]["text"] for g in item["node"].get("titleGenres", {}).get("genres", [])],
+        }
+        for item in datas
+    ]
+
+
+def decode(payload):
+    return json.loads(payload)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+
+
+def timed(extract, payload):
+    edges = decode(payload)
+    start = time.perf_counter()
+    extract(edges)
+    return time.perf_counter() - start
+
+
+def retained(extract, payload):
+    """Bytes the rows add on top of the decoded page, after the page is dropped."""
+    edges = decode(payload)
+    tracemalloc.start()
+    try:
+        rows = extract(edges)
+        del edges
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del rows
+    return size
+
+
+def main():
+    for count in (250, 100_000):
+        payload = json.dumps(build_next_data(count))
+        print(f"\n{count} titles")
+        for name, extract in (("dict rows (baseline)", extract_dicts), ("Movie rows", extract_250_movies)):
+            elapsed = min(timed(extract, payload) for _ in range(5))
+            size = retained(extract, payload)
+            print(f"{name:<24} {elapsed * 1000:10.2f} ms {size / 1024 / 1024:10.2f} MiB "
+                  f"{size / count:8.0f} B/title")
+
+
+if __name__ == "__main__":
+    main()
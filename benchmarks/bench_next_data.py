@@ -0,0 +1,33 @@
+"""Compare byte-scan vs BeautifulSoup ``__NEXT_DATA__`` extraction.
+
+    python -m benchmarks.bench_next_data [saved_page.html ...]
+
+Without arguments a synthetic chart page of real-page size is used.
+"""
+import json
+import sys
+from pathlib import Path
+
+from app.services.next_data import _find_next_data_soup, find_next_data
+from benchmarks.utils import measure, report
+from benchmarks.pages import build_chart_page
+
+
+def bench_page(name, content: bytes):
+    print(f"\n{name}: {len(content) / 1024:.0f} KiB")
+    report("bytes scan + json.loads", *measure(lambda: json.loads(find_next_data(content))))
+    report("BeautifulSoup + json.loads", *measure(lambda: json.loads(_find_next_data_soup(content)), repeat=5))
+
+
+def main(paths):
+    if paths:
+        pages = [(path, Path(path).read_bytes()) for path in paths]
+    else:
+        pages = [("synthetic top 250", build_chart_page(count=250, padding_kb=1500))]
+
+    for name, content in pages:
+        bench_page(name, content)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
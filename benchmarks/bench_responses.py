@@ -0,0 +1,97 @@
+"""Time-to-first-byte, total time and peak memory of /imdb/top250 encodings.
+
+    python -m benchmarks.bench_responses
+
+Compares FastAPI's default path (jsonable_encoder + json) against the
+ORJSONResponse and NDJSON streaming modes of the real route, driven
+in-process over ASGI for 250 and 100k synthetic titles.
+"""
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from fastapi import FastAPI
+
+from app.routes import imdb
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.extract_data import extract_250_movies
+from app.services.movie import Chart
+from app.services.titles import TOP_250_CACHE_KEY
+from benchmarks.pages import build_next_data
+
+
+def build_app(movies):
+    app = FastAPI()
+    app.include_router(imdb.router)
+    app.state.chart_store = ChartStore(MemoryBackend(maxsize=10), SWRCache(ttl=3600))
+    app.state.chart_store.cache.set(TOP_250_CACHE_KEY, Chart(movies))
+
+    @app.get("/baseline")
+    async def baseline():
+        return {"count": len(movies), "results": movies}
+
+    return app
+
+
+async def call(app, path, query=b""):
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_byte, size
+        if message["type"] == "http.response.body":
+            if message.get("body"):
+                first_byte = first_byte or time.perf_counter()
+                size += len(message["body"])
+            if not message.get("more_body"):
+                finished.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query,
+        "root_path": "", "headers": [], "client": ("bench", 1), "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return first_byte - start, time.perf_counter() - start, size
+
+
+def bench(app, name, path, query=b"", repeat=10):
+    results = [asyncio.run(call(app, path, query)) for _ in range(repeat)]
+    ttfb = statistics.median(result[0] for result in results)
+    total = statistics.median(result[1] for result in results)
+
+    tracemalloc.start()
+    asyncio.run(call(app, path, query))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<28} ttfb {ttfb * 1000:9.2f} ms  total {total * 1000:9.2f} ms  "
+          f"peak {peak / 1024 / 1024:8.2f} MiB  body {results[0][2] / 1024:9.0f} KiB")
+
+
+def main():
+    for count in (250, 100_000):
+        edges = build_next_data(count)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+        app = build_app(extract_250_movies(edges))
+        print(f"\n{count} titles")
+        bench(app, "default JSON (baseline)", "/baseline", repeat=3 if count > 1000 else 10)
+        bench(app, "ORJSONResponse", "/imdb/top250")
+        bench(app, "NDJSON stream", "/imdb/top250", b"format=ndjson")
+
+
+if __name__ == "__main__":
+    main()
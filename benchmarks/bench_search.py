@@ -0,0 +1,104 @@
+"""Build time and query latency of the chart search index at 100k titles.
+
+    python -m benchmarks.bench_search
+
+Titles are drawn from a Zipf-like vocabulary so common words produce long
+posting lists and rare ones short ones; each query is compared against a
+linear scan over the same movies.
+"""
+import random
+import statistics
+import time
+
+from app.services.movie import Movie
+from app.services.search import SearchIndex
+
+GENRES = ("Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Fantasy", "Horror",
+          "Mystery", "Romance", "Sci-Fi", "Thriller", "War", "Western")
+
+QUERIES = {
+    "prefix rare word": {"q": "velor"},
+    "prefix two words": {"q": "the kar"},
+    "prefix common word": {"q": "the"},
+    "substring": {"q": "arkon", "mode": "substring"},
+    "genre + year range": {"genres": ["Drama", "Crime"], "year_min": 1990, "year_max": 2010},
+    "rating >= 8.5, by rating": {"rating_min": 8.5, "sort": "rating"},
+    "text + genre + rating": {"q": "kar", "genres": ["Drama"], "rating_min": 7.0},
+    "no filter, deep page": {"offset": 50_000},
+}
+
+
+def build_movies(count, seed=7):
+    rng = random.Random(seed)
+    syllables = ["ka", "ro", "ve", "lor", "an", "mi", "tu", "sen", "dra", "ko", "ne", "ith", "ar", "on"]
+    words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(5000)]
+    words = ["the", "of", "and", "a"] + sorted(set(words))
+    weights = [1 / (i + 1) for i in range(len(words))]
+
+    return [
+        Movie(
+            rank=rank,
+            imdb_id=f"tt{rank:07d}",
+            title=" ".join(rng.choices(words, weights, k=rng.randint(1, 5))).title(),
+            year=rng.randint(1920, 2025),
+            rating=round(rng.uniform(1, 10), 1),
+            rating_count=rng.randint(100, 2_000_000),
+            plot=None,
+            genres=tuple(sorted(rng.sample(GENRES, rng.randint(1, 3)))),
+        )
+        for rank in range(1, count + 1)
+    ]
+
+
+def scan(movies, q=None, mode="prefix", genres=(), year_min=None, year_max=None, rating_min=None,
+         sort="relevance", offset=0, limit=20):
+    # What the endpoint would do without an index.
+    tokens = q.lower().split() if q else []
+    matched = []
+    for movie in movies:
+        title = movie.title.lower()
+        if mode == "substring" and q and q.lower() not in title:
+            continue
+        if mode == "prefix" and not all(any(w.startswith(t) for w in title.split()) for t in tokens):
+            continue
+        if any(genre not in movie.genres for genre in genres):
+            continue
+        if year_min is not None and (movie.year or 0) < year_min:
+            continue
+        if year_max is not None and (movie.year or 0) > year_max:
+            continue
+        if rating_min is not None and (movie.rating or 0) < rating_min:
+            continue
+        matched.append(movie)
+    if sort == "rating":
+        matched.sort(key=lambda movie: -movie.rating)
+    return len(matched), matched[offset:offset + limit]
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(count=100_000):
+    movies = build_movies(count)
+
+    start = time.perf_counter()
+    index = SearchIndex(movies)
+    print(f"{count} titles, index built in {time.perf_counter() - start:.2f} s, "
+          f"{len(index.vocabulary)} tokens, {len(index.trigrams)} trigrams\n")
+
+    print(f"{'query':<28} {'matches':>8} {'index':>12} {'scan':>12}")
+    for name, params in QUERIES.items():
+        seconds, (total, page) = timed(lambda: index.search(**params), repeat=200)
+        scan_seconds, (scan_total, _) = timed(lambda: scan(movies, **params), repeat=3)
+        assert total == scan_total, (name, total, scan_total)
+        print(f"{name:<28} {total:>8} {seconds * 1e6:>9.0f} µs {scan_seconds * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
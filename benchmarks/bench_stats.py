@@ -0,0 +1,81 @@
+"""Chart statistics: NumPy columns vs per-request Python loops.
+
+    python -m benchmarks.bench_stats
+
+Rows are synthetic Movie objects with interned genre tuples, as
+extract_250_movies produces them. "columns" is the one pass that builds
+the NumPy arrays; "aggregate" is everything after it.
+"""
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from app.services.movie import Movie, genre_table
+from app.services.stats import ChartColumns, compute_stats
+
+GENRES = ("Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Fantasy", "History",
+          "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller", "War")
+
+
+def build_movies(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        Movie(
+            rank=rank, imdb_id=f"tt{rank:07d}", title=None,
+            year=rng.randint(1920, 2025), rating=round(rng.uniform(1, 10), 1),
+            rating_count=rng.randint(100, 3_000_000), plot=None,
+            genres=genre_table.intern(sorted(rng.sample(GENRES, rng.randint(1, 3)))),
+        )
+        for rank in range(1, count + 1)
+    ]
+
+
+def python_stats(movies):
+    # The same figures computed per request with plain loops.
+    by_genre = defaultdict(list)
+    by_decade = defaultdict(lambda: [0] * 10)
+    for movie in movies:
+        for genre in movie.genres:
+            by_genre[genre].append((movie.rating, movie.rating_count))
+        by_decade[movie.year // 10 * 10][min(int(movie.rating), 9)] += 1
+
+    ratings = [movie.rating for movie in movies]
+    votes = [movie.rating_count for movie in movies]
+    return {
+        "genres": {
+            genre: (
+                len(rows),
+                statistics.mean(r for r, _ in rows),
+                statistics.median(r for r, _ in rows),
+                sum(r * v for r, v in rows) / sum(v for _, v in rows),
+            )
+            for genre, rows in by_genre.items()
+        },
+        "decades": dict(by_decade),
+        "correlation": statistics.correlation(ratings, votes),
+    }
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"{'rows':>9} {'columns':>12} {'numpy total':>12} {'python loops':>13}")
+    for count in (250, 1_000_000):
+        movies = build_movies(count)
+        repeat = 50 if count < 10_000 else 3
+        columns = timed(lambda: ChartColumns(movies), repeat)
+        total = timed(lambda: compute_stats(movies), repeat)
+        baseline = timed(lambda: python_stats(movies), repeat)
+        print(f"{count:>9} {columns * 1000:>9.2f} ms {total * 1000:>9.2f} ms {baseline * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
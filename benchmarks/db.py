@@ -0,0 +1,32 @@
+import tempfile
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+
+
+@asynccontextmanager
+async def sqlite_session_factory():
+    """Session factory bound to a fresh SQLite database with every table created.
+
+    The database is a temporary file rather than ``:memory:``, which shares
+    one connection between sessions and breaks concurrent writers.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/test.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        finally:
+            await engine.dispose()
+
+
+@asynccontextmanager
+async def sqlite_session():
+    async with sqlite_session_factory() as session_factory:
+        async with session_factory() as session:
+            yield session
@@ -0,0 +1,175 @@
+"""A fake IMDb for the scraper tests and load benchmarks; runnable standalone.
+
+    python -m benchmarks.fake_imdb --port 8001 --latency 0.2 --error-rate 0.05
+    IMDB_BASE_URL=http://127.0.0.1:8001 CHART_REFRESH_INTERVAL=60 uvicorn app.core.config:app
+
+Serves /chart/top and /title/<id>/ from recorded pages in --pages (saved
+with a browser as chart_top.html and title_<id>.html) or from generated
+ones, so the scraper runs without touching imdb.com.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from benchmarks.pages import build_chart_page, build_title_page
+from benchmarks.servers import StubHTTPServer
+
+TITLE_PATH = re.compile(r"^/title/(tt\d+)/?$")
+
+
+class FakeIMDb:
+    """Serves IMDb-shaped chart and title pages from a local port.
+
+    Pages are read from ``pages_dir`` when it holds a recording
+    (``chart_top.html``, ``title_<imdb_id>.html``) and generated otherwise.
+    Each response waits ``latency`` plus up to ``jitter`` seconds, and fails
+    with ``error_status`` with probability ``error_rate``. With ``etag`` set,
+    pages carry an ETag and conditional requests get a 304.
+    """
+
+    def __init__(
+        self,
+        chart_size=250,
+        padding_kb=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        etag=True,
+        pages_dir=None,
+        seed=0,
+    ):
+        self.chart_size = chart_size
+        self.padding_kb = padding_kb
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.etag = etag
+        self.pages_dir = Path(pages_dir) if pages_dir else None
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pages = {}
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0}
+        self.server = StubHTTPServer(self.handle)
+
+    @property
+    def url(self):
+        return self.server.url
+
+    @property
+    def chart_url(self):
+        return f"{self.url}/chart/top"
+
+    @property
+    def title_url(self):
+        return f"{self.url}/title/{{imdb_id}}/"
+
+    async def start(self, host="127.0.0.1", port=0):
+        await self.server.start(host, port)
+        return self
+
+    async def stop(self):
+        await self.server.stop()
+
+    def page(self, path):
+        """(body, etag) for ``path``, or None if IMDb would 404."""
+        if path not in self.pages:
+            body = self._render(path)
+            tag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"' if body is not None else None
+            self.pages[path] = (body, tag)
+        return self.pages[path]
+
+    def _render(self, path):
+        if path.rstrip("/") == "/chart/top":
+            recorded = self._recorded("chart_top.html")
+            return recorded or build_chart_page(self.chart_size, self.padding_kb, self.seed)
+        if match := TITLE_PATH.match(path):
+            imdb_id = match[1]
+            return self._recorded(f"title_{imdb_id}.html") or build_title_page(imdb_id, self.seed)
+        return None
+
+    def _recorded(self, name):
+        if self.pages_dir is not None and (self.pages_dir / name).is_file():
+            return (self.pages_dir / name).read_bytes()
+        return None
+
+    async def handle(self, method, target, headers):
+        self.stats["requests"] += 1
+        delay = self.latency + self.jitter * self.rng.random()
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return self.error_status, {}, b"upstream error"
+
+        body, tag = self.page(target.split("?", 1)[0])
+        if body is None:
+            return 404, {}, b"not found"
+        if not self.etag:
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, body
+        if headers.get("if-none-match") == tag:
+            self.stats["not_modified"] += 1
+            return 304, {"ETag": tag}, b""
+        return 200, {"Content-Type": "text/html; charset=utf-8", "ETag": tag}, body
+
+
+@asynccontextmanager
+async def fake_imdb(**options):
+    server = await FakeIMDb(**options).start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--chart-size", type=int, default=250, help="titles on the generated chart")
+    parser.add_argument("--padding-kb", type=int, default=1500, help="markup before __NEXT_DATA__ (a real chart is ~1.5 MB)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, uniformly")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-etag", dest="etag", action="store_false", help="never answer 304")
+    parser.add_argument("--pages", help="directory of recorded pages")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    server = await FakeIMDb(
+        chart_size=args.chart_size,
+        padding_kb=args.padding_kb,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        etag=args.etag,
+        pages_dir=args.pages,
+        seed=args.seed,
+    ).start(args.host, args.port)
+    print(f"fake IMDb on {server.url} (chart {len(server.page('/chart/top')[0]) / 1024:.0f} KiB)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(f"served {server.stats}")
+
+
+def main():
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""End-to-end load test of the API, with IMDb replaced by a local fake.
+
+    python -m benchmarks.load
+    python -m benchmarks.load --scenarios top250,login --concurrency 1,16,64 --duration 10
+    python -m benchmarks.load --compare benchmarks/results/load-<before>.json
+    python -m benchmarks.load --url http://127.0.0.1:8000 --output run.json
+
+By default the real app runs in-process over ASGI: users live in a
+file-backed SQLite database and the chart is scraped by IMDBScraper from a
+FakeIMDb server, stored and published exactly as ChartRefresher does in
+production. With --url the same scenarios hit a running server instead
+(start it with IMDB_BASE_URL pointing at benchmarks.fake_imdb).
+
+Each scenario runs at each concurrency level as a closed loop of workers
+for --duration seconds. Reported: throughput, latency p50/p95/p99 and how
+late a 10 ms ticker wakes up, i.e. the event-loop lag every request pays.
+In-process that is the server's loop; with --url it is only the client's.
+
+Results are written as JSON. --compare reads an earlier file and flags
+levels whose throughput fell or p95 rose by more than --threshold.
+"""
+import argparse
+import asyncio
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+import httpx
+import orjson
+from passlib.context import CryptContext
+
+from app.core.config import app
+from app.core.settings import BCRYPT_ROUNDS, CHART_CACHE_STALE_TTL, CHART_CACHE_TTL, PARSE_EXECUTOR, PARSE_WORKERS
+from app.deps import get_db, get_read_db
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.http_client import HTTPClientPool
+from app.services.parse_executor import ParseExecutor
+from app.services.proxy_service import ProxyPool
+from app.services.retry import RetryPolicy
+from app.services.scheduler import ChartRefresher
+from app.services.scraper_service import IMDBScraper
+from app.services.titles import load_top_250
+from app.services.users import UserService
+from benchmarks.db import sqlite_session_factory
+from benchmarks.fake_imdb import fake_imdb
+
+RESULTS_DIR = Path(__file__).parent / "results"
+PASSWORD = "load-test-password"
+LAG_INTERVAL = 0.01
+
+
+class BenchUser:
+    __slots__ = ("username", "headers")
+
+    def __init__(self, username, headers=None):
+        self.username = username
+        self.headers = headers
+
+
+SCENARIOS = {
+    "top250": lambda client, user: client.get("/imdb/top250"),
+    "login": lambda client, user: client.post("/users/login", data={"username": user.username, "password": PASSWORD}),
+    "profile": lambda client, user: client.get("/profile", headers=user.headers),
+    "users": lambda client, user: client.get("/users", params={"limit": 20}, headers=user.headers),
+}
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def summarize(values, quantiles=(50, 95, 99)):
+    ordered = sorted(values)
+    summary = {f"p{q}": _ms(percentile(ordered, q)) for q in quantiles}
+    summary["max"] = _ms(ordered[-1] if ordered else None)
+    return summary
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+async def run_level(client, request, users, concurrency, duration):
+    loop = asyncio.get_running_loop()
+    latencies = []
+    statuses = Counter()
+    lag = []
+    expected = None
+
+    async def ticker():
+        nonlocal expected
+        while True:
+            expected = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            lag.append(max(0.0, loop.time() - expected))
+
+    async def worker(n):
+        user = users[n % len(users)]
+        while loop.time() < deadline:
+            start = time.perf_counter()
+            try:
+                status = (await request(client, user)).status_code
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] += 1
+            # Over ASGI a cached response never suspends; yield as a socket read would.
+            await asyncio.sleep(0)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    deadline = loop.time() + duration
+    try:
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    finally:
+        tick.cancel()
+    if expected is not None:
+        # The tick still pending when the run ended counts too.
+        lag.append(max(0.0, loop.time() - expected))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(count for status, count in statuses.items() if not (status.isdigit() and int(status) < 400))
+    return {
+        "concurrency": concurrency,
+        "elapsed": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": dict(statuses),
+        "throughput": round(len(latencies) / elapsed, 2),
+        "latency_ms": {"mean": _ms(statistics.fmean(latencies)) if latencies else None, **summarize(latencies)},
+        "loop_lag_ms": summarize(lag),
+    }
+
+
+async def seed_users_in_process(session_factory, count, rounds):
+    # Every user shares one hash; verifying it still costs the full ``rounds``.
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(PASSWORD)
+    async with session_factory() as db:
+        await UserService(db).insert_users([
+            {"username": f"load{n}", "email": f"load{n}@example.com", "password": hashed} for n in range(count)
+        ])
+
+
+async def seed_users_over_http(client, count):
+    for n in range(count):
+        response = await client.post(
+            "/users/create", json={"username": f"load{n}", "email": f"load{n}@example.com", "password": PASSWORD}
+        )
+        # Users left over from an earlier run are reused.
+        if response.status_code >= 500:
+            response.raise_for_status()
+
+
+async def log_in(client, count):
+    users = []
+    for n in range(count):
+        user = BenchUser(f"load{n}")
+        response = await client.post("/users/login", data={"username": user.username, "password": PASSWORD})
+        response.raise_for_status()
+        user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        users.append(user)
+    return users
+
+
+async def in_process(args, stack):
+    """The app over ASGI, backed by SQLite and a FakeIMDb upstream."""
+    session_factory = await stack.enter_async_context(sqlite_session_factory())
+    upstream = await stack.enter_async_context(fake_imdb(
+        chart_size=args.chart_size,
+        padding_kb=args.padding_kb,
+        latency=args.upstream_latency,
+        error_rate=args.upstream_error_rate,
+    ))
+
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = get_session
+    stack.callback(app.dependency_overrides.clear)
+
+    clients = HTTPClientPool(http2=False)
+    stack.push_async_callback(clients.aclose)
+    executor = ParseExecutor(PARSE_EXECUTOR, PARSE_WORKERS)
+    stack.callback(executor.shutdown)
+    scraper = IMDBScraper(
+        clients,
+        ProxyPool([]),
+        executor=executor,
+        retry=RetryPolicy(base_delay=0.05),
+        url=upstream.chart_url,
+        title_url=upstream.title_url,
+    )
+    store = ChartStore(
+        MemoryBackend(maxsize=10),
+        SWRCache(CHART_CACHE_TTL, CHART_CACHE_STALE_TTL),
+        loader=partial(load_top_250, session_factory),
+    )
+    app.state.chart_store = store
+    refresher = ChartRefresher(scraper, session_factory, args.refresh_interval or 3600, store=store)
+    await refresher.refresh_once()
+    if args.refresh_interval:
+        # Keep scraping during the run, so parsing competes with requests.
+        refresher.start()
+        stack.push_async_callback(refresher.stop)
+
+    await seed_users_in_process(session_factory, args.users, args.bcrypt_rounds)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load")
+    stack.push_async_callback(client.aclose)
+    return client, {"upstream": upstream.stats, "refresher": refresher}
+
+
+async def remote(args, stack):
+    client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    stack.push_async_callback(client.aclose)
+    await seed_users_over_http(client, args.users)
+    return client, {}
+
+
+async def run(args):
+    results = []
+    async with AsyncExitStack() as stack:
+        target = remote if args.url else in_process
+        client, state = await target(args, stack)
+        users = await log_in(client, args.users)
+
+        for name in args.scenarios:
+            request = SCENARIOS[name]
+            if args.warmup:
+                await run_level(client, request, users, max(args.concurrency), args.warmup)
+            for concurrency in args.concurrency:
+                result = {"scenario": name, **await run_level(client, request, users, concurrency, args.duration)}
+                results.append(result)
+                print_row(result)
+
+        upstream = dict(state.get("upstream", {}))
+        if "refresher" in state:
+            upstream["last_refresh"] = state["refresher"].last_result
+    return results, upstream
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_header():
+    print(f"{'scenario':<10} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7} {'lag p99':>9} {'lag max':>9}")
+
+
+def print_row(result):
+    latency, lag = result["latency_ms"], result["loop_lag_ms"]
+    fmt = lambda value: f"{value:9.2f}" if value is not None else f"{'-':>9}"
+    print(f"{result['scenario']:<10} {result['concurrency']:>5} {result['throughput']:9.1f} "
+          f"{fmt(latency['p50'])} {fmt(latency['p95'])} {fmt(latency['p99'])} "
+          f"{result['errors']:>7} {fmt(lag['p99'])} {fmt(lag['max'])}")
+
+
+def compare(previous, current, threshold):
+    """Print per-level changes; return the levels that regressed beyond ``threshold``."""
+    before = {(r["scenario"], r["concurrency"]): r for r in previous["results"]}
+    regressions = []
+    print(f"\nvs {previous['meta'].get('commit')} ({previous['meta'].get('started_at')})")
+    print(f"{'scenario':<10} {'conc':>5} {'req/s':>9} {'p95':>9} {'p99':>9}")
+    for result in current["results"]:
+        old = before.get((result["scenario"], result["concurrency"]))
+        if old is None:
+            continue
+        throughput = _change(old["throughput"], result["throughput"])
+        p95 = _change(old["latency_ms"]["p95"], result["latency_ms"]["p95"])
+        p99 = _change(old["latency_ms"]["p99"], result["latency_ms"]["p99"])
+        regressed = (throughput is not None and throughput < -threshold) or (p95 is not None and p95 > threshold)
+        if regressed:
+            regressions.append((result["scenario"], result["concurrency"]))
+        print(f"{result['scenario']:<10} {result['concurrency']:>5} {_pct(throughput)} {_pct(p95)} {_pct(p99)}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def _change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old
+
+
+def _pct(change):
+    return f"{'-':>9}" if change is None else f"{change * 100:+8.1f}%"
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(",")]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario and level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unrecorded seconds before each scenario")
+    parser.add_argument("--users", type=int, help="distinct accounts (default: the highest concurrency)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per request, with --url")
+    parser.add_argument("--bcrypt-rounds", type=int, default=BCRYPT_ROUNDS, help="cost of the seeded password hashes")
+    parser.add_argument("--chart-size", type=int, default=250)
+    parser.add_argument("--padding-kb", type=int, default=1500, help="chart page markup (a real one is ~1.5 MB)")
+    parser.add_argument("--upstream-latency", type=float, default=0.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--refresh-interval", type=float, default=0.0, help="rescrape the chart during the run")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/load-<commit>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.users = args.users or max(args.concurrency)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    meta = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "target": args.url or "in-process",
+        "options": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+    }
+
+    print_header()
+    results, upstream = asyncio.run(run(args))
+    report = {"meta": meta, "upstream": upstream, "results": results}
+
+    output = args.output or RESULTS_DIR / f"load-{meta['commit'] or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        if compare(orjson.loads(args.compare.read_bytes()), report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+import random
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Drama",
+    "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+    "Sci-Fi", "Thriller", "War", "Western",
+]
+
+
+def build_edge(rank, rng=None):
+    rng = rng or random.Random(rank)
+    return {
+        "currentRank": rank,
+        "node": {
+            "id": f"tt{rank:07d}",
+            "titleText": {"text": f"Movie {rank}"},
+            "releaseYear": {"year": rng.randint(1920, 2024)},
+            "ratingsSummary": {
+                "aggregateRating": round(rng.uniform(7.5, 9.3), 1),
+                "voteCount": rng.randint(25_000, 3_000_000),
+            },
+            "plot": {"plotText": {"plainText": f"Plot of movie {rank}."}},
+            "titleGenres": {
+                "genres": [
+                    {"genre": {"text": genre}}
+                    for genre in rng.sample(GENRES, rng.randint(1, 3))
+                ]
+            },
+        },
+    }
+
+
+def build_next_data(count=250, seed=0):
+    rng = random.Random(seed)
+    edges = [build_edge(rank, rng) for rank in range(1, count + 1)]
+    return {
+        "props": {
+            "pageProps": {
+                "pageData": {"chartTitles": {"edges": edges}},
+            }
+        },
+        "page": "/chart/top",
+    }
+
+
+def build_chart_page(count=250, padding_kb=0, seed=0) -> bytes:
+    """Render a chart page shaped like IMDb's, with ``__NEXT_DATA__`` near the end.
+
+    ``padding_kb`` adds inline markup before the payload so the page can be
+    grown to the size of a real chart page (about 1.5 MB).
+    """
+    filler = '<div class="ipc-metadata-list-summary-item">filler</div>\n'
+    padding = filler * (padding_kb * 1024 // len(filler))
+    payload = json.dumps(build_next_data(count, seed))
+    page = (
+        "<!DOCTYPE html><html><head><title>IMDb Top 250 Movies</title>"
+        '<script>window.IMDbReactInitialState = [];</script></head>'
+        f"<body><main>{padding}</main>"
+        f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+        "</body></html>"
+    )
+    return page.encode()
+
+
+def build_title_data(imdb_id="tt0111161", seed=0):
+    rng = random.Random(seed)
+    money = lambda amount: {"amount": amount, "currency": "USD"}
+    return {
+        "props": {
+            "pageProps": {
+                "aboveTheFoldData": {
+                    "id": imdb_id,
+                    "titleText": {"text": f"Title {imdb_id}"},
+                    "releaseYear": {"year": rng.randint(1920, 2024)},
+                    "runtime": {"seconds": rng.randint(80, 200) * 60},
+                    "certificate": {"rating": rng.choice(["G", "PG", "PG-13", "R"])},
+                    "ratingsSummary": {"aggregateRating": 8.5, "voteCount": rng.randint(25_000, 3_000_000)},
+                    "plot": {"plotText": {"plainText": f"Plot of {imdb_id}."}},
+                    "genres": {"genres": [{"text": genre} for genre in rng.sample(GENRES, 2)]},
+                },
+                "mainColumnData": {
+                    "cast": {
+                        "edges": [
+                            {"node": {"name": {"nameText": {"text": f"Actor {n}"}}, "characters": [{"name": f"Role {n}"}]}}
+                            for n in range(3)
+                        ]
+                    },
+                    "productionBudget": {"budget": money(25_000_000)},
+                    "lifetimeGross": {"total": money(28_000_000)},
+                    "worldwideGross": {"total": money(29_000_000)},
+                    "openingWeekendGross": {"gross": {"total": money(700_000)}},
+                },
+            }
+        },
+        "page": "/title/[tconst]",
+    }
+
+
+def build_title_page(imdb_id="tt0111161", seed=0) -> bytes:
+    payload = json.dumps(build_title_data(imdb_id, seed))
+    return (
+        f"<!DOCTYPE html><html><head><title>{imdb_id}</title></head><body>"
+        f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+        "</body></html>"
+    ).encode()
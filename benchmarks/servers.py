@@ -0,0 +1,177 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class StubHTTPServer:
+    """Minimal HTTP/1.1 server on a random local port.
+
+    ``handler(method, target, headers)`` returns ``(status, headers, body)``
+    and may be async (e.g. to simulate latency). Requests are recorded in
+    ``self.requests``.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self.server = None
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._serve, host, port)
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                if "content-length" in headers:
+                    await reader.readexactly(int(headers["content-length"]))
+
+                self.requests.append((method, target, headers))
+                result = self.handler(method, target, headers)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                status, response_headers, body = result
+
+                head = [f"HTTP/1.1 {status} Stub", f"Content-Length: {len(body)}"]
+                head += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@asynccontextmanager
+async def stub_server(handler):
+    server = await StubHTTPServer(handler).start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+class StubRedisServer:
+    """In-memory stand-in for the Redis commands the cache backend sends.
+
+    Supports AUTH, SELECT, PING, GET, MGET, SET (with PX), DEL, PUBLISH and
+    SUBSCRIBE. Every command is recorded in ``self.commands``.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.subscribers = {}
+        self.server = None
+        self.loop = None
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self):
+        self.server.close()
+        for writers in self.subscribers.values():
+            for writer in writers:
+                writer.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    def _encode(value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(StubRedisServer._encode(item) for item in value)
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _read_command(self, reader):
+        count = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= self.loop.time()):
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    def _run(self, args, writer):
+        name = args[0].upper().decode()
+        self.commands.append((name, *args[1:]))
+        if name in ("AUTH", "SELECT", "PING"):
+            return "OK" if name != "PING" else "PONG"
+        if name == "GET":
+            return self._get(args[1])
+        if name == "MGET":
+            return [self._get(key) for key in args[1:]]
+        if name == "SET":
+            expires_at = None
+            if len(args) > 3 and args[3].upper() == b"PX":
+                expires_at = self.loop.time() + int(args[4]) / 1000
+            self.data[args[1]] = (args[2], expires_at)
+            return "OK"
+        if name == "DEL":
+            return sum(self.data.pop(key, None) is not None for key in args[1:])
+        if name == "PUBLISH":
+            receivers = self.subscribers.get(args[1], [])
+            for subscriber in receivers:
+                subscriber.write(self._encode([b"message", args[1], args[2]]))
+            return len(receivers)
+        if name == "SUBSCRIBE":
+            self.subscribers.setdefault(args[1], []).append(writer)
+            return [b"subscribe", args[1], 1]
+        return b"ERR"
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                args = await self._read_command(reader)
+                writer.write(self._encode(self._run(args, writer)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            for writers in self.subscribers.values():
+                if writer in writers:
+                    writers.remove(writer)
+            writer.close()
+
+
+@asynccontextmanager
+async def stub_redis_server():
+    server = await StubRedisServer().start()
+    try:
+        yield server
+    finally:
+        await server.stop()
@@ -0,0 +1,25 @@
+import statistics
+import time
+import tracemalloc
+
+
+def measure(fn, repeat=20):
+    """Return (median seconds, peak traced bytes) for ``fn()``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(timings), peak
+
+
+def report(name, seconds, peak_bytes):
+    print(f"{name:<32} {seconds * 1000:10.3f} ms {peak_bytes / 1024 / 1024:10.2f} MiB")
@@ -1,5 +1,5 @@
 import pytest
-from fastapi import Depends
+from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -8,13 +8,76 @@ from app.core.config import app
 from app.core.security import hash_password
 from app.db.base import Base
 from app.db.session import engine
+from app.deps import get_read_user_service, get_user_service, payload_check
 from app.models import User
+from app.services.users import UserService
+from benchmarks.db import sqlite_session_factory
 
 
 @pytest.fixture
 def client():
     return TestClient(app)
 
+
+class RouteClient(TestClient):
+    """TestClient for route tests, with a fresh SQLite database in ``session_factory``.
+
+    ``enter`` opens an async context manager on the client's event loop and
+    closes it with the client; ``call`` runs a coroutine function there.
+    """
+
+    def __enter__(self):
+        super().__enter__()
+        self._contexts = []
+        self.session_factory = self.enter(sqlite_session_factory())
+        return self
+
+    def __exit__(self, *exc_info):
+        for context in reversed(self._contexts):
+            self.portal.call(context.__aexit__, None, None, None)
+        return super().__exit__(*exc_info)
+
+    def enter(self, context):
+        value = self.portal.call(context.__aenter__)
+        self._contexts.append(context)
+        return value
+
+    def call(self, fn, *args):
+        return self.portal.call(fn, *args)
+
+
+@pytest.fixture
+def route_client():
+    """Factory for RouteClients: ``route_client(*routers, sub=..., user_services=...)``.
+
+    ``sub`` is the username payload_check returns (None keeps real token
+    checks); the ``user_services`` dependencies get a UserService on the
+    test database.
+    """
+    clients = []
+
+    def make(*routers, sub="mahdi", user_services=(get_user_service, get_read_user_service)):
+        test_app = FastAPI()
+        for router in routers:
+            test_app.include_router(router)
+        if sub is not None:
+            test_app.dependency_overrides[payload_check] = lambda: {"sub": sub}
+
+        client = RouteClient(test_app).__enter__()
+        clients.append(client)
+
+        async def user_service():
+            async with client.session_factory() as db:
+                yield UserService(db)
+
+        for dependency in user_services:
+            test_app.dependency_overrides[dependency] = user_service
+        return client
+
+    yield make
+    for client in reversed(clients):
+        client.__exit__(None, None, None)
+
 TestingSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -0,0 +1,130 @@
+import asyncio
+
+import orjson
+from sqlalchemy import event
+
+from app.core import security
+from app.core.security import create_access_token, decode_token
+from app.deps import get_current_user
+from app.models import User
+from app.routes import users
+from app.services.auth_cache import ExpiringLRU, PrincipalCache, TokenCache
+from app.services.cache_backend import MemoryBackend
+from app.services.users import UserService
+from benchmarks.db import sqlite_session_factory
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ExpiringLRU(maxsize=2, clock=Clock())
+    cache.put("a", 1, 2000)
+    cache.put("b", 2, 2000)
+    cache.get("a")
+    cache.put("c", 3, 2000)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats["evictions"] == 1
+
+
+def test_token_cache_entries_end_at_exp():
+    clock = Clock()
+    cache = TokenCache(maxsize=10, clock=clock)
+    cache.put_payload("token", {"sub": "mahdi", "exp": 1060})
+
+    assert cache.get("token") == {"sub": "mahdi", "exp": 1060}
+    clock.now = 1060
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_decode_token_skips_verification_on_hit(monkeypatch):
+    calls = []
+    decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: calls.append(1) or decode(*args, **kwargs))
+    monkeypatch.setattr(security, "token_cache", TokenCache(maxsize=10))
+    token = create_access_token({"sub": "mahdi"})
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second
+    assert first["sub"] == "mahdi"
+    assert len(calls) == 1
+
+
+def test_current_user_skips_select_when_cached(monkeypatch):
+    cache = PrincipalCache(MemoryBackend(maxsize=10), User, ttl=30)
+    monkeypatch.setattr("app.deps.principal_cache", cache)
+    selects = []
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            async with session_factory() as db:
+                db.add(User(username="mahdi", email="mahdi@example.com", password="x"))
+                await db.commit()
+
+            event.listen(
+                db.bind.sync_engine, "before_cursor_execute",
+                lambda conn, cursor, sql, *args: sql.startswith("SELECT") and selects.append(sql),
+            )
+            users = []
+            for _ in range(2):
+                async with session_factory() as db:
+                    user = await get_current_user({"sub": "mahdi"}, UserService(db))
+                    user.email = "changed@example.com"
+                    users.append((user.id, user in db))
+
+            cached = await cache.get("mahdi")
+            await cache.invalidate("mahdi")
+            return users, cached, await cache.get("mahdi")
+
+    users, cached, invalidated = asyncio.run(run())
+
+    assert users == [(1, True), (1, True)]
+    assert len(selects) == 1
+    assert cached.email == "mahdi@example.com"
+    assert invalidated is None
+
+
+def test_principal_cache_stores_no_password_hash():
+    backend = MemoryBackend(maxsize=10)
+    cache = PrincipalCache(backend, User, ttl=30)
+
+    async def run():
+        await cache.put_user(User(id=1, username="mahdi", email="mahdi@example.com", password="$2b$12$hash"))
+        return await backend.get("principal:mahdi"), await cache.get("mahdi")
+
+    stored, cached = asyncio.run(run())
+
+    assert orjson.loads(stored) == {"id": 1, "username": "mahdi", "email": "mahdi@example.com"}
+    assert (cached.id, cached.username, cached.email) == (1, "mahdi", "mahdi@example.com")
+
+
+
+def test_cached_principal_is_invalidated_by_patch_and_delete(monkeypatch, route_client):
+    cache = PrincipalCache(MemoryBackend(maxsize=10), User, ttl=30)
+    monkeypatch.setattr("app.deps.principal_cache", cache)
+    monkeypatch.setattr("app.routes.users.principal_cache", cache)
+    client = route_client(users.router)
+
+    async def create_user():
+        async with client.session_factory() as db:
+            await UserService(db).create_user({"username": "mahdi", "email": "mahdi@example.com", "password": "hash"})
+
+    client.call(create_user)
+    assert client.get("/profile").json()["user"]["email"] == "mahdi@example.com"
+    assert client.call(cache.get, "mahdi") is not None
+
+    assert client.patch("/users/patch/", json={"email": "new@example.com"}).status_code == 200
+    assert client.get("/profile").json()["user"]["email"] == "new@example.com"
+
+    assert client.delete("/users/delete/").status_code == 204
+    assert client.get("/profile").status_code == 404
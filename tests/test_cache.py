@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.services.cache import SWRCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_misses_share_one_load():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["chart"]
+
+    async def run():
+        cache = SWRCache(ttl=60)
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(500)))
+        return cache, results
+
+    cache, results = asyncio.run(run())
+
+    assert calls == 1
+    assert all(result == ["chart"] for result in results)
+    assert cache.stats["misses"] == 500
+    assert cache.stats["refreshes"] == 1
+
+
+def test_fresh_entry_is_a_hit():
+    clock = FakeClock()
+
+    async def loader():
+        return clock.now
+
+    async def run():
+        cache = SWRCache(ttl=10, clock=clock)
+        await cache.get_or_load("k", loader)
+        clock.now = 5
+        return cache, await cache.get_or_load("k", loader)
+
+    cache, value = asyncio.run(run())
+
+    assert value == 0
+    assert cache.stats["hits"] == 1
+
+
+def test_stale_entry_served_while_one_refresh_runs():
+    clock = FakeClock()
+    release = None
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return calls
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        cache = SWRCache(ttl=10, stale_ttl=100, clock=clock)
+        await cache.get_or_load("k", loader)
+
+        clock.now = 20
+        stale = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(10)))
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return cache, stale, await cache.get_or_load("k", loader)
+
+    cache, stale, fresh = asyncio.run(run())
+
+    assert stale == [1] * 10
+    assert fresh == 2
+    assert calls == 2
+    assert cache.stats["stale_hits"] == 10
+
+
+def test_failed_background_refresh_keeps_stale_value():
+    clock = FakeClock()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise RuntimeError("upstream down")
+        return "old"
+
+    async def run():
+        cache = SWRCache(ttl=10, stale_ttl=100, clock=clock)
+        await cache.get_or_load("k", loader)
+        clock.now = 20
+        first = await cache.get_or_load("k", loader)
+        await asyncio.sleep(0)
+        errors = cache.stats["errors"]
+        return errors, first, await cache.get_or_load("k", loader)
+
+    errors, first, second = asyncio.run(run())
+
+    assert first == second == "old"
+    assert errors == 1
+
+
+def test_miss_propagates_loader_error():
+    async def loader():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(SWRCache(ttl=10).get_or_load("k", loader))
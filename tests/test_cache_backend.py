@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from app.services.cache import SWRCache
+from app.services.cache_backend import CacheBackendError, MemoryBackend, RedisBackend, make_backend
+from app.services.chart_store import ChartStore
+from app.services.movie import Chart, Movie
+from benchmarks.servers import stub_redis_server
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def chart(*titles):
+    return Chart([Movie(rank, f"tt{rank:07d}", title, 2000, 8.0, 10, None, ("Drama",)) for rank, title in enumerate(titles, 1)])
+
+
+def test_memory_backend_multi_get_set_and_expiry():
+    clock = Clock()
+    backend = MemoryBackend(maxsize=10, clock=clock)
+
+    async def run():
+        await backend.mset({"a": b"1", "b": b"2"}, ttl=5)
+        await backend.set("c", b"3")
+        first = await backend.mget(["a", "b", "c", "missing"])
+        clock.now += 5
+        await backend.invalidate(["c"])
+        return first, await backend.mget(["a", "c"])
+
+    assert asyncio.run(run()) == ([b"1", b"2", b"3", None], [None, None])
+    assert not backend.shared
+
+
+def test_make_backend_picks_by_scheme():
+    assert isinstance(make_backend("memory://", 10), MemoryBackend)
+    redis = make_backend("redis://:s3cret@cache:6380/2", 10)
+    assert (redis.host, redis.port, redis.password, redis.db) == ("cache", 6380, "s3cret", 2)
+    with pytest.raises(ValueError):
+        make_backend("memcached://cache", 10)
+
+
+def test_redis_backend_pipelines_multi_set_and_get():
+    async def run():
+        async with stub_redis_server() as server:
+            backend = RedisBackend(server.url)
+            await backend.mset({"a": b"\x00binary", "b": b"2"}, ttl=30)
+            values = await backend.mget(["a", "b", "missing"])
+            await backend.delete(["a"])
+            after = await backend.get("a")
+            await backend.aclose()
+            return values, after, backend.stats["round_trips"], server.commands
+
+    values, after, round_trips, commands = asyncio.run(run())
+
+    assert values == [b"\x00binary", b"2", None]
+    assert after is None
+    assert round_trips == 4
+    assert commands[:3] == [
+        ("SET", b"imdb:a", b"\x00binary", b"PX", b"30000"),
+        ("SET", b"imdb:b", b"2", b"PX", b"30000"),
+        ("MGET", b"imdb:a", b"imdb:b", b"imdb:missing"),
+    ]
+
+
+def test_redis_backend_reports_unreachable_server():
+    async def run():
+        async with stub_redis_server() as server:
+            url = server.url
+        backend = RedisBackend(url, timeout=0.5)
+        with pytest.raises(CacheBackendError):
+            await backend.get("a")
+        return backend.stats["errors"]
+
+    assert asyncio.run(run()) == 1
+
+
+def test_snapshot_round_trips_with_its_etag():
+    original = chart("Alpha", "Beta")
+
+    restored = Chart.from_bytes(original.to_bytes())
+
+    assert restored.movies == original.movies
+    assert restored.etag("json") == original.etag("json")
+    with pytest.raises(ValueError):
+        Chart.from_bytes(b"XXXX" + original.to_bytes()[4:])
+
+
+def test_workers_share_one_published_chart():
+    loads = []
+
+    async def load_from_db():
+        loads.append(1)
+        return chart("From DB")
+
+    async def run():
+        async with stub_redis_server() as server:
+            workers = [
+                ChartStore(RedisBackend(server.url), SWRCache(ttl=3600), loader=load_from_db)
+                for _ in range(2)
+            ]
+            listener = asyncio.create_task(workers[1].backend.listen(workers[1].on_invalidate))
+            await asyncio.sleep(0.05)
+
+            # The first miss loads from the database; the other worker reads the snapshot.
+            first = [(await worker.get()).movies[0].title for worker in workers]
+
+            await workers[0].publish(chart("Refreshed"))
+            for _ in range(100):
+                if workers[1].stats["invalidations"]:
+                    break
+                await asyncio.sleep(0.01)
+            second = [(await worker.get()).movies[0].title for worker in workers]
+
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            for worker in workers:
+                await worker.backend.aclose()
+            return first, second, (await workers[1].get()).index, workers[1].stats
+
+    first, second, index, stats = asyncio.run(run())
+
+    assert first == ["From DB", "From DB"]
+    assert second == ["Refreshed", "Refreshed"]
+    assert len(loads) == 1
+    assert stats["snapshot_hits"] == 2 and stats["invalidations"] == 1
+    assert index is not None
+
+
+def test_chart_store_falls_back_to_the_loader_when_the_backend_is_down():
+    async def load_from_db():
+        return chart("From DB")
+
+    async def run():
+        async with stub_redis_server() as server:
+            url = server.url
+        store = ChartStore(RedisBackend(url, timeout=0.5), SWRCache(ttl=3600), loader=load_from_db)
+        return (await store.get()).movies[0].title, store.stats["errors"]
+
+    assert asyncio.run(run()) == ("From DB", 2)
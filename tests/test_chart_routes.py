@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import imdb
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.extract_data import extract_250_movies
+from app.services.movie import Chart
+from app.services.titles import TOP_250_CACHE_KEY
+from app.utils.serialization import ndjson_stream
+from benchmarks.pages import build_next_data
+
+
+@pytest.fixture
+def movies():
+    edges = build_next_data(250)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    return extract_250_movies(edges)
+
+
+@pytest.fixture
+def chart_client(movies):
+    app = FastAPI()
+    app.include_router(imdb.router)
+    app.state.chart_store = ChartStore(MemoryBackend(maxsize=10), SWRCache(ttl=3600))
+    app.state.chart_store.cache.set(TOP_250_CACHE_KEY, Chart(movies, datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)))
+    return TestClient(app)
+
+
+def test_top250_json(chart_client, movies):
+    response = chart_client.get("/imdb/top250")
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 250, "results": [movie.to_dict() for movie in movies]}
+
+
+def test_top250_ndjson(chart_client, movies):
+    response = chart_client.get("/imdb/top250", params={"format": "ndjson"})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in response.text.splitlines()] == [movie.to_dict() for movie in movies]
+
+
+def test_top250_revalidates_with_etag(chart_client):
+    first = chart_client.get("/imdb/top250")
+    again = chart_client.get("/imdb/top250", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.headers["last-modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_top250_etag_depends_on_format(chart_client):
+    etag = chart_client.get("/imdb/top250").headers["etag"]
+    response = chart_client.get("/imdb/top250", params={"format": "ndjson"}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_top250_if_modified_since(chart_client):
+    unchanged = chart_client.get("/imdb/top250", headers={"If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"})
+    changed = chart_client.get("/imdb/top250", headers={"If-Modified-Since": "Wed, 01 May 2024 11:59:59 GMT"})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+
+
+def test_ndjson_stream_sends_first_line_alone():
+    async def collect():
+        return [chunk async for chunk in ndjson_stream(range(10), chunk_lines=4)]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks == [b"0\n", b"1\n2\n3\n4\n", b"5\n6\n7\n8\n", b"9\n"]
@@ -0,0 +1,49 @@
+import asyncio
+import tempfile
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.pool import PoolMetrics, TimedQueuePool
+from app.db.session import make_engine
+
+
+def test_asyncpg_engine_sizes_statement_caches():
+    engine = make_engine("postgresql+asyncpg://user@localhost/imdb", echo=False, statement_cache_size=0)
+
+    assert engine.url.query["prepared_statement_cache_size"] == "0"
+    assert isinstance(engine.sync_engine.pool, TimedQueuePool)
+    assert engine.echo is False
+
+
+def test_checkout_waits_are_recorded():
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            engine = make_engine(f"sqlite+aiosqlite:///{directory}/pool.db", pool_size=1, max_overflow=0, pool_timeout=0.05)
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                    with pytest.raises(PoolTimeoutError):
+                        async with engine.connect():
+                            pass
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                return engine.sync_engine.pool.stats()
+            finally:
+                await engine.dispose()
+
+    stats = asyncio.run(run())
+
+    assert stats["size"] == 1
+    assert stats["checkout_wait"]["count"] == 3
+    assert stats["checkout_wait"]["timeouts"] == 1
+    assert stats["checkout_wait"]["max"] >= 0.05
+
+
+def test_pool_metrics_buckets_are_cumulative():
+    metrics = PoolMetrics(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.5):
+        metrics.observe(seconds)
+
+    assert metrics.stats()["buckets"] == {"0.01": 1, "0.1": 2, "+Inf": 3}
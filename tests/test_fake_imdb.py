@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.http_client import HTTPClientPool
+from app.services.proxy_service import ProxyPool
+from app.services.retry import RetryPolicy
+from app.services.scraper_service import IMDBScraper
+from benchmarks.fake_imdb import fake_imdb
+from benchmarks.pages import build_chart_page
+
+
+def scrape(fn, retry=None, **options):
+    async def run():
+        async with fake_imdb(**options) as upstream:
+            pool = HTTPClientPool(http2=False)
+            scraper = IMDBScraper(
+                pool, ProxyPool([]), retry=retry or RetryPolicy(max_attempts=1),
+                url=upstream.chart_url, title_url=upstream.title_url,
+            )
+            try:
+                return await fn(scraper), upstream
+            finally:
+                await pool.aclose()
+
+    return asyncio.run(run())
+
+
+def test_scraper_parses_fake_chart_and_title_pages():
+    async def fetch(scraper):
+        return await scraper.fetch_top_250(), await scraper.fetch_title("tt0000002")
+
+    (movies, details), upstream = scrape(fetch, chart_size=30, padding_kb=64)
+
+    assert len(movies) == 30
+    assert movies[0].imdb_id == "tt0000001"
+    assert details["imdb_id"] == "tt0000002"
+    assert upstream.stats == {"requests": 2, "errors": 0, "not_modified": 0}
+
+
+def test_conditional_refetch_is_not_modified():
+    async def fetch_twice(scraper):
+        return await scraper.fetch_top_250(), await scraper.fetch_top_250()
+
+    (first, second), upstream = scrape(fetch_twice, chart_size=5)
+
+    assert second is first
+    assert upstream.stats["not_modified"] == 1
+
+
+def test_errors_are_injected_at_the_configured_rate():
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        scrape(lambda scraper: scraper.fetch_top_250(), error_rate=1.0, error_status=502)
+
+    assert error.value.response.status_code == 502
+
+    retry = RetryPolicy(max_attempts=10, base_delay=0, max_delay=0)
+    movies, upstream = scrape(lambda scraper: scraper.fetch_top_250(), retry=retry, error_rate=0.5, seed=3)
+
+    assert len(movies) == 250
+    assert upstream.stats["requests"] == upstream.stats["errors"] + 1
+
+
+def test_latency_is_added_to_every_response():
+    start = time.perf_counter()
+    scrape(lambda scraper: scraper.fetch_top_250(), chart_size=1, latency=0.2)
+
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_recorded_pages_are_served_when_present(tmp_path):
+    (tmp_path / "chart_top.html").write_bytes(build_chart_page(count=7, seed=1))
+
+    movies, _ = scrape(lambda scraper: scraper.fetch_top_250(), pages_dir=tmp_path)
+
+    assert len(movies) == 7
@@ -0,0 +1,60 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.auth_middleware import AuthMiddleware
+from app.middleware.time_middleware import ProcessTimeMiddleware
+
+
+def build_app(*middlewares):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(3):
+                yield f"{n}\n".encode()
+        return StreamingResponse(chunks())
+
+    for middleware, kwargs in middlewares:
+        app.add_middleware(middleware, **kwargs)
+    return app
+
+
+def test_process_time_headers():
+    client = TestClient(build_app((ProcessTimeMiddleware, {})))
+
+    response = client.get("/ping")
+
+    assert float(response.headers["x-process-time"]) >= 0
+    assert response.headers["server-timing"].startswith("app;dur=")
+
+
+def test_streaming_responses_pass_through():
+    client = TestClient(build_app((ProcessTimeMiddleware, {}), (AuthMiddleware, {"api_keys": ["key"]})))
+
+    with client.stream("GET", "/stream", headers={"X-API-KEY": "key"}) as response:
+        chunks = list(response.iter_bytes())
+
+    assert b"".join(chunks) == b"0\n1\n2\n"
+    assert "server-timing" in response.headers
+
+
+def test_api_key_must_be_in_the_key_set():
+    client = TestClient(build_app((AuthMiddleware, {"api_keys": ["first", "second"]})))
+
+    assert client.get("/ping").status_code == 401
+    assert client.get("/ping", headers={"X-API-KEY": "wrong"}).json() == {"detail": "Invalid API Key"}
+    assert client.get("/ping", headers={"X-API-KEY": "second"}).status_code == 200
+
+
+def test_is_valid_compares_every_key():
+    middleware = AuthMiddleware(None, api_keys=["a" * 10, "b" * 64])
+
+    assert middleware.is_valid("b" * 64)
+    assert not middleware.is_valid("a" * 9)
+    assert not middleware.is_valid(None)
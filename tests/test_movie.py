@@ -0,0 +1,44 @@
+import pickle
+
+import orjson
+
+from app.services.extract_data import extract_250_movies
+from app.services.movie import GenreTable
+from benchmarks.pages import build_next_data
+
+
+def chart(count=250):
+    edges = build_next_data(count)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    return extract_250_movies(edges)
+
+
+def test_movies_share_genre_tuples():
+    movies = chart(1000)
+    by_genres = {}
+    for movie in movies:
+        by_genres.setdefault(movie.genres, movie.genres)
+
+    assert all(movie.genres is by_genres[movie.genres] for movie in movies)
+
+
+def test_genre_table_interns_names():
+    table = GenreTable()
+    first = table.intern(["Drama", "Crime"])
+    second = table.intern("".join(name) for name in (["Dra", "ma"], ["Cri", "me"]))
+
+    assert first is second
+    assert first[0] is second[0]
+    assert len(table) == 1
+
+
+def test_movie_serializes_like_a_dict():
+    movie = chart(1)[0]
+
+    assert orjson.loads(orjson.dumps(movie)) == movie.to_dict()
+    assert not hasattr(movie, "__dict__")
+
+
+def test_movie_pickles_for_the_process_executor():
+    movies = chart(10)
+
+    assert pickle.loads(pickle.dumps(movies)) == movies
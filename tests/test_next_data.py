@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from app.services.next_data import extract_next_data, find_next_data
+from benchmarks.pages import build_chart_page, build_next_data
+
+
+def test_find_next_data_slices_script_body():
+    page = build_chart_page(count=5, padding_kb=64)
+
+    assert json.loads(find_next_data(page)) == build_next_data(count=5)
+
+
+def test_extract_falls_back_to_parser_for_unusual_markup():
+    payload = json.dumps({"props": {"ok": True}})
+    page = f"<html><body><script type='application/json' id='__NEXT_DATA__'>{payload}</script></body></html>"
+
+    assert find_next_data(page.encode()) is None
+    assert extract_next_data(page.encode()) == {"props": {"ok": True}}
+
+
+def test_extract_raises_when_payload_missing():
+    with pytest.raises(RuntimeError):
+        extract_next_data(b"<html><body>No data</body></html>")
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.services.parse_executor import ParseExecutor
+from app.services.scraper_service import parse_top_250
+from benchmarks.pages import build_chart_page
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_executor_parses_raw_bytes(mode):
+    page = build_chart_page(count=250)
+    executor = ParseExecutor(mode, max_workers=1)
+
+    async def run():
+        return await executor.run(parse_top_250, page)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert len(results) == 250
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["recent"][0]["task"] == "parse_top_250"
+
+
+def test_thread_mode_keeps_event_loop_responsive():
+    page = build_chart_page(count=250, padding_kb=512)
+    executor = ParseExecutor("thread", max_workers=2)
+    ticks = 0
+
+    async def ticker(done):
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def run():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        await asyncio.gather(*(executor.run(parse_top_250, page) for _ in range(4)))
+        done.set()
+        await task
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert ticks > 1
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        ParseExecutor("gpu")
@@ -0,0 +1,183 @@
+import asyncio
+import random
+
+import httpx
+
+from app.services.http_client import HTTPClientPool
+from app.services.proxy_service import CLOSED, HALF_OPEN, OPEN, ProxyPool
+from app.services.scraper_service import IMDBScraper
+from benchmarks.pages import build_chart_page
+from benchmarks.servers import StubHTTPServer, stub_server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def fail(pool, state):
+    try:
+        async with pool.track(state):
+            raise httpx.ConnectError("refused")
+    except httpx.ConnectError:
+        pass
+
+
+def test_failing_proxy_is_ejected_then_probed_after_cooldown():
+    clock = FakeClock()
+    pool = ProxyPool(["http://a", "http://b"], failure_threshold=2, cooldown=10, clock=clock)
+    bad = pool.states[0]
+
+    async def run():
+        await fail(pool, bad)
+        await fail(pool, bad)
+        assert bad.circuit == OPEN
+        assert all(pool.select().url == "http://b" for _ in range(20))
+
+        clock.now = 11
+        probe = pool.select(exclude={"http://b"})
+        assert probe is bad
+        await fail(pool, probe)
+        assert bad.circuit == OPEN
+        assert bad.open_until == 21
+
+        clock.now = 22
+        async with pool.track(pool.select(exclude={"http://b"})) as state:
+            assert state.circuit == HALF_OPEN
+        assert bad.circuit == CLOSED
+
+    asyncio.run(run())
+
+
+def test_cooled_down_proxy_gets_a_single_concurrent_probe():
+    clock = FakeClock()
+    pool = ProxyPool(["http://a", "http://b"], failure_threshold=1, cooldown=10, clock=clock, rng=random.Random(0))
+    bad = pool.states[0]
+    picked = []
+
+    async def request():
+        state = pool.select()
+        picked.append(state.url)
+        # Callers await (the rate limiter, say) between select() and track().
+        await asyncio.sleep(0)
+        async with pool.track(state):
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await fail(pool, bad)
+        # Slow enough that the recovered proxy scores better for every caller.
+        pool.record_success(pool.states[1], 20.0)
+        clock.now = 11
+        await asyncio.gather(*(request() for _ in range(20)))
+
+    asyncio.run(run())
+
+    assert picked.count("http://a") == 1
+    assert bad.circuit == CLOSED
+
+
+def test_unsent_probe_is_released():
+    clock = FakeClock()
+    pool = ProxyPool(["http://a", "http://b"], failure_threshold=1, cooldown=10, clock=clock)
+    bad = pool.states[0]
+    asyncio.run(fail(pool, bad))
+    clock.now = 11
+
+    assert pool.select(exclude={"http://b"}) is bad
+    assert bad.circuit == HALF_OPEN
+    assert all(pool.select() is pool.states[1] for _ in range(20))
+
+    pool.release(bad)
+    assert bad.circuit == OPEN
+    assert pool.select(exclude={"http://b"}) is bad
+
+
+def test_selection_prefers_fast_and_idle_proxies():
+    pool = ProxyPool(["http://fast", "http://slow"], rng=random.Random(0))
+    fast, slow = pool.states
+    pool.record_success(fast, 0.05)
+    pool.record_success(slow, 2.0)
+
+    assert all(pool.select() is fast for _ in range(20))
+
+    fast.in_flight = 100
+    assert pool.select() is slow
+
+
+def test_all_ejected_fails_open_on_earliest_recovery():
+    clock = FakeClock()
+    pool = ProxyPool(["http://a", "http://b"], failure_threshold=1, cooldown=10, clock=clock)
+
+    async def run():
+        await fail(pool, pool.states[0])
+        clock.now = 1
+        await fail(pool, pool.states[1])
+
+    asyncio.run(run())
+
+    assert pool.select() is pool.states[0]
+
+
+def test_scraper_routes_through_healthy_proxies():
+    page = build_chart_page(count=5)
+
+    async def run():
+        dead = await StubHTTPServer(lambda *args: (200, {}, b"")).start()
+        dead_url = dead.url
+        await dead.stop()
+
+        handler = lambda method, target, headers: (200, {}, page)
+        async with stub_server(handler) as first, stub_server(handler) as second:
+            urls = [first.url, second.url, dead_url]
+            clients = HTTPClientPool(proxies=urls, http2=False)
+            proxies = ProxyPool(urls, failure_threshold=2, cooldown=60)
+            scraper = IMDBScraper(clients, proxies, url="http://imdb.test/chart/top")
+
+            outcomes = []
+            for _ in range(30):
+                try:
+                    outcomes.append(await scraper.fetch_top_250())
+                except httpx.ConnectError as exc:
+                    outcomes.append(exc)
+            await clients.aclose()
+            return first, second, proxies, outcomes
+
+    first, second, proxies, outcomes = asyncio.run(run())
+
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    assert len(failures) == proxies.states[2].errors <= 2
+    assert len(first.requests) + len(second.requests) == 30 - len(failures)
+    assert first.requests[0][1] == "http://imdb.test/chart/top"
+
+
+def test_client_errors_do_not_count_against_the_proxy():
+    def handler(method, target, headers):
+        return (503, {}, b"busy") if "tt9999999" in target else (404, {}, b"not found")
+
+    async def run():
+        async with stub_server(handler) as server:
+            clients = HTTPClientPool(http2=False)
+            proxies = ProxyPool([], failure_threshold=3)
+            scraper = IMDBScraper(clients, proxies, title_url=f"{server.url}/title/{{imdb_id}}/")
+            statuses = []
+            for imdb_id in ["tt0000001"] * 6 + ["tt9999999"] * 3:
+                try:
+                    await scraper.fetch_title(imdb_id)
+                except httpx.HTTPStatusError as exc:
+                    statuses.append(exc.response.status_code)
+                if len(statuses) == 6:
+                    after_404s = proxies.states[0].as_dict()
+            await clients.aclose()
+            return statuses, after_404s, proxies.states[0]
+
+    statuses, after_404s, state = asyncio.run(run())
+
+    assert statuses == [404] * 6 + [503] * 3
+    assert after_404s["circuit"] == CLOSED
+    assert after_404s["errors"] == 0
+    assert after_404s["error_rate"] == 0
+    assert state.circuit == OPEN
+    assert state.errors == 3
@@ -0,0 +1,78 @@
+import asyncio
+
+from app.utils.rate_limiter import TokenBucket, UpstreamRateLimiter
+
+
+class FakeTime:
+    """Clock whose sleep() advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+
+
+def test_bucket_allows_burst_then_paces():
+    clock = FakeTime()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock.clock)
+
+    delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays == [0, 0, 0, 0.5, 1.0]
+
+
+def test_limiter_bounds_throughput_without_real_sleeps():
+    fake = FakeTime()
+    limiter = UpstreamRateLimiter(host_rate=5, host_burst=1, clock=fake.clock, sleep=fake.sleep)
+    started = []
+
+    async def request():
+        await limiter.acquire("www.imdb.com")
+        started.append(fake.now)
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(51)))
+
+    asyncio.run(run())
+
+    # 1 token up front, then one every 1/5 s.
+    assert max(started) == 10
+    assert len(started) == 51
+
+
+def test_rate_is_split_across_workers():
+    limiter = UpstreamRateLimiter(host_rate=4, proxy_rate=2, workers=4)
+
+    assert limiter.host_rate == 1
+    assert limiter.proxy_rate == 0.5
+
+
+def test_proxy_and_host_buckets_are_separate():
+    fake = FakeTime()
+    limiter = UpstreamRateLimiter(host_rate=10, host_burst=10, proxy_rate=1, proxy_burst=1, clock=fake.clock)
+
+    assert limiter.try_acquire("www.imdb.com", "http://proxy-a")
+    assert not limiter.try_acquire("www.imdb.com", "http://proxy-a")
+    assert limiter.try_acquire("www.imdb.com", "http://proxy-b")
+    assert limiter.try_acquire("m.imdb.com")
+
+
+def test_cancelled_wait_returns_token():
+    fake = FakeTime()
+    limiter = UpstreamRateLimiter(host_rate=1, clock=fake.clock)
+
+    async def run():
+        await limiter.acquire("www.imdb.com")
+        waiter = asyncio.create_task(limiter.acquire("www.imdb.com"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(run())
+    fake.now = 1
+
+    assert limiter.try_acquire("www.imdb.com")
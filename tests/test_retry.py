@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+from app.services.http_client import HTTPClientPool
+from app.services.proxy_service import ProxyPool
+from app.services.retry import RetryPolicy
+from app.services.scraper_service import IMDBScraper
+from benchmarks.pages import build_chart_page
+from benchmarks.servers import stub_server
+
+PAGE = build_chart_page(count=5)
+
+
+class MaxJitter:
+    def uniform(self, low, high):
+        return high
+
+
+def flaky(failures, status=503):
+    calls = 0
+
+    def handler(method, target, headers):
+        nonlocal calls
+        calls += 1
+        if calls <= failures:
+            return status, {}, b"unavailable"
+        return 200, {}, PAGE
+
+    return handler
+
+
+async def scrape(server, retry, proxies=None, urls=()):
+    clients = HTTPClientPool(proxies=list(urls), http2=False)
+    scraper = IMDBScraper(clients, proxies or ProxyPool(list(urls)), retry=retry, url=f"{server.url}/chart/top")
+    try:
+        return await scraper.fetch_top_250()
+    finally:
+        await clients.aclose()
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=5, rng=random.Random(0))
+
+    delays = [policy.backoff(attempt) for attempt in range(10)]
+
+    assert all(0 <= delay <= 5 for delay in delays)
+    assert len(set(delays)) == 10
+
+
+def test_retries_retryable_status_until_success():
+    async def run():
+        async with stub_server(flaky(2)) as server:
+            results = await scrape(server, RetryPolicy(max_attempts=3, base_delay=0.01))
+            return server, results
+
+    server, results = asyncio.run(run())
+
+    assert len(results) == 5
+    assert len(server.requests) == 3
+
+
+def test_non_retryable_status_fails_fast():
+    async def run():
+        async with stub_server(flaky(5, status=404)) as server:
+            with pytest.raises(httpx.HTTPStatusError):
+                await scrape(server, RetryPolicy(max_attempts=3, base_delay=0.01))
+            return server
+
+    assert len(asyncio.run(run()).requests) == 1
+
+
+def test_deadline_stops_retrying():
+    async def run():
+        async with stub_server(flaky(100)) as server:
+            with pytest.raises(httpx.HTTPStatusError):
+                policy = RetryPolicy(max_attempts=100, base_delay=0.2, max_delay=0.2, deadline=0.3, rng=MaxJitter())
+                await scrape(server, policy)
+            return server
+
+    # Attempts at 0 s and 0.2 s; the next one would start after the deadline.
+    assert len(asyncio.run(run()).requests) == 2
+
+
+def test_slow_attempt_is_hedged_through_another_proxy():
+    async def slow(method, target, headers):
+        await asyncio.sleep(1)
+        return 200, {}, PAGE
+
+    fast = lambda method, target, headers: (200, {}, PAGE)
+
+    async def run():
+        async with stub_server(fast) as origin, stub_server(slow) as slow_proxy, stub_server(fast) as fast_proxy:
+            urls = [slow_proxy.url, fast_proxy.url]
+            proxies = ProxyPool(urls, rng=random.Random(0))
+            proxies.latencies.extend([0.02] * 20)
+            proxies.states[0].latency = 0.01  # looks fastest, so it is picked first
+            policy = RetryPolicy(max_attempts=1, hedge=True)
+
+            start = time.perf_counter()
+            results = await scrape(origin, policy, proxies, urls)
+            return time.perf_counter() - start, results, slow_proxy, fast_proxy, proxies
+
+    elapsed, results, slow_proxy, fast_proxy, proxies = asyncio.run(run())
+
+    assert len(results) == 5
+    assert elapsed < 0.5
+    assert len(slow_proxy.requests) == len(fast_proxy.requests) == 1
+    assert proxies.states[0].in_flight == 0
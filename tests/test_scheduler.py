@@ -0,0 +1,102 @@
+import asyncio
+from dataclasses import replace
+
+from sqlalchemy import select
+
+from app.models import ChartRankChange
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.extract_data import extract_250_movies
+from app.services.scheduler import ChartRefresher, acquire_lease
+from app.services.titles import TOP_250_CACHE_KEY, TitleService
+from benchmarks.db import sqlite_session_factory
+from benchmarks.pages import build_next_data
+
+
+def chart(count=250):
+    edges = build_next_data(count)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    return extract_250_movies(edges)
+
+
+class FakeScraper:
+    def __init__(self, *charts):
+        self.charts = list(charts)
+        self.calls = 0
+
+    async def fetch_top_250(self):
+        self.calls += 1
+        return self.charts.pop(0)
+
+
+def test_lease_is_exclusive_until_it_expires():
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            async with session_factory() as db:
+                first = await acquire_lease(db, "job", "worker-1", ttl=60)
+                renewed = await acquire_lease(db, "job", "worker-1", ttl=60)
+                other = await acquire_lease(db, "job", "worker-2", ttl=60)
+                await acquire_lease(db, "job", "worker-1", ttl=-1)
+                takeover = await acquire_lease(db, "job", "worker-2", ttl=60)
+                return first, renewed, other, takeover
+
+    assert asyncio.run(run()) == (True, True, False, True)
+
+
+def test_only_lease_holder_scrapes():
+    scraper = FakeScraper(chart(10), chart(10))
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            workers = [
+                ChartRefresher(scraper, session_factory, interval=60, owner=f"worker-{n}")
+                for n in range(3)
+            ]
+            return [await worker.refresh_once() for worker in workers]
+
+    results = asyncio.run(run())
+
+    assert scraper.calls == 1
+    assert results[1:] == [None, None]
+
+
+def test_refresh_writes_only_changes_and_records_rank_moves():
+    first = chart(10)
+    second = list(first)
+    second[0], second[1] = replace(first[1], rank=1), replace(first[0], rank=2)
+    second[5] = replace(first[5], rating_count=first[5].rating_count + 1000)
+    scraper = FakeScraper(first, second)
+    cache = SWRCache(ttl=60)
+    store = ChartStore(MemoryBackend(maxsize=10), cache)
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            refresher = ChartRefresher(scraper, session_factory, interval=60, store=store, owner="worker")
+            initial = await refresher.refresh_once()
+            update = await refresher.refresh_once()
+            async with session_factory() as db:
+                history = (await db.execute(select(ChartRankChange))).scalars().all()
+                stored = await TitleService(db).get_chart()
+            return initial, update, history, stored
+
+    initial, update, history, stored = asyncio.run(run())
+
+    assert initial == {"titles": 10, "genres": 10, "ranks": 10}
+    assert update == {"titles": 1, "genres": 0, "ranks": 2}
+    assert len(history) == 12
+    assert [movie.imdb_id for movie in stored[:2]] == [first[1].imdb_id, first[0].imdb_id]
+    assert stored[5].rating_count == second[5].rating_count
+    assert cache._entries[TOP_250_CACHE_KEY].value.movies == stored
+
+
+def test_refresh_skips_chart_unchanged_upstream():
+    movies = chart(10)
+    scraper = FakeScraper(movies, movies)
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            refresher = ChartRefresher(scraper, session_factory, interval=60, owner="worker")
+            await refresher.refresh_once()
+            return await refresher.refresh_once()
+
+    assert asyncio.run(run()) == {"titles": 0, "genres": 0, "ranks": 0}
@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+
+from app.services.http_client import HTTPClientPool
+from app.services.proxy_service import ProxyPool
+from app.services.scraper_service import IMDBScraper
+from benchmarks.pages import build_chart_page
+
+
+def make_pool(handler):
+    return HTTPClientPool(transport=httpx.MockTransport(handler), http2=False)
+
+
+def test_fetch_top_250_parses_chart():
+    page = build_chart_page(count=250)
+    pool = make_pool(lambda request: httpx.Response(200, content=page))
+
+    async def run():
+        try:
+            return await IMDBScraper(pool, ProxyPool([])).fetch_top_250()
+        finally:
+            await pool.aclose()
+
+    results = asyncio.run(run())
+
+    assert len(results) == 250
+    assert results[0].rank == 1
+    assert results[0].imdb_id == "tt0000001"
+
+
+def test_scraper_reuses_shared_client():
+    page = build_chart_page(count=3)
+    pool = make_pool(lambda request: httpx.Response(200, content=page))
+    client = pool.get()
+
+    async def run():
+        scraper = IMDBScraper(pool, ProxyPool([]))
+        await scraper.fetch_top_250()
+        await scraper.fetch_top_250()
+        assert not client.is_closed
+        await pool.aclose()
+
+    asyncio.run(run())
+
+    assert client.is_closed
+
+
+def test_pool_stats_report_every_client():
+    pool = HTTPClientPool(proxies=["http://127.0.0.1:9"])
+    stats = pool.stats()
+    asyncio.run(pool.aclose())
+
+    assert set(stats) == {"direct", "http://127.0.0.1:9"}
+    assert stats["direct"] == {"in_use": 0, "idle": 0, "waiting": 0}
+
+
+
+def test_fetch_top_250_revalidates_with_imdb_validators():
+    page = build_chart_page(count=3)
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=page, headers={"ETag": '"v1"'})
+
+    pool = make_pool(handler)
+
+    async def run():
+        scraper = IMDBScraper(pool, ProxyPool([]))
+        try:
+            return await scraper.fetch_top_250(), await scraper.fetch_top_250(), scraper
+        finally:
+            await pool.aclose()
+
+    first, second, scraper = asyncio.run(run())
+
+    assert seen == [None, '"v1"']
+    assert second is first
+    assert scraper.not_modified == 1
@@ -0,0 +1,130 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import imdb
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.movie import Chart, Movie
+from app.services.search import SearchIndex, chart_index
+from app.services.titles import TOP_250_CACHE_KEY, TitleService
+from benchmarks.db import sqlite_session
+
+
+def movie(rank, title, year, rating, genres):
+    return Movie(rank, f"tt{rank:07d}", title, year, rating, 1000, None, tuple(genres))
+
+
+MOVIES = [
+    movie(1, "The Shawshank Redemption", 1994, 9.3, ["Drama"]),
+    movie(2, "The Godfather", 1972, 9.2, ["Crime", "Drama"]),
+    movie(3, "The Dark Knight", 2008, 9.0, ["Action", "Crime", "Drama"]),
+    movie(4, "The Godfather Part II", 1974, 9.0, ["Crime", "Drama"]),
+    movie(5, "12 Angry Men", 1957, 9.0, ["Crime", "Drama"]),
+    movie(6, "Spirited Away", 2001, 8.6, ["Animation", "Adventure"]),
+    movie(7, "Godzilla Minus One", 2023, 7.7, ["Action", "Drama"]),
+    movie(8, "Unknown", None, None, []),
+]
+
+
+def ranks(result):
+    return [movie.rank for movie in result[1]]
+
+
+def test_prefix_query_ranks_exact_tokens_first():
+    index = SearchIndex(MOVIES)
+
+    assert ranks(index.search("god")) == [2, 4, 7]
+    assert ranks(index.search("godzilla")) == [7]
+    # "the god" needs both tokens; exact "the" and "god..." prefix.
+    assert ranks(index.search("the god")) == [2, 4]
+    assert ranks(index.search("dark the")) == [3]
+    assert index.search("nothing")[0] == 0
+
+
+def test_substring_query():
+    index = SearchIndex(MOVIES)
+
+    assert ranks(index.search("odfat", mode="substring")) == [2, 4]
+    # Titles starting with the query rank first.
+    assert ranks(index.search("the", mode="substring")) == [1, 2, 3, 4]
+    assert ranks(index.search("ir", mode="substring")) == [6]
+
+
+def test_filters_combine():
+    index = SearchIndex(MOVIES)
+
+    assert ranks(index.search(genres=["crime", "Drama"])) == [2, 3, 4, 5]
+    assert ranks(index.search(year_min=1970, year_max=1999)) == [1, 2, 4]
+    assert ranks(index.search(year_min=2000)) == [3, 6, 7]
+    assert ranks(index.search(year_max=1960)) == [5]
+    assert ranks(index.search(year_max=1900)) == []
+    assert ranks(index.search(year_min=2030)) == []
+    assert ranks(index.search(rating_min=9.0)) == [1, 2, 3, 4, 5]
+    assert ranks(index.search(rating_min=9.5)) == []
+    assert ranks(index.search("god", genres=["Crime"], year_min=1973)) == [4]
+    assert index.search(genres=["Western"]) == (0, [])
+
+
+def test_sort_and_pagination():
+    index = SearchIndex(MOVIES)
+
+    assert index.search()[0] == 8
+    assert ranks(index.search(offset=2, limit=3)) == [3, 4, 5]
+    assert ranks(index.search(sort="year", limit=3)) == [7, 3, 6]
+    assert ranks(index.search(sort="rating", genres=["Action"])) == [3, 7]
+    assert ranks(index.search("the", sort="year")) == [3, 1, 4, 2]
+
+    total, page = index.search("the", offset=3, limit=2)
+    assert total == 4 and [movie.rank for movie in page] == [4]
+
+
+def test_index_spans_many_bytes():
+    movies = [movie(rank, f"Title {rank}", 1900 + rank % 100, rank % 10, ["Drama"] if rank % 3 else []) for rank in range(1, 2001)]
+    index = SearchIndex(movies)
+
+    total, page = index.search(genres=["Drama"], offset=1000, limit=5)
+    expected = [m.rank for m in movies if m.genres]
+    assert total == len(expected)
+    assert [m.rank for m in page] == expected[1000:1005]
+
+
+def test_chart_index_is_built_once_per_chart():
+    chart = Chart(MOVIES)
+
+    assert chart_index(chart) is chart_index(chart)
+    assert chart_index(Chart(MOVIES)) is not chart.index
+
+
+def test_search_route():
+    app = FastAPI()
+    app.include_router(imdb.router)
+    app.state.chart_store = ChartStore(MemoryBackend(maxsize=10), SWRCache(ttl=3600))
+    app.state.chart_store.cache.set(TOP_250_CACHE_KEY, Chart(MOVIES))
+    client = TestClient(app)
+
+    response = client.get("/imdb/search", params={"q": "god", "genre": ["Crime"], "limit": 1})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["total"] == 2 and body["limit"] == 1 and body["offset"] == 0
+    assert body["results"] == [MOVIES[1].to_dict()]
+    assert client.get("/imdb/search", params={"limit": 1000}).status_code == 422
+    assert client.get("/imdb/search", params={"sort": "title"}).status_code == 422
+
+
+def test_load_chart_rebuilds_index():
+    movies = [movie(rank, f"Title {rank}", 2000, 8.0, ["Drama"]) for rank in range(1, 4)]
+
+    async def run():
+        async with sqlite_session() as db:
+            service = TitleService(db)
+            await service.apply_chart_diff(movies)
+            return await service.load_chart()
+
+    loaded = asyncio.run(run())
+
+    assert loaded.index is not None
+    assert ranks(loaded.index.search("title 2")) == [2]
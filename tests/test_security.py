@@ -0,0 +1,80 @@
+import asyncio
+
+from passlib.context import CryptContext
+
+from app.core.security import PasswordHasher
+from app.services.exceptions import PasswordHasherBusyException
+
+fast_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(workers=2, max_pending=4, context=fast_context)
+
+    async def run():
+        hashed = await hasher.hash("s3cret")
+        return await hasher.verify("s3cret", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        assert asyncio.run(run()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+
+def test_hashing_does_not_block_the_event_loop():
+    hasher = PasswordHasher(workers=2, max_pending=8, context=CryptContext(schemes=["bcrypt"], bcrypt__rounds=10))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(loop.time())
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(hasher.hash("s3cret") for _ in range(4)))
+        task.cancel()
+        return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    try:
+        assert asyncio.run(run()) < 0.05
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_when_too_many_are_pending():
+    hasher = PasswordHasher(workers=1, max_pending=2, context=fast_context)
+
+    async def run():
+        return await asyncio.gather(*(hasher.hash("s3cret") for _ in range(3)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], PasswordHasherBusyException)
+    assert errors[0].status_code == 429
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.pending == 0
+
+
+def test_hash_many_keeps_order_and_counts_as_one_pending():
+    hasher = PasswordHasher(workers=2, max_pending=1, context=fast_context)
+
+    async def run():
+        task = asyncio.create_task(hasher.hash_many([f"pw{n}" for n in range(6)]))
+        await asyncio.sleep(0)
+        pending = hasher.pending
+        return pending, await task
+
+    try:
+        pending, hashes = asyncio.run(run())
+        assert pending == 1
+        assert [fast_context.verify(f"pw{n}", hashed) for n, hashed in enumerate(hashes)] == [True] * 6
+    finally:
+        hasher.shutdown()
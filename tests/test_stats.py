@@ -0,0 +1,97 @@
+import math
+import statistics
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import imdb
+from app.services.cache import SWRCache
+from app.services.cache_backend import MemoryBackend
+from app.services.chart_store import ChartStore
+from app.services.extract_data import extract_250_movies
+from app.services.movie import Chart, Movie
+from app.services.stats import chart_stats, compute_stats
+from app.services.titles import TOP_250_CACHE_KEY
+from benchmarks.pages import build_next_data
+
+
+@pytest.fixture
+def movies():
+    edges = build_next_data(250)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    return extract_250_movies(edges)
+
+
+def test_genre_stats_match_python(movies):
+    stats = compute_stats(movies)
+
+    for genre in stats["genres"]:
+        ratings = [m.rating for m in movies if genre["genre"] in m.genres]
+        votes = [m.rating_count for m in movies if genre["genre"] in m.genres]
+        assert genre["count"] == len(ratings)
+        assert genre["mean_rating"] == pytest.approx(statistics.mean(ratings))
+        assert genre["median_rating"] == pytest.approx(statistics.median(ratings))
+        assert genre["vote_weighted_rating"] == pytest.approx(
+            sum(r * v for r, v in zip(ratings, votes)) / sum(votes)
+        )
+
+    counts = [genre["count"] for genre in stats["genres"]]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_overall_and_decade_stats_match_python(movies):
+    stats = compute_stats(movies)
+    ratings = [m.rating for m in movies]
+
+    assert stats["count"] == stats["rated"] == 250
+    assert stats["rating"]["mean"] == pytest.approx(statistics.mean(ratings))
+    assert stats["rating"]["median"] == pytest.approx(statistics.median(ratings))
+    assert stats["correlation"]["rating_votes"] == pytest.approx(
+        statistics.correlation(ratings, [m.rating_count for m in movies])
+    )
+
+    for decade in stats["decades"]:
+        in_decade = [m.rating for m in movies if m.year // 10 * 10 == decade["decade"]]
+        assert decade["count"] == len(in_decade) == sum(decade["rating_histogram"])
+        assert decade["mean_rating"] == pytest.approx(statistics.mean(in_decade))
+        assert decade["rating_histogram"] == [
+            sum(1 for r in in_decade if min(math.floor(r), 9) == b) for b in range(10)
+        ]
+
+
+def test_missing_values_are_left_out():
+    movies = [
+        Movie(1, "tt0000001", "A", 1994, 9.0, 100, None, ("Drama",)),
+        Movie(2, "tt0000002", "B", None, 10.0, 300, None, ("Drama", "War")),
+        Movie(3, "tt0000003", "C", 2001, None, None, None, ("War",)),
+    ]
+    stats = compute_stats(movies)
+
+    assert stats["rated"] == 2
+    assert stats["rating"]["vote_weighted"] == pytest.approx(9.75)
+    assert stats["genres"] == [
+        {"genre": "Drama", "count": 2, "mean_rating": 9.5, "median_rating": 9.5, "vote_weighted_rating": 9.75},
+        {"genre": "War", "count": 2, "mean_rating": 10.0, "median_rating": 10.0, "vote_weighted_rating": 10.0},
+    ]
+    assert stats["decades"] == [
+        {"decade": 1990, "count": 1, "mean_rating": 9.0, "rating_histogram": [0] * 9 + [1]}
+    ]
+
+
+def test_empty_chart():
+    stats = compute_stats([])
+
+    assert stats["rating"] == {"mean": None, "median": None, "vote_weighted": None}
+    assert stats["genres"] == stats["decades"] == []
+
+
+def test_stats_route_serves_precomputed_stats(movies):
+    chart = Chart(movies)
+    chart.stats = {"precomputed": True}
+    app = FastAPI()
+    app.include_router(imdb.router)
+    app.state.chart_store = ChartStore(MemoryBackend(maxsize=10), SWRCache(ttl=3600))
+    app.state.chart_store.cache.set(TOP_250_CACHE_KEY, chart)
+
+    assert TestClient(app).get("/imdb/stats").json() == {"precomputed": True}
+    assert chart_stats(Chart(movies))["count"] == 250
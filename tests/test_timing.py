@@ -0,0 +1,116 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.time_middleware import ProcessTimeMiddleware
+from app.routes import metrics
+from app.services.http_client import HTTPClientPool
+from app.services.parse_executor import ParseExecutor
+from app.services.proxy_service import ProxyPool
+from app.services.scraper_service import IMDBScraper
+from app.utils import timing
+from app.utils.timing import Histogram, Registry, collect_spans, render_histogram, replay, span
+from benchmarks.pages import build_chart_page
+from benchmarks.servers import stub_server
+
+
+def test_span_records_into_request_and_histogram(monkeypatch):
+    monkeypatch.setattr(timing, "registry", Registry())
+    spans = []
+    token = timing.request_spans.set(spans)
+    try:
+        with span("work"):
+            pass
+    finally:
+        timing.request_spans.reset(token)
+
+    assert [name for name, _ in spans] == ["work"]
+    assert timing.registry.histograms[(timing.PHASE_METRIC, (("phase", "work"),))].count == 1
+
+
+def test_disabled_spans_are_shared_noops(monkeypatch):
+    monkeypatch.setattr(timing, "enabled", False)
+    monkeypatch.setattr(timing, "registry", Registry())
+
+    with span("work") as first, span("other") as second:
+        pass
+
+    assert first is second is timing.NOOP_SPAN
+    assert timing.registry.histograms == {}
+
+
+def test_collected_spans_are_replayed_by_the_caller(monkeypatch):
+    monkeypatch.setattr(timing, "registry", Registry())
+
+    def work():
+        with span("parse.json"):
+            return 42
+
+    result, spans = collect_spans(work)
+
+    assert result == 42
+    assert timing.registry.histograms == {}
+    replay(spans)
+    assert len(timing.registry.histograms) == 1
+
+
+def test_render_histogram_in_prometheus_format():
+    histogram = Histogram(buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    assert render_histogram("latency_seconds", {"phase": 'a"b'}, histogram) == [
+        'latency_seconds_bucket{phase="a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{phase="a\\"b",le="1"} 2',
+        'latency_seconds_bucket{phase="a\\"b",le="+Inf"} 2',
+        'latency_seconds_sum{phase="a\\"b"} 0.55',
+        'latency_seconds_count{phase="a\\"b"} 2',
+    ]
+
+
+def test_server_timing_and_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(timing, "registry", Registry())
+    app = FastAPI()
+    app.include_router(metrics.router)
+    app.add_middleware(ProcessTimeMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        with span("db.lookup"):
+            await asyncio.sleep(0)
+        return {"id": item_id}
+
+    client = TestClient(app)
+    header = client.get("/items/1").headers["server-timing"]
+    body = client.get("/metrics").text
+
+    assert header.startswith("db.lookup;dur=")
+    assert ", app;dur=" in header
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 1' in body
+    assert 'imdb_phase_duration_seconds_count{phase="db.lookup"} 1' in body
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
+
+
+def test_scraper_records_pipeline_phases(monkeypatch):
+    monkeypatch.setattr(timing, "registry", Registry())
+    page = build_chart_page(count=10)
+
+    async def run():
+        spans = []
+        timing.request_spans.set(spans)
+        async with stub_server(lambda method, target, headers: (200, {}, page)) as server:
+            clients = HTTPClientPool(http2=False)
+            scraper = IMDBScraper(clients, ProxyPool([]), executor=ParseExecutor("inline"), url=f"{server.url}/chart/top")
+            try:
+                await scraper.fetch_top_250()
+            finally:
+                await clients.aclose()
+        return {name for name, _ in spans}
+
+    phases = asyncio.run(run())
+
+    assert {
+        "proxy_select", "upstream", "upstream.connect", "upstream.wait", "upstream.download",
+        "parse.scan", "parse.json", "parse.extract", "parse.queue",
+    } <= phases
@@ -0,0 +1,139 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from pydantic import ValidationError
+
+from app.deps import get_title_details
+from app.routes import imdb
+
+from app.schemas.titles import TitleBatchRequest
+from app.services.extract_data import extract_title_details
+from app.services.http_client import HTTPClientPool
+from app.services.retry import RetryPolicy
+from app.services.scraper_service import IMDBScraper
+from app.services.title_details import TitleDetailsService
+from benchmarks.db import sqlite_session_factory
+from benchmarks.pages import build_title_data, build_title_page
+from benchmarks.servers import stub_server
+
+
+def test_extract_title_details():
+    details = extract_title_details(build_title_data("tt0111161"))
+
+    assert details["imdb_id"] == "tt0111161"
+    assert details["runtime_minutes"] > 0
+    assert details["certificate"] in {"G", "PG", "PG-13", "R"}
+    assert details["cast"][0] == {"name": "Actor 0", "characters": ["Role 0"]}
+    assert details["box_office"]["budget"] == {"amount": 25_000_000, "currency": "USD"}
+    assert len(details["genres"]) == 2
+
+
+def fake_imdb(delay=0.0, missing=()):
+    in_flight = 0
+    peak = 0
+
+    async def handler(method, target, headers):
+        nonlocal in_flight, peak
+        imdb_id = target.strip("/").split("/")[-1]
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(delay)
+        in_flight -= 1
+        if imdb_id in missing:
+            return 404, {}, b"not found"
+        return 200, {}, build_title_page(imdb_id)
+
+    return handler, lambda: peak
+
+
+async def details_service(server, session_factory, **kwargs):
+    clients = HTTPClientPool(http2=False)
+    scraper = IMDBScraper(clients, title_url=f"{server.url}/title/{{imdb_id}}/", retry=RetryPolicy(max_attempts=1))
+    return clients, TitleDetailsService(scraper, session_factory, max_age=3600, **kwargs)
+
+
+def test_get_reuses_fresh_stored_details():
+    handler, _ = fake_imdb()
+
+    async def run():
+        async with sqlite_session_factory() as session_factory, stub_server(handler) as server:
+            clients, service = await details_service(server, session_factory)
+            first = await service.get("tt0000001")
+            second = await service.get("tt0000001")
+            await clients.aclose()
+            return server, first, second
+
+    server, first, second = asyncio.run(run())
+
+    assert len(server.requests) == 1
+    assert second["cast"] == first["cast"]
+    assert second["genres"] == sorted(first["genres"])
+
+
+def test_iter_many_is_bounded_and_reports_errors():
+    handler, peak = fake_imdb(delay=0.02, missing={"tt0000003"})
+    ids = [f"tt{n:07d}" for n in range(1, 21)]
+
+    async def run():
+        async with sqlite_session_factory() as session_factory, stub_server(handler) as server:
+            clients, service = await details_service(server, session_factory, concurrency=8, per_host=3)
+            results = [item async for item in service.iter_many(ids)]
+            await clients.aclose()
+            return results
+
+    results = asyncio.run(run())
+
+    assert sorted(imdb_id for imdb_id, _, _ in results) == ids
+    errors = {imdb_id: error for imdb_id, _, error in results if error}
+    assert list(errors) == ["tt0000003"], errors
+    assert peak() <= 3
+
+
+def test_batch_request_validates_ids():
+    with pytest.raises(ValidationError):
+        TitleBatchRequest(ids=["tt0111161", "not-an-id"])
+    with pytest.raises(ValidationError):
+        TitleBatchRequest(ids=[])
+
+
+@pytest.fixture
+def title_client(route_client):
+    """``title_client(handler, retry)``: a client for the title routes, scraping a stub IMDb."""
+    def serve(handler, retry=RetryPolicy(max_attempts=1)):
+        client = route_client(imdb.router, sub=None, user_services=())
+        server = client.enter(stub_server(handler))
+        clients = client.enter(aclosing(HTTPClientPool(http2=False)))
+        scraper = IMDBScraper(clients, title_url=f"{server.url}/title/{{imdb_id}}/", retry=retry)
+        service = TitleDetailsService(scraper, client.session_factory, max_age=3600)
+        client.app.dependency_overrides[get_title_details] = lambda: service
+        return client
+
+    return serve
+
+
+def test_title_route_returns_details(title_client):
+    handler, _ = fake_imdb()
+    response = title_client(handler).get("/imdb/title/tt0000001")
+
+    assert response.status_code == 200
+    assert response.json()["imdb_id"] == "tt0000001"
+
+
+def test_title_route_maps_upstream_timeout_to_502(title_client):
+    handler, _ = fake_imdb(delay=1.0)
+    response = title_client(handler, RetryPolicy(max_attempts=1, deadline=0.05)).get("/imdb/title/tt0000001")
+
+    assert response.status_code == 502
+    assert response.headers["x-error-code"] == "UPSTREAM_ERROR"
+
+
+@pytest.mark.parametrize("page", [
+    b"<html><body>No data here</body></html>",
+    b'<html><body><script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {}}}</script></body></html>',
+])
+def test_title_route_maps_pages_without_title_data_to_404(title_client, page):
+    response = title_client(lambda method, target, headers: (200, {}, page)).get("/imdb/title/tt0000001")
+
+    assert response.status_code == 404
+    assert response.headers["x-error-code"] == "TITLE_NOT_FOUND"
@@ -0,0 +1,75 @@
+import asyncio
+from dataclasses import replace
+
+from sqlalchemy import event, func, select
+
+from app.models import ChartEntry, Genre, Title
+from app.services.extract_data import extract_250_movies
+from app.services.titles import TitleService
+from benchmarks.db import sqlite_session
+from benchmarks.pages import build_next_data
+
+
+def chart(count=250, seed=0):
+    edges = build_next_data(count, seed)["props"]["pageProps"]["pageData"]["chartTitles"]["edges"]
+    return extract_250_movies(edges)
+
+
+def test_apply_chart_diff_round_trips():
+    movies = chart()
+
+    async def run():
+        async with sqlite_session() as db:
+            service = TitleService(db)
+            await service.apply_chart_diff(movies)
+            return await service.get_chart()
+
+    stored = asyncio.run(run())
+
+    assert len(stored) == 250
+    assert stored[0].rank == 1
+    assert stored[0].imdb_id == movies[0].imdb_id
+    assert stored[0].genres == tuple(sorted(movies[0].genres))
+
+
+def test_apply_chart_diff_uses_one_statement_per_table():
+    movies = chart()
+    statements = []
+
+    async def run():
+        async with sqlite_session() as db:
+            engine = db.bind.sync_engine
+            event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            await TitleService(db).apply_chart_diff(movies)
+
+    asyncio.run(run())
+
+    inserts = [sql for sql in statements if sql.startswith("INSERT")]
+    # titles, genres, title_genres, chart_entries and the rank-change log
+    assert len(inserts) == 5
+    assert len([sql for sql in statements if "INTO titles" in sql]) == 1
+
+
+def test_apply_chart_diff_updates_existing_rows():
+    first = chart(count=10, seed=0)
+    second = [replace(movie, rank=rank, rating=1.0) for rank, movie in enumerate(reversed(first[:5]), start=1)]
+
+    async def run():
+        async with sqlite_session() as db:
+            service = TitleService(db)
+            await service.apply_chart_diff(first)
+            await service.apply_chart_diff(second)
+            counts = (
+                await db.scalar(select(func.count()).select_from(Title)),
+                await db.scalar(select(func.count()).select_from(ChartEntry)),
+                await db.scalar(select(func.count()).select_from(Genre)),
+            )
+            return counts, await service.get_chart()
+
+    (titles, entries, genres), stored = asyncio.run(run())
+
+    assert titles == 10
+    assert entries == 5
+    assert genres > 0
+    assert [movie.imdb_id for movie in stored] == [movie.imdb_id for movie in second]
+    assert all(movie.rating == 1.0 for movie in stored)
@@ -0,0 +1,170 @@
+import asyncio
+
+import orjson
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import event, select
+
+from app.core.security import PasswordHasher
+from app.models import User
+from app.routes import users
+from app.services.user_import import UserImporter
+from app.services.users import UserService
+from app.utils.serialization import iter_json_array, iter_ndjson
+from benchmarks.db import sqlite_session_factory
+
+fast_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_json_array_items_span_chunks(size):
+    body = '[{"username": "é", "n": [1, 2]}, {"b": null} ,3 ]'.encode()
+
+    assert asyncio.run(collect(iter_json_array(chunked(body, size)))) == [{"username": "é", "n": [1, 2]}, {"b": None}, 3]
+
+
+@pytest.mark.parametrize("chunks", [
+    [b"[1, 3.", b"5]"],
+    [b"[1, 2e", b"3, -", b"4.5E-1 ]"],
+    [b"[tr", b"ue, nu", b"ll, 1", b"0]"],
+])
+def test_json_array_numbers_split_across_chunks(chunks):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    expected = orjson.loads(b"".join(chunks))
+    assert asyncio.run(collect(iter_json_array(body()))) == expected
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b"[1 2]", b"[1", b"[1] [2]", b"[1,]"])
+def test_json_array_rejects_malformed_bodies(body):
+    with pytest.raises(ValueError):
+        asyncio.run(collect(iter_json_array(chunked(body, 2))))
+
+
+def test_streaming_parsers_bound_item_size():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(iter_json_array(chunked(b'[{"a": "' + b"x" * 200, 16), max_item_bytes=100)))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(iter_ndjson(chunked(b"x" * 200, 16), max_item_bytes=100)))
+
+
+def test_ndjson_skips_blank_lines():
+    body = b'{"a": 1}\n\n{"b": 2}'
+
+    assert asyncio.run(collect(iter_ndjson(chunked(body, 3)))) == [{"a": 1}, {"b": 2}]
+
+
+def run_import(rows, batch_size=2):
+    statements = []
+    hasher = PasswordHasher(workers=2, max_pending=4, context=fast_context)
+
+    async def items():
+        for row in rows:
+            yield row
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            async with session_factory() as db:
+                db.add(User(username="mahdi", email="mahdi@example.com", password="hash"))
+                await db.commit()
+                event.listen(
+                    db.bind.sync_engine, "before_cursor_execute",
+                    lambda conn, cursor, sql, *args: statements.append(sql.split()[0]),
+                )
+                results = await collect(UserImporter(UserService(db), hasher, batch_size).run(items()))
+                stored = (await db.execute(select(User.username, User.password).order_by(User.id))).all()
+                return results, stored
+
+    try:
+        results, stored = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    return results, stored, statements
+
+
+def test_import_reports_every_row():
+    results, stored, _ = run_import([
+        {"username": "sara", "email": "sara@example.com", "password": "pw1"},
+        {"username": "sara", "email": "other@example.com", "password": "pw2"},
+        {"username": "ali", "email": "mahdi@example.com", "password": "pw3"},
+        {"username": "mahdi", "password": "pw4"},
+        {"username": "admin", "password": "pw5"},
+        {"username": "nopassword"},
+        {"username": "reza", "password": "pw7"},
+        # Duplicate of a row committed in an earlier batch.
+        {"username": "reza", "password": "pw8"},
+    ])
+
+    assert [result.get("error") for result in results[:-1]] == [
+        None, "USERNAME_TAKEN", "EMAIL_TAKEN", "USERNAME_TAKEN", "INVALID_USERNAME", "INVALID_ROW", None, "USERNAME_TAKEN",
+    ]
+    assert [result["row"] for result in results[:-1]] == list(range(1, 9))
+    assert results[0]["user"] == {"id": 2, "username": "sara", "email": "sara@example.com"}
+    assert results[-1] == {"created": 2, "failed": 6}
+    assert [username for username, _ in stored] == ["mahdi", "sara", "reza"]
+    assert fast_context.verify("pw1", stored[1].password)
+
+
+def test_import_uses_one_lookup_and_one_insert_per_batch():
+    rows = [{"username": f"user{n}", "email": f"user{n}@example.com", "password": "pw"} for n in range(6)]
+    results, _, statements = run_import(rows, batch_size=3)
+
+    assert results[-1] == {"created": 6, "failed": 0}
+    # The last SELECT reads back the stored users.
+    assert statements == ["SELECT", "INSERT", "SELECT", "INSERT", "SELECT"]
+
+
+@pytest.fixture
+def bulk_client(monkeypatch, route_client):
+    hasher = PasswordHasher(workers=2, max_pending=4, context=fast_context)
+    monkeypatch.setattr(users, "password_hasher", hasher)
+    monkeypatch.setattr(users, "USERS_BULK_BATCH_SIZE", 2)
+    yield route_client(users.router)
+    hasher.shutdown()
+
+
+def test_bulk_route_accepts_json_arrays(bulk_client):
+    rows = [{"username": f"user{n}", "password": "pw"} for n in range(3)]
+    response = bulk_client.post("/users/bulk", content=orjson.dumps(rows), headers={"content-type": "application/json"})
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [line["user"]["username"] for line in lines[:-1]] == ["user0", "user1", "user2"]
+    assert lines[-1] == {"created": 3, "failed": 0}
+
+
+def test_bulk_route_streams_ndjson_and_reports_bad_input(bulk_client):
+    body = b'{"username": "a", "password": "pw"}\n{"username": "b", "password": "pw"}\n{not json}\n'
+    response = bulk_client.post("/users/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+
+    assert [line.get("error") for line in lines[:-1]] == [None, None, "INVALID_JSON"]
+    assert lines[2]["row"] == 3
+    assert lines[-1] == {"created": 2, "failed": 1}
+
+
+def test_bulk_route_reports_oversized_passwords_per_row(bulk_client):
+    rows = [{"username": f"user{n}", "password": "pw"} for n in range(4)]
+    rows[2]["password"] = "x" * 5000
+    response = bulk_client.post("/users/bulk", content=orjson.dumps(rows), headers={"content-type": "application/json"})
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+
+    assert [line.get("error") for line in lines[:-1]] == [None, None, "INVALID_ROW", None]
+    assert lines[-1] == {"created": 3, "failed": 1}
+
+
+def test_bulk_route_requires_a_known_content_type(bulk_client):
+    response = bulk_client.post("/users/bulk", content=b"a,b", headers={"content-type": "text/csv"})
+
+    assert response.status_code == 415
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.routes import users
+from app.services.exceptions import (
+    EmailTakenException,
+    UsernameOrEmailTakenException,
+    UsernameTakenException,
+    UserNotFoundException,
+)
+from app.services.users import UserService, _conflict_exception
+from benchmarks.db import sqlite_session_factory
+
+
+def run_with_service(fn):
+    statements = []
+
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            async with session_factory() as db:
+                service = UserService(db)
+                await service.create_user({"username": "mahdi", "email": "mahdi@example.com", "password": "hash"})
+                event.listen(
+                    db.bind.sync_engine, "before_cursor_execute",
+                    lambda conn, cursor, sql, *args: statements.append(sql.split()[0]),
+                )
+                return await fn(service)
+
+    return asyncio.run(run()), statements
+
+
+def test_create_returns_the_row_in_one_statement():
+    user, statements = run_with_service(
+        lambda service: service.create_user({"username": "sara", "email": "sara@example.com", "password": "hash"})
+    )
+
+    assert user == {"id": 2, "username": "sara", "email": "sara@example.com"}
+    assert statements == ["INSERT"]
+
+
+@pytest.mark.parametrize("values", [
+    {"username": "mahdi", "email": "other@example.com"},
+    {"username": "sara", "email": "mahdi@example.com"},
+])
+def test_create_relies_on_unique_constraints(values):
+    with pytest.raises(UsernameOrEmailTakenException):
+        run_with_service(lambda service: service.create_user({**values, "password": "hash"}))
+
+
+@pytest.mark.parametrize("values, exception", [
+    ({"username": "sara"}, UsernameTakenException),
+    ({"email": "sara@example.com"}, EmailTakenException),
+])
+def test_update_reports_which_value_is_taken(values, exception):
+    async def update(service):
+        await service.create_user({"username": "sara", "email": "sara@example.com", "password": "hash"})
+        await service.update_user("mahdi", values)
+
+    with pytest.raises(exception):
+        run_with_service(update)
+
+
+def test_update_returns_the_row_in_one_statement():
+    user, statements = run_with_service(lambda service: service.update_user("mahdi", {"email": "new@example.com"}))
+
+    assert user == {"id": 1, "username": "mahdi", "email": "new@example.com"}
+    assert statements == ["UPDATE"]
+
+
+def test_update_and_delete_of_missing_user_raise_not_found():
+    with pytest.raises(UserNotFoundException):
+        run_with_service(lambda service: service.update_user("nobody", {"email": "new@example.com"}))
+    with pytest.raises(UserNotFoundException):
+        run_with_service(lambda service: service.delete_user("nobody"))
+
+
+def test_delete_is_a_single_statement():
+    async def delete_and_list(service):
+        await service.delete_user("mahdi")
+        return await service.get_users_page(None, 10)
+
+    remaining, statements = run_with_service(delete_and_list)
+
+    assert remaining == []
+    assert statements == ["DELETE", "SELECT"]
+
+
+def test_update_with_nothing_to_set_reads_the_row():
+    user, statements = run_with_service(lambda service: service.update_user("mahdi", {}))
+
+    assert user == {"id": 1, "username": "mahdi", "email": "mahdi@example.com"}
+    assert statements == ["SELECT"]
+
+    with pytest.raises(UserNotFoundException):
+        run_with_service(lambda service: service.update_user("nobody", {}))
+
+
+def test_empty_patch_returns_the_unchanged_user(route_client):
+    client = route_client(users.router)
+
+    async def create_user():
+        async with client.session_factory() as db:
+            await UserService(db).create_user({"username": "mahdi", "email": "mahdi@example.com", "password": "hash"})
+
+    client.call(create_user)
+    response = client.patch("/users/patch/", json={})
+
+    assert response.status_code == 200
+    assert response.json()["user"] == {"id": 1, "username": "mahdi", "email": "mahdi@example.com"}
+
+
+class ConstraintViolation(Exception):
+    def __init__(self, message, constraint_name=None):
+        super().__init__(message)
+        self.constraint_name = constraint_name
+
+
+@pytest.mark.parametrize("orig, exception", [
+    (ConstraintViolation("UNIQUE constraint failed: users.username"), UsernameTakenException),
+    (ConstraintViolation("UNIQUE constraint failed: users.email"), EmailTakenException),
+    (
+        ConstraintViolation(
+            'duplicate key value violates unique constraint "users_email_key"\n'
+            "DETAIL:  Key (email)=(username@example.com) already exists."
+        ),
+        EmailTakenException,
+    ),
+    (ConstraintViolation("duplicate key", constraint_name="users_username_key"), UsernameTakenException),
+    (ConstraintViolation("duplicate key (username@example.com)", constraint_name="users_email_key"), EmailTakenException),
+])
+def test_conflicts_are_told_apart_by_constraint_not_value(orig, exception):
+    assert isinstance(_conflict_exception(IntegrityError("UPDATE users", {}, orig)), exception)
@@ -0,0 +1,59 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.models import User
+from app.routes import users
+from app.services.users import UserService
+from benchmarks.db import sqlite_session_factory
+
+
+@pytest.fixture
+def users_client(route_client):
+    client = route_client(users.router, sub="admin")
+
+    async def seed():
+        async with client.session_factory() as db:
+            db.add_all(User(username=f"user{n}", email=f"user{n}@example.com", password="hash") for n in range(7))
+            await db.commit()
+
+    client.call(seed)
+    return client
+
+
+def test_pages_follow_the_id_cursor(users_client):
+    first = users_client.get("/users", params={"limit": 3})
+    second = users_client.get("/users", params={"limit": 3, "after": first.json()[-1]["id"]})
+    last = users_client.get("/users", params={"limit": 3, "after": 6})
+
+    assert [user["id"] for user in first.json()] == [1, 2, 3]
+    assert first.headers["link"] == '</users?after=3&limit=3>; rel="next"'
+    assert [user["id"] for user in second.json()] == [4, 5, 6]
+    assert [user["id"] for user in last.json()] == [7]
+    assert "link" not in last.headers
+    assert set(first.json()[0]) == {"id", "username", "email"}
+
+
+def test_limit_is_capped(users_client):
+    assert users_client.get("/users", params={"limit": 10_000}).status_code == 422
+
+
+def test_ndjson_streams_every_user_after_the_cursor(users_client):
+    response = users_client.get("/users", params={"format": "ndjson", "after": 2})
+
+    rows = [orjson.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [row["id"] for row in rows] == [3, 4, 5, 6, 7]
+    assert "password" not in rows[0]
+
+
+def test_stream_users_reads_in_batches():
+    async def run():
+        async with sqlite_session_factory() as session_factory:
+            async with session_factory() as db:
+                db.add_all(User(username=f"user{n}", password="hash") for n in range(25))
+                await db.commit()
+                return [row["username"] async for row in UserService(db).stream_users(batch_size=10)]
+
+    assert asyncio.run(run()) == [f"user{n}" for n in range(25)]